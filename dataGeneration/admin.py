@@ -1,11 +1,5 @@
 from django.contrib import admin
-# from forms.models import ModuleAssessment,ModuleSoftware,ModuleSupport, ModuleTeaching,ModuleDescription,ModuleDescriptionEntry
-#
-# # Register your models here.
-# admin.site.register(ModuleAssessment)
-# admin.site.register(ModuleSoftware)
-# admin.site.register(ModuleExam)
-# admin.site.register(ModuleSupport)
-# admin.site.register(ModuleTeaching)
-# admin.site.register(ModuleDescription)
-# admin.site.register(ModuleDescriptionEntry)
+from dataGeneration.models import ReportSnapshot
+
+# Register your models here.
+admin.site.register(ReportSnapshot)
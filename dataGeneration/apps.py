@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class DatagenerationConfig(AppConfig):
     name = 'dataGeneration'
+
+    def ready(self):
+        import dataGeneration.utils.signals
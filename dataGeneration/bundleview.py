@@ -0,0 +1,13 @@
+from django.views import View
+from dataGeneration.utils.bundle import bundle_download_response
+
+
+class ReportBundleDownload(View):
+    '''
+    this will be calleed for downloading all of the reports as one zip
+    the reports are built at the same time and zipped as each one finishes
+    it is not conditional as the tracking summary is built live from the
+    tracking forms, which the report fingerprint does not cover
+    '''
+    def get(self, request, *args, **kwargs):
+        return bundle_download_response('Reports.zip')
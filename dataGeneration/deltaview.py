@@ -0,0 +1,40 @@
+from django.http import JsonResponse
+from django.views import View
+from dataGeneration.models import REPORTS
+from dataGeneration.utils.deltas import (report_changes, parse_since,
+                                         DeltaError, DEFAULT_DELTA_LIMIT)
+
+MAX_DELTA_LIMIT = 5000
+
+
+class ReportDelta(View):
+    '''
+    this will be calleed by downstream imports to pull the report changes
+    ?since= takes an ISO timestamp, ?cursor= the cursor of the last response
+    only the snapshots changed after that point are returned with the next cursor
+    deleted modules are not in the changes, so includes_deletions is always false
+    '''
+    def get(self, request, *args, **kwargs):
+        report = request.GET.get('report') or None
+        if report is not None and report not in dict(REPORTS):
+            return JsonResponse({'error': 'Unknown report'}, status=400)
+
+        try:
+            limit = int(request.GET.get('limit', DEFAULT_DELTA_LIMIT))
+        except ValueError:
+            return JsonResponse({'error': 'limit must be a number'}, status=400)
+        limit = max(1, min(limit, MAX_DELTA_LIMIT))
+
+        try:
+            since = request.GET.get('since')
+            if since is not None:
+                since = parse_since(since)
+            changes = report_changes(
+                since=since,
+                cursor=request.GET.get('cursor') or None,
+                report=report,
+                limit=limit
+            )
+        except DeltaError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        return JsonResponse(changes)
@@ -0,0 +1,77 @@
+from django.http import Http404, FileResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views import View
+from dataGeneration.models import ReportJob
+from dataGeneration.utils.exports import EXPORTS
+from dataGeneration.utils.jobs import job_file_path
+
+
+def job_data(job):
+    '''
+    json representation of a report job
+    '''
+    data = {
+        'job_id': job.pk,
+        'export': job.export,
+        'status': job.status,
+        'created': job.created,
+        'finished': job.finished,
+        'error': job.error,
+        'status_url': reverse('ReportJobStatus', kwargs={'pk': job.pk}),
+    }
+    if job.is_finished():
+        data['download_url'] = reverse(
+            'ReportJobDownload', kwargs={'pk': job.pk}
+        )
+    return data
+
+
+class ReportJobCreate(View):
+    '''
+    this will be calleed to queue a report export
+    an identical export that is queued or running is returned instead
+    '''
+    def post(self, request, *args, **kwargs):
+        export = request.POST.get('export', '')
+        if export not in EXPORTS:
+            return JsonResponse(
+                {'error': 'export must be one of {}'.format(
+                    ', '.join(sorted(EXPORTS)))},
+                status=400
+            )
+        job, created = ReportJob.objects.enqueue(export, request.user)
+        return JsonResponse(job_data(job), status=202 if created else 200)
+
+
+class ReportJobStatus(View):
+    '''
+    this will be calleed to poll the status of a report job
+    '''
+    def get(self, request, *args, **kwargs):
+        job = get_object_or_404(ReportJob, pk=kwargs['pk'])
+        return JsonResponse(job_data(job))
+
+
+class ReportJobDownload(View):
+    '''
+    this will be calleed to download the file of a finished job
+    '''
+    def get(self, request, *args, **kwargs):
+        job = get_object_or_404(ReportJob, pk=kwargs['pk'])
+        if not job.is_finished():
+            raise Http404("The report has not finished building")
+        if not job.filename:
+            raise Http404("The report has been replaced by a newer one")
+
+        export = EXPORTS[job.export]
+        try:
+            report = open(job_file_path(job), 'rb')
+        except FileNotFoundError:
+            raise Http404("The report file no longer exists")
+
+        response = FileResponse(report, content_type=export.content_type)
+        response['Content-Disposition'] = 'attachment; filename={}'.format(
+            export.filename
+        )
+        return response
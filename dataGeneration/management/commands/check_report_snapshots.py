@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from dataGeneration.utils.snapshots import check_snapshots
+
+
+class Command(BaseCommand):
+    """
+    Compares the report snapshots against a live recompute
+    """
+    help = 'Checks that the report snapshots match the module data'
+
+    def handle(self, *args, **options):
+        problems = check_snapshots()
+        for report, module_code, problem in problems:
+            self.stdout.write("{}: {} snapshot is {}".format(
+                module_code, report, problem
+            ))
+
+        if problems:
+            raise CommandError(
+                "{} report snapshots are inconsistent. Run "
+                "rebuild_report_snapshots to fix them.".format(len(problems))
+            )
+        self.stdout.write(self.style.SUCCESS("Report snapshots are consistent"))
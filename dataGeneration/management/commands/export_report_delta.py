@@ -0,0 +1,70 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from dataGeneration.models import REPORTS
+from dataGeneration.utils.deltas import (report_changes, parse_since,
+                                         DeltaError, DEFAULT_DELTA_LIMIT)
+
+
+class Command(BaseCommand):
+    """
+    Writes the report changes since a timestamp or cursor as json.
+    Every page of changes is read, and the cursor to continue from
+    is part of the output.
+    """
+    help = (
+        'Exports the report rows changed since a timestamp or cursor. '
+        'Deleted modules are not included in the changes.'
+    )
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            '--since',
+            help='ISO 8601 timestamp to export the changes after'
+        )
+        group.add_argument(
+            '--cursor',
+            help='Cursor returned by the previous export'
+        )
+        parser.add_argument(
+            '--report',
+            choices=[report for report, _ in REPORTS],
+            help='Only export the changes of this report'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_DELTA_LIMIT,
+            help='Number of changes read per query'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("The batch size must be at least 1")
+
+        try:
+            since = None
+            if options['since'] is not None:
+                since = parse_since(options['since'])
+
+            cursor = options['cursor']
+            changes = []
+            while True:
+                page = report_changes(
+                    since=since,
+                    cursor=cursor,
+                    report=options['report'],
+                    limit=options['batch_size']
+                )
+                changes.extend(page['changes'])
+                cursor = page['cursor']
+                if not page['more']:
+                    break
+        except DeltaError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(json.dumps({
+            'changes': changes,
+            'cursor': cursor,
+            'includes_deletions': False
+        }))
@@ -0,0 +1,90 @@
+from core.models import User
+from django.core.management.base import BaseCommand, CommandError
+from forms.models import ModuleDescriptionFormVersion
+from forms.utils.description_import import (DescriptionImporter, read_records,
+                                            IMPORT_BATCH_SIZE, MODULE_CODE_COLUMN)
+from forms.utils.form_schema import get_most_recent_version_id
+
+
+class Command(BaseCommand):
+    """
+    Imports module descriptions from a CSV or JSON file. The columns are
+    the module code and the labels of the form version's fields. Records
+    which can not be imported are listed, the rest are still imported.
+    """
+    help = 'Imports module descriptions from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file to import')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='Format of the file, taken from its extension if not given'
+        )
+        parser.add_argument(
+            '--form-version',
+            type=int,
+            help='Form version the answers are for, the most recent if not given'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Number of descriptions written per transaction'
+        )
+        parser.add_argument(
+            '--module-column',
+            default=MODULE_CODE_COLUMN,
+            help='Column holding the module code'
+        )
+        parser.add_argument(
+            '--user',
+            help='Username the timeline entries are made by'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format not in ('csv', 'json'):
+            raise CommandError("Give the --format of {}".format(path))
+        if options['batch_size'] < 1:
+            raise CommandError("The batch size must be at least 1")
+
+        try:
+            version_id = options['form_version'] or get_most_recent_version_id()
+            form_version = ModuleDescriptionFormVersion.objects.get(pk=version_id)
+        except ModuleDescriptionFormVersion.DoesNotExist:
+            raise CommandError("There is no such module description form version")
+
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError("There is no user {}".format(options['user']))
+
+        importer = DescriptionImporter(
+            form_version,
+            user=user,
+            batch_size=options['batch_size'],
+            module_column=options['module_column']
+        )
+        try:
+            with open(path, newline='', encoding='utf-8') as stream:
+                importer.run(read_records(stream, file_format))
+        except (OSError, ValueError) as error:
+            raise CommandError(str(error))
+
+        if importer.unknown_columns:
+            self.stderr.write("Ignored columns: {}".format(
+                ', '.join(sorted(importer.unknown_columns))
+            ))
+        for error in importer.errors:
+            self.stderr.write("Row {} {}: {}".format(
+                error.row, error.module_code, error.message
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            "Imported {} module descriptions, {} rows failed".format(
+                importer.imported, len(importer.errors)
+            )
+        ))
@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.models import User
+from forms.models import ModuleDescriptionFormVersion
+from forms.utils.description_migration import (DescriptionMigration,
+                                               MigrationError,
+                                               MIGRATION_CHUNK_SIZE)
+from forms.utils.form_schema import get_most_recent_version_id
+
+
+class Command(BaseCommand):
+    """
+    Moves the current module descriptions to a form version, the most
+    recent one by default. Answers are carried over to the field with
+    the same label, or the field given with --map.
+    """
+    help = 'Migrates the module descriptions to the newest form version'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--form-version',
+            type=int,
+            help='Form version to migrate to, the most recent if not given'
+        )
+        parser.add_argument(
+            '--map',
+            action='append',
+            default=[],
+            metavar='OLD=NEW',
+            help='Moves the answers of the field labelled OLD to the field '
+                 'labelled NEW, or drops them if NEW is empty'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=MIGRATION_CHUNK_SIZE,
+            help='Number of modules migrated per transaction'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Reports what would be migrated without writing anything'
+        )
+        parser.add_argument(
+            '--user',
+            help='Username the timeline entries are made by'
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("The chunk size must be at least 1")
+
+        mapping = {}
+        for label_map in options['map']:
+            if '=' not in label_map:
+                raise CommandError("--map must be given as OLD=NEW")
+            source, target = label_map.split('=', 1)
+            mapping[source.strip()] = target.strip() or None
+
+        try:
+            version_id = options['form_version'] or get_most_recent_version_id()
+            form_version = ModuleDescriptionFormVersion.objects.get(pk=version_id)
+        except ModuleDescriptionFormVersion.DoesNotExist:
+            raise CommandError("There is no such module description form version")
+
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError("There is no user {}".format(options['user']))
+
+        migration = DescriptionMigration(
+            form_version,
+            mapping=mapping,
+            user=user,
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            progress=self.progress
+        )
+        try:
+            migration.run()
+        except MigrationError as error:
+            raise CommandError(str(error))
+
+        for label, count in sorted(migration.dropped.items()):
+            self.stdout.write("Dropped {} answers to {}".format(count, label))
+        for label, count in sorted(migration.unanswered.items()):
+            self.stdout.write("{} modules have no answer to {}".format(count, label))
+        verb = "Would migrate" if options['dry_run'] else "Migrated"
+        self.stdout.write(self.style.SUCCESS(
+            "{} {} modules to form version {}".format(
+                verb, migration.migrated, form_version.pk
+            )
+        ))
+
+    def progress(self, done, total):
+        self.stdout.write("{}/{} modules".format(done, total))
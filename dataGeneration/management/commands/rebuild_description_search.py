@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from forms.utils.description_search import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the module description search index from scratch
+    """
+    help = 'Reindexes the answers of the current module descriptions'
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            "Indexed {} module description answers".format(indexed)
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from dataGeneration.utils.snapshots import rebuild_snapshots
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the report snapshots from scratch
+    """
+    help = 'Recomputes every report snapshot from the module data'
+
+    def handle(self, *args, **options):
+        written = rebuild_snapshots()
+        self.stdout.write(self.style.SUCCESS(
+            "Rebuilt the report snapshots, {} were created or changed".format(written)
+        ))
@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand
+from dataGeneration.utils.jobs import run_queued_jobs
+
+
+class Command(BaseCommand):
+    """
+    Worker which builds the queued report jobs. It polls the
+    database for jobs, so no message broker is needed.
+    """
+    help = 'Builds the queued report exports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait between polling for new jobs'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = run_queued_jobs()
+            if count:
+                self.stdout.write("Ran {} report jobs".format(count))
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.7 on 2026-10-18 10:22
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('forms', '0036_auto_20180423_1435'),
+        ('core', '0021_remove_module_seen_by_before'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report', models.CharField(choices=[('module_sheet', 'Module Summary Sheet'), ('lab_sheet', 'Lab Organisation Sheet')], max_length=20)),
+                ('rows', models.TextField()),
+                ('last_modified', models.DateTimeField(auto_now=True)),
+                ('form_version', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='forms.ModuleDescriptionFormVersion')),
+                ('module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.Module')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='reportsnapshot',
+            unique_together=set([('report', 'module')]),
+        ),
+    ]
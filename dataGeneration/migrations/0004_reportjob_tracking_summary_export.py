@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.7 on 2026-10-18 10:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dataGeneration', '0003_reportsnapshot_last_modified_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportjob',
+            name='export',
+            field=models.CharField(choices=[('module_sheet_csv', 'Module Summary Sheet (CSV)'), ('lab_sheet_csv', 'Lab Organisation Sheet (CSV)'), ('tracking_summary_csv', 'Tracking Form Summary (CSV)'), ('reports_xlsx', 'All Reports (XLSX)')], max_length=20),
+        ),
+    ]
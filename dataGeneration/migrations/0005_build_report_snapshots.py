@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+def build_snapshots(apps, schema_editor):
+    """
+    Builds the report snapshots of the existing modules, so the reports
+    are not empty after upgrading. The snapshots are derived data, so the
+    current report builders are used rather than historical models.
+    """
+    from dataGeneration.utils.snapshots import rebuild_snapshots
+    rebuild_snapshots()
+
+
+def remove_snapshots(apps, schema_editor):
+    ReportSnapshot = apps.get_model('dataGeneration', 'ReportSnapshot')
+    ReportSnapshot.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dataGeneration', '0004_reportjob_tracking_summary_export'),
+        ('core', '0021_remove_module_seen_by_before'),
+        ('forms', '0045_description_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_snapshots, remove_snapshots),
+    ]
@@ -1,3 +1,289 @@
-from django.db import models
+import json
+import os
+from datetime import timedelta
+from django.conf import settings
+from django.db import models, transaction, IntegrityError
+from django.utils import timezone
 
-# Create your models here.
+from core.models import Module, User
+from forms.models import ModuleDescriptionFormVersion
+
+MODULE_SHEET = 'module_sheet'
+LAB_SHEET = 'lab_sheet'
+
+REPORTS = (
+    (MODULE_SHEET, 'Module Summary Sheet'),
+    (LAB_SHEET, 'Lab Organisation Sheet'),
+)
+
+MODULE_SHEET_CSV = 'module_sheet_csv'
+LAB_SHEET_CSV = 'lab_sheet_csv'
+REPORTS_XLSX = 'reports_xlsx'
+TRACKING_SUMMARY_CSV = 'tracking_summary_csv'
+
+EXPORTS = (
+    (MODULE_SHEET_CSV, 'Module Summary Sheet (CSV)'),
+    (LAB_SHEET_CSV, 'Lab Organisation Sheet (CSV)'),
+    (TRACKING_SUMMARY_CSV, 'Tracking Form Summary (CSV)'),
+    (REPORTS_XLSX, 'All Reports (XLSX)'),
+)
+
+JOB_QUEUED = 'Queued'
+JOB_RUNNING = 'Running'
+JOB_FINISHED = 'Finished'
+JOB_FAILED = 'Failed'
+
+JOB_STATUS = (
+    (JOB_QUEUED, JOB_QUEUED),
+    (JOB_RUNNING, JOB_RUNNING),
+    (JOB_FINISHED, JOB_FINISHED),
+    (JOB_FAILED, JOB_FAILED),
+)
+
+# times an export is tried to be queued while another job holds it
+ENQUEUE_ATTEMPTS = 3
+
+
+class ReportSnapshotManager(models.Manager):
+    """
+    Manager for the ReportSnapshot model
+    """
+    def for_report(self, report):
+        """
+        Returns the snapshots of a report, in module order
+        """
+        return self.filter(report=report).order_by('module_id')
+
+
+class ReportSnapshot(models.Model):
+    """
+    Materialized rows of a report for a single module. Reports are read
+    from the snapshots instead of being recomputed on every request.
+    """
+    report = models.CharField(max_length=20, choices=REPORTS)
+    module = models.ForeignKey(Module, on_delete=models.CASCADE)
+
+    # the form version table the module sits in on the module sheet
+    form_version = models.ForeignKey(
+        ModuleDescriptionFormVersion,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True
+    )
+
+    # json list of the rows of the report for the module
+    rows = models.TextField()
+
+    # indexed for reading the changes since a point in time
+    last_modified = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ReportSnapshotManager()
+
+    class Meta:
+        unique_together = ('report', 'module')
+
+    def __str__(self):
+        return "{} snapshot for {}".format(
+            self.get_report_display(), self.module_id
+        )
+
+    def get_rows(self):
+        """
+        Returns the rows of the snapshot as a list
+        """
+        return json.loads(self.rows)
+
+
+class ReportJobManager(models.Manager):
+    """
+    Manager for the ReportJob model
+    """
+    def enqueue(self, export, requested_by=None):
+        """
+        Queues a job to build an export. If the same export is already
+        queued or running, that job is returned instead of a new one.
+        A job left running by a worker which stopped is failed, and a
+        new job is queued in its place.
+
+        Return:
+            tuple of the job and a bool of if it was created
+        """
+        for _ in range(ENQUEUE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    job = self.create(
+                        export=export,
+                        active_export=export,
+                        requested_by=requested_by
+                    )
+                return job, True
+            except IntegrityError:
+                pass
+
+            self.fail_stale()
+            # the job holding the export may also have finished since
+            job = self.filter(active_export=export).first()
+            if job is not None:
+                return job, False
+        raise IntegrityError("Could not queue a {} job".format(export))
+
+    def fail_stale(self, timeout=None):
+        """
+        Fails the jobs which have been running for longer than the
+        timeout, as the worker running them has stopped. Their exports
+        can then be queued again, and the files they left are removed.
+
+        Arguments:
+            timeout     Optional seconds, defaults to REPORT_JOB_TIMEOUT
+
+        Return:
+            int of the number of jobs that were failed
+        """
+        if timeout is None:
+            timeout = settings.REPORT_JOB_TIMEOUT
+        stale = self.filter(
+            status=JOB_RUNNING,
+            started__lt=timezone.now() - timedelta(seconds=timeout)
+        )
+        failed = 0
+        for job in stale:
+            if job.fail("The job did not finish within {} seconds".format(timeout)):
+                failed += 1
+        return failed
+
+    def claim_next(self):
+        """
+        Claims the oldest queued job for a worker by moving it to running.
+        Only one worker can claim a job.
+
+        Return:
+            The claimed ReportJob, or None if the queue is empty
+        """
+        queued = self.filter(status=JOB_QUEUED).order_by('created')
+        for job in queued:
+            claimed = self.filter(pk=job.pk, status=JOB_QUEUED).update(
+                status=JOB_RUNNING,
+                started=timezone.now()
+            )
+            if claimed:
+                return self.get(pk=job.pk)
+        return None
+
+
+class ReportJob(models.Model):
+    """
+    A report export which is built in the background by the
+    run_report_worker command.
+    """
+    export = models.CharField(max_length=20, choices=EXPORTS)
+    status = models.CharField(
+        max_length=8,
+        choices=JOB_STATUS,
+        default=JOB_QUEUED
+    )
+
+    # set to the export while the job is queued or running, so that
+    # only one job for an export can be active at a time.
+    active_export = models.CharField(
+        max_length=20,
+        unique=True,
+        blank=True,
+        null=True
+    )
+
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    # name of the built file within REPORT_JOBS_ROOT
+    filename = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+
+    objects = ReportJobManager()
+
+    class Meta:
+        ordering = ['-created']
+
+    def __str__(self):
+        return "{} ({})".format(self.get_export_display(), self.status)
+
+    def is_finished(self):
+        return self.status == JOB_FINISHED
+
+    def get_build_filename(self):
+        """
+        Returns the name of the file the job is built into, within
+        REPORT_JOBS_ROOT
+        """
+        return "{}_{}".format(self.pk, self.export)
+
+    def remove_files(self):
+        """
+        Removes the built file of the job, and any partly written one
+        """
+        path = os.path.join(settings.REPORT_JOBS_ROOT, self.get_build_filename())
+        for file_path in (path, path + '.part'):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def finish(self, filename):
+        """
+        Marks the job as finished with the file that was built. Only a
+        running job is moved on, so a job which was failed as stale while
+        it was being built is left failed.
+
+        Return:
+            bool of if the job was finished
+        """
+        return self.end(status=JOB_FINISHED, filename=filename)
+
+    def fail(self, error):
+        """
+        Marks a running job as failed with the error that occured, and
+        removes any file it wrote
+
+        Return:
+            bool of if the job was failed
+        """
+        failed = self.end(status=JOB_FAILED, error=error)
+        if failed:
+            self.remove_files()
+        return failed
+
+    def end(self, **values):
+        """
+        Sets the values of the job if it is still running, releasing
+        its export
+        """
+        values.update(active_export=None, finished=timezone.now())
+        ended = ReportJob.objects.filter(
+            pk=self.pk, status=JOB_RUNNING
+        ).update(**values)
+        if ended:
+            for name, value in values.items():
+                setattr(self, name, value)
+        else:
+            self.refresh_from_db()
+        return bool(ended)
+
+    def remove_superseded(self):
+        """
+        Removes the files of the older finished jobs of the same export,
+        which this job replaces
+        """
+        superseded = list(ReportJob.objects.filter(
+            export=self.export,
+            status=JOB_FINISHED,
+            finished__lt=self.finished
+        ).exclude(filename=''))
+        for job in superseded:
+            job.remove_files()
+        ReportJob.objects.filter(
+            pk__in=[job.pk for job in superseded]
+        ).update(filename='')
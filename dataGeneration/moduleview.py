@@ -1,198 +1,147 @@
-from django.shortcuts import render
-from forms.models import ModuleAssessment,ModuleSoftware,ModuleSupport, ModuleTeaching,ModuleDescription,ModuleDescriptionFormVersion,ModuleDescriptionEntry,FormFieldEntity
-from core.models import *
+from django.http import Http404
+from django.utils.decorators import method_decorator
 from django.views import View
-from django.http import HttpResponse
-import random
-import csv
-from collections import defaultdict
-
-
+from django.views.decorators.gzip import gzip_page
+from django.views.generic.list import ListView
+from core.models import Module
+from forms.models import ModuleDescriptionFormVersion, FormFieldEntity
+from dataGeneration.utils.module_sheet import (ModuleSheetPivot,
+                                               BASE_HEADERS,
+                                               current_descriptions)
+from dataGeneration.utils.conditional import report_condition
+from dataGeneration.utils.exports import module_sheet_csv_rows
+from dataGeneration.utils.handbook import handbook_response
+from dataGeneration.utils.streaming import csv_download_response
+from dataGeneration.utils.workbook import report_worksheets, xlsx_download_response
+
+
+@method_decorator([gzip_page, report_condition], name='get')
 class ModuleSheetDownload(View):
     '''
     this will be calleed for downloading the csv data
+    the rows are read from the report snapshots and streamed to the client
+    repeat downloads get a 304 while the snapshots are unchanged
     '''
     def get(self, request, *args, **kwargs):
-        modules = Module.objects.all()  # gets all the modules
-        module_desc_entries = ModuleDescriptionEntry.objects.all()  # gets all module desc entriy eg(string_entry)
-        form_fields = FormFieldEntity.objects.all() # gets all fields
-        versions = ModuleDescriptionFormVersion.objects.all() #gets all versions
-
-        # group form fields by version
-        form_fields_by_version = defaultdict(list)
-        for form_field in form_fields:
-            form_fields_by_version[form_field.module_description_version_id].append(form_field)
-
-        # this table will have all the modules without any fields (will be shown as a separate table)
-        table_without_fields = {
-            'headers': ['Module Code','Module Name'],
-            'modules': []
-        }
-
-
-        # this list will contain set of all the tables on the page
-        multiple_tables = []
-
-        # set of module code which have fields for any version
-        module_codes_with_entries = set()
-
-        # loop over different versions and collect module, form data for each version
-        for idx, version in enumerate(versions):
-            # get all the fields for a specific version
-            form_fields = form_fields_by_version[version.module_description_version]
-            _headers = ['Module Code','Module Name'] #will be used to create headers
-            # add each field as header
-            for formfield in form_fields:
-                _headers.append(formfield.entity_label)
-            # list of modules
-            _modules = []
-            # go over each module
-            for module in modules:
-                # gets all entries for this module
-                entries = list(self._filterByModule(module_desc_entries, module, version))
-                # create row
-                _entries = [module.module_code, module.module_name]
-                for e in entries:
-                    _entries.append(e.string_entry)
-                # if we don't have any fields for a module, add them as a separate table
-                if len(_entries) == 2:
-                    # Add it to last table
-                    if _entries not in table_without_fields['modules']:
-                        table_without_fields['modules'].append(_entries)
-                    continue
-                # add row table
-                _modules.append(_entries)
-
-                # add the module code (if it has > 0 fields)
-                module_codes_with_entries.add(_entries[0])
-            # add table for a specific version of fields to list of tables
-            multiple_tables.append({ 'headers': _headers,'modules':_modules})
-
-        # Clean up the last table (without fields)
-        temp_table = []
-        for t in table_without_fields['modules']:
-            if t[0] not in module_codes_with_entries:
-                temp_table.append(t)
-        # Cleaned up list of modules (to be shown as the last table)
-        table_without_fields['modules'] = temp_table
-
-        multiple_tables.append(table_without_fields)
-
-        # Write the table data to a temporary csv file
-        # define the file name
-        filename = "/tmp/table_{}.csv".format(random.randint(1, 100000))
-
-        # Open the file for writing and use cscv module for writing
-        with open(filename, 'w') as myfile:
-            # Initialize the csv writer
-            wr = csv.writer(myfile, quoting=csv.QUOTE_ALL)
-
-
-            for table in multiple_tables:
-                # write the data (header + rows) using the csv writer
-                wr.writerows([table['headers']] + table['modules'])
-                wr.writerow(["\n"])
-
-        # Read the csv file, and send the file as an HTTP response back to the client,
-        # which gets downloaded on the user's machine
-        with open(filename, 'r') as myfile:
-            # Create an HTTPResponse with attachment
-            response = HttpResponse(myfile, content_type='text/csv')
-            # Set the reponse headers (this triggers the download on client side)
-            response['Content-Disposition'] = 'attachment; filename=ModelSummarySheet.csv'
-            return response
+        return csv_download_response(module_sheet_csv_rows(), 'ModelSummarySheet.csv')
+
 
+
+@method_decorator(report_condition, name='get')
+class ModuleSheetWorkbookDownload(View):
     '''
-    filter all the entries to module
+    this will be calleed for downloading the xlsx workbook
+    each form version table and the lab sheet get their own worksheet
+    xlsx is already compressed so it is not gzipped
     '''
-    def _filterByModule(self, module_desc_entries, module, version):
-        for entry in module_desc_entries:
-            # check if module code and version match
-            if entry.module_description_id.module.module_code == module.module_code and \
-                entry.field_id.module_description_version_id == version.module_description_version:
-                yield entry
-
+    def get(self, request, *args, **kwargs):
+        return xlsx_download_response(report_worksheets(), 'ModelSummarySheet.xlsx')
 
 
-class ModuleSheetView(View):
+class ModuleHandbookView(View):
     '''
-    this will be calleed for displaying the page
-    returns the rendered output
+    this will be calleed for displaying the module handbook
+    the handbook is one html document streamed a module at a time
     '''
     def get(self, request, *args, **kwargs):
-        modules = Module.objects.all()  # gets all the modules
-        module_desc_entries = ModuleDescriptionEntry.objects.all()  # gets all module desc entriy eg(string_entry)
-        form_fields = FormFieldEntity.objects.all() # gets all fields
-        versions = ModuleDescriptionFormVersion.objects.all() #gets all versions
-
-        # group form fields by version
-        form_fields_by_version = defaultdict(list)
-        for form_field in form_fields:
-            form_fields_by_version[form_field.module_description_version_id].append(form_field)
-
-        # this table will have all the modules without any fields (will be shown as a separate table)
-        table_without_fields = {
-            'headers': ['Module Code','Module Name'],
-            'modules': []
-        }
-
-        # this list will contain set of all the tables on the page
-        multiple_tables = []
-
-        # set of module code which have fields for any version
-        module_codes_with_entries = set()
-
-        # loop over different versions and collect module, form data for each version
-        for idx, version in enumerate(versions):
-            # get all the fields for a specific version
-            form_fields = form_fields_by_version[version.module_description_version]
-            _headers = ['Module Code','Module Name'] #will be used to create headers
-            # add each field as header
-            for formfield in form_fields:
-                _headers.append(formfield.entity_label)
-            # list of modules
-            _modules = []
-            # go over each module
-            for module in modules:
-                # gets all entries for this module
-                entries = list(self._filterByModule(module_desc_entries, module, version))
-                # create row
-                _entries = [module.module_code, module.module_name]
-                for e in entries:
-                    _entries.append(e.string_entry)
-
-                # if we don't have any fields for a module, add them as a separate table
-                if len(_entries) == 2:
-                    # Add it to last table
-                    if _entries not in table_without_fields['modules']:
-                        table_without_fields['modules'].append(_entries)
-                    continue
-                # add row table
-                _modules.append(_entries)
-
-                # add the module code (if it has > 0 fields)
-                module_codes_with_entries.add(_entries[0])
-            # add table for a specific version of fields to list of tables
-            multiple_tables.append({ 'headers': _headers,'modules':_modules})
-
-        # Clean up the last table (without fields)
-        temp_table = []
-        for t in table_without_fields['modules']:
-            if t[0] not in module_codes_with_entries:
-                temp_table.append(t)
-        # Cleaned up list of modules (to be shown as the last table)
-        table_without_fields['modules'] = temp_table
-
-        multiple_tables.append(table_without_fields)
-
-        return render(request,'module_sheet.html', {'multiple_tables': multiple_tables})
+        return handbook_response()
+
 
+class ModuleSheetView(ListView):
     '''
-    filter all the entries to module
+    this will be calleed for displaying the page
+    only one version table is shown at a time, one page of modules at a time
+    ?version= picks the form version (defaults to the newest, "none" shows
+    the modules without a description) and ?fields= picks the columns shown
+    only the modules and fields on the page are fetched
     '''
-    def _filterByModule(self, module_desc_entries, module, version):
-        for entry in module_desc_entries:
-            # check if module code and version match
-            if entry.module_description_id.module.module_code == module.module_code and \
-                entry.field_id.module_description_version_id == version.module_description_version:
-                yield entry
+    template_name = 'module_sheet.html'
+    paginate_by = 25
+    no_description = 'none'
+
+    def get(self, request, *args, **kwargs):
+        self.version = self.get_version()
+        self.version_fields = self.get_version_fields()
+        self.field_ids = self.get_field_ids()
+        return super(ModuleSheetView, self).get(request, *args, **kwargs)
+
+    def get_version(self):
+        '''
+        returns the selected form version, None for modules
+        without a description
+        '''
+        selected = self.request.GET.get('version', '')
+        if selected == self.no_description:
+            return None
+        if selected == '':
+            return ModuleDescriptionFormVersion.objects.order_by('-pk').first()
+        try:
+            return ModuleDescriptionFormVersion.objects.get(pk=int(selected))
+        except (ValueError, ModuleDescriptionFormVersion.DoesNotExist):
+            raise Http404("Form version does not exist")
+
+    def get_version_fields(self):
+        '''
+        returns the (id, label) of every field of the selected version
+        '''
+        if self.version is None:
+            return []
+        return list(FormFieldEntity.objects.filter(
+            module_description_version=self.version
+        ).order_by('entity_order').values_list('entity_id', 'definition__entity_label'))
+
+    def get_field_ids(self):
+        '''
+        returns the ids of the chosen fields, or None when all fields are shown
+        fields can be repeated or given as a comma seperated list
+        '''
+        chosen = set()
+        for value in self.request.GET.getlist('fields'):
+            for field_id in value.split(','):
+                if field_id.strip().isdigit():
+                    chosen.add(int(field_id))
+        if not chosen:
+            return None
+        return [field_id for field_id, _ in self.version_fields if field_id in chosen]
+
+    def get_queryset(self):
+        '''
+        the modules whose current description is for the selected version
+        '''
+        described = current_descriptions()
+        if self.version is None:
+            return Module.objects.exclude(
+                pk__in=described.values('module_id')
+            ).order_by('module_code')
+        return Module.objects.filter(
+            pk__in=described.filter(form_version=self.version).values('module_id')
+        ).order_by('module_code')
+
+    def get_context_data(self, *args, **kwargs):
+        context = super(ModuleSheetView, self).get_context_data(*args, **kwargs)
+        page_modules = list(context['object_list'])
+
+        if self.version is None:
+            table = {
+                'headers': BASE_HEADERS,
+                'modules': [[module.module_code, module.module_name] for module in page_modules]
+            }
+        else:
+            pivot = ModuleSheetPivot(
+                modules=Module.objects.filter(pk__in=[module.pk for module in page_modules]),
+                versions=ModuleDescriptionFormVersion.objects.filter(pk=self.version.pk),
+                field_ids=self.field_ids
+            )
+            # only the selected version table is computed
+            version_table = next(pivot.tables(include_empty=False))
+            table = {
+                'headers': version_table.headers,
+                'modules': list(version_table.rows)
+            }
+
+        context['multiple_tables'] = [table]
+        context['versions'] = ModuleDescriptionFormVersion.objects.order_by('-pk')
+        context['selected_version'] = self.version
+        context['version_fields'] = self.version_fields
+        context['selected_fields'] = self.field_ids or []
+        return context
@@ -0,0 +1,56 @@
+from django.http import JsonResponse
+from django.views import View
+from django.views.generic.list import ListView
+from forms.utils.description_search import DescriptionSearch, indexed_labels
+
+
+class DescriptionSearchView(ListView):
+    '''
+    this will be calleed for searching the current module descriptions
+    ?q= are the words to search for and ?label= limits the answers to
+    one field, the best matches are shown first a page at a time
+    '''
+    template_name = 'description_search.html'
+    paginate_by = 25
+
+    def get_queryset(self):
+        return DescriptionSearch(
+            self.request.GET.get('q', ''),
+            label=self.request.GET.get('label', '')
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super(DescriptionSearchView, self).get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        context['labels'] = indexed_labels()
+        context['selected_label'] = self.request.GET.get('label', '')
+        return context
+
+
+class DescriptionSearchApi(View):
+    '''
+    returns the answers of the current module descriptions matching ?q=
+    as json, best match first. ?label= limits the answers to one field,
+    ?limit= and ?offset= page through the results
+    '''
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.GET.get('limit', self.default_limit))
+            offset = int(request.GET.get('offset', 0))
+        except ValueError:
+            return JsonResponse({'error': 'limit and offset must be numbers'}, status=400)
+        limit = max(1, min(limit, self.max_limit))
+        offset = max(0, offset)
+
+        search = DescriptionSearch(
+            request.GET.get('q', ''), label=request.GET.get('label', '')
+        )
+        return JsonResponse({
+            'count': search.count(),
+            'results': [
+                result._asdict() for result in search.results(offset, limit)
+            ]
+        })
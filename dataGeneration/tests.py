@@ -1,3 +1,1120 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import shutil
+from datetime import timedelta
+import tempfile
+import zipfile
+from io import BytesIO, StringIO
+from unittest import mock
+from openpyxl import load_workbook
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.urlresolvers import reverse
+from django.http import StreamingHttpResponse
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from core.tests.common_test_utils import LoggedInTestCase
+from core.models import Module, User
+from dataGeneration.utils.lab_sheet import LabSheetBuilder, NO_LAB_TUTOR
+from dataGeneration.models import (ReportSnapshot, ReportJob, MODULE_SHEET,
+                                   LAB_SHEET)
+from dataGeneration.utils.jobs import run_queued_jobs, run_job
+from dataGeneration.utils.deltas import report_changes
+from dataGeneration.utils.module_sheet import ModuleSheetPivot
+from dataGeneration.utils.handbook import HandbookBuilder
+from dataGeneration.utils.tracking_summary import (TrackingSummaryBuilder,
+                                                   TRACKING_SUMMARY_HEADERS)
+from dataGeneration.utils.snapshots import (refresh_snapshots,
+                                            rebuild_snapshots,
+                                            check_snapshots)
+from forms.utils.description_search import rebuild_index
+from forms.models import (ModuleDescription, ModuleDescriptionEntry,
+                          ModuleDescriptionFormVersion, FormFieldEntity,
+                          FormFieldDefinition,
+                          ModuleSoftware, ModuleSupport, ModuleTeaching,
+                          ModuleAssessment, ModuleReassessment)
+
+
+class DataGenerationTestCase(LoggedInTestCase):
+    """
+    Base test case for the dataGeneration reports. Creates two
+    modules where only one of them has a module description.
+    """
+    def setUp(self):
+        super(DataGenerationTestCase, self).setUp()
+        self.module = Module.objects.create(
+            module_code="CM3301",
+            module_name="Test Module",
+            module_credits="10",
+            module_level="L6",
+            semester="Autumn Semester",
+            delivery_language="English",
+            module_leader=self.user
+        )
+        self.empty_module = Module.objects.create(
+            module_code="CM3302",
+            module_name="Empty Module",
+            module_credits="10",
+            module_level="L5",
+            semester="Spring Semester",
+            delivery_language="English",
+            module_leader=self.user
+        )
+
+        self.version = ModuleDescriptionFormVersion.objects.create(
+            creation_date=timezone.now()
+        )
+        self.aims = FormFieldEntity.objects.create_field(
+            self.version,
+            1,
+            entity_label="Aims",
+            entity_type="text-input"
+        )
+        self.syllabus = FormFieldEntity.objects.create_field(
+            self.version,
+            2,
+            entity_label="Syllabus",
+            entity_type="text-area"
+        )
+
+        self.description = ModuleDescription.objects.create_new(
+            self.module, self.version
+        )
+        ModuleDescriptionEntry.objects.create_new_entry(
+            self.description, self.aims, "Learn things"
+        )
+        ModuleDescriptionEntry.objects.create_new_entry(
+            self.description, self.syllabus, "Docker, Python"
+        )
+        refresh_snapshots(self.module)
+
+    def login(self):
+        """
+        Logs in the user with the session the templates need
+        """
+        self.client.force_login(self.user)
+        session = self.client.session
+        session['username'] = self.user.username
+        session.save()
+
+    def get_content(self, response):
+        """
+        Joins the body of a normal or streaming response
+        """
+        if isinstance(response, StreamingHttpResponse):
+            return b''.join(response.streaming_content).decode('utf-8')
+        return response.content.decode('utf-8')
+
+
+class TestModuleSheetDownload(DataGenerationTestCase):
+    """
+    Test case for the ModuleSheetDownload view
+    """
+    def setUp(self):
+        super(TestModuleSheetDownload, self).setUp()
+        self.url = reverse('ModuleSheetDownload')
+
+    def test_download_is_streamed(self):
+        """
+        Test that the csv is streamed as an attachment
+        """
+        self.login()
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(isinstance(response, StreamingHttpResponse))
+        self.assertEquals(
+            response['Content-Disposition'],
+            'attachment; filename=ModelSummarySheet.csv'
+        )
+
+    def test_download_content(self):
+        """
+        Test that each version table is written, followed
+        by the modules that have no description.
+        """
+        self.login()
+        response = self.client.get(self.url)
+        lines = self.get_content(response).splitlines()
+        self.assertEquals(
+            lines[0], '"Module Code","Module Name","Aims","Syllabus"'
+        )
+        self.assertEquals(
+            lines[1], '"CM3301","Test Module","Learn things","Docker, Python"'
+        )
+        self.assertIn('"CM3302","Empty Module"', lines)
+        self.assertNotIn('"CM3301","Test Module"', lines)
+
+    def test_download_not_logged_in(self):
+        """
+        Test that users who are not logged in are redirected
+        """
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 302)
+
+
+class TestModuleSheetPivot(DataGenerationTestCase):
+    """
+    Test case for the ModuleSheetPivot engine
+    """
+    def get_tables(self):
+        return [
+            (table.headers, list(table.rows))
+            for table in ModuleSheetPivot().tables()
+        ]
+
+    def test_tables(self):
+        """
+        Test that a table is made for each version and one
+        for the modules without a description
+        """
+        tables = self.get_tables()
+        self.assertEquals(len(tables), 2)
+        self.assertEquals(
+            tables[0],
+            (['Module Code', 'Module Name', 'Aims', 'Syllabus'],
+             [['CM3301', 'Test Module', 'Learn things', 'Docker, Python']])
+        )
+        self.assertEquals(
+            tables[1],
+            (['Module Code', 'Module Name'], [['CM3302', 'Empty Module']])
+        )
+
+    def test_only_current_description(self):
+        """
+        Test that only the most recent description of a module is used
+        """
+        description = ModuleDescription.objects.create_new(
+            self.module, self.version
+        )
+        ModuleDescriptionEntry.objects.create_new_entry(
+            description, self.syllabus, "Kubernetes"
+        )
+        tables = self.get_tables()
+        self.assertEquals(
+            tables[0][1], [['CM3301', 'Test Module', '', 'Kubernetes']]
+        )
+
+    def test_query_count_is_constant(self):
+        """
+        Test that adding more modules does not add more queries
+        """
+        for i in range(5):
+            module = Module.objects.create(
+                module_code="CM400{}".format(i),
+                module_name="Module {}".format(i),
+                module_credits="10",
+                module_level="L6",
+                semester="Autumn Semester",
+                delivery_language="English",
+                module_leader=self.user
+            )
+            description = ModuleDescription.objects.create_new(
+                module, self.version
+            )
+            ModuleDescriptionEntry.objects.create_new_entry(
+                description, self.aims, "Aim {}".format(i)
+            )
+        with self.assertNumQueries(4):
+            self.get_tables()
+
+
+class TestLabSheetBuilder(DataGenerationTestCase):
+    """
+    Test case for the LabSheetBuilder
+    """
+    def setUp(self):
+        super(TestLabSheetBuilder, self).setUp()
+        for name in ("Python", "Docker"):
+            ModuleSoftware.objects.create(
+                module=self.module,
+                software_name=name,
+                software_version="3",
+                current_flag=True
+            )
+        # archived rows should not be on the sheet
+        ModuleSoftware.objects.create(
+            module=self.module,
+            software_name="Java",
+            archive_flag=True
+        )
+        ModuleTeaching.objects.create(
+            module=self.module,
+            teaching_lectures=10,
+            teaching_tutorials=10,
+            teaching_online=0,
+            teaching_practical_workshops=12,
+            teaching_supervised_time=0,
+            teaching_fieldworks=0,
+            teaching_external_visits=0,
+            teaching_schedule_assessment=2,
+            teaching_placement=0,
+            current_flag=True
+        )
+        ModuleSupport.objects.create(
+            module=self.module,
+            lab_support_skills="Linux",
+            current_flag=True
+        )
+
+    def test_rows(self):
+        """
+        Test that there is a row for each software item and
+        modules without software still have a row
+        """
+        rows = list(LabSheetBuilder().rows())
+        self.assertEquals(rows, [
+            ('CM3301', 'Test Module', 'Python', '3', 12, 'Linux'),
+            ('CM3301', 'Test Module', 'Docker', '3', 12, 'Linux'),
+            ('CM3302', 'Empty Module', '', '', '', NO_LAB_TUTOR),
+        ])
+
+    def test_query_count_is_constant(self):
+        """
+        Test that the number of queries does not depend on the modules
+        """
+        with self.assertNumQueries(4):
+            list(LabSheetBuilder().rows())
+
+    def test_download(self):
+        """
+        Test that the lab sheet is streamed as a csv
+        """
+        refresh_snapshots(self.module)
+        self.login()
+        response = self.client.get(reverse('labSheetDownload'))
+        self.assertEquals(response.status_code, 200)
+        lines = self.get_content(response).splitlines()
+        self.assertEquals(len(lines), 4)
+        self.assertEquals(
+            lines[2], '"CM3301","Test Module","Docker","3","12","Linux"'
+        )
+
+    def get_api(self, **params):
+        self.login()
+        response = self.client.get(reverse('labSheetApi'), params)
+        self.assertEquals(response.status_code, 200)
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_api_pages(self):
+        """
+        Test that the api pages through the modules by module code
+        """
+        data = self.get_api(limit=1)
+        self.assertEquals(data['next_after'], 'CM3301')
+        self.assertEquals(len(data['results']), 2)
+        self.assertEquals(data['results'][0], {
+            'module_code': 'CM3301',
+            'module_name': 'Test Module',
+            'software_name': 'Python',
+            'software_version': '3',
+            'practical_hours': 12,
+            'tutor_skills': 'Linux'
+        })
+
+        data = self.get_api(limit=1, after=data['next_after'])
+        self.assertIsNone(data['next_after'])
+        self.assertEquals(
+            [row['module_code'] for row in data['results']], ['CM3302']
+        )
+
+    def test_api_filters(self):
+        """
+        Test that the api filters by semester and software name
+        """
+        data = self.get_api(semester='Spring Semester')
+        self.assertEquals(
+            [row['module_code'] for row in data['results']], ['CM3302']
+        )
+
+        data = self.get_api(software='dock')
+        self.assertEquals(
+            [(row['module_code'], row['software_name'])
+             for row in data['results']],
+            [('CM3301', 'Docker')]
+        )
+
+        # archived software does not match
+        data = self.get_api(software='java')
+        self.assertEquals(data['results'], [])
+
+
+class TestTrackingSummary(DataGenerationTestCase):
+    """
+    Test case for the tracking form summary
+    """
+    def setUp(self):
+        super(TestTrackingSummary, self).setUp()
+        for title in ("Exam", "Coursework"):
+            ModuleAssessment.objects.create(
+                module=self.module,
+                assessment_title=title,
+                assessment_type="Written",
+                assessment_weight=50,
+                assessment_duration=2,
+                assessment_hand_out="Week 1",
+                assessment_hand_in="Week 2",
+                learning_outcomes_covered="1, 2",
+                current_flag=True
+            )
+        # archived rows should not be in the summary
+        ModuleAssessment.objects.create(
+            module=self.module,
+            assessment_title="Old Exam",
+            assessment_type="Written",
+            assessment_weight=100,
+            assessment_duration=2,
+            assessment_hand_out="Week 1",
+            assessment_hand_in="Week 2",
+            learning_outcomes_covered="1",
+            archive_flag=True
+        )
+        ModuleReassessment.objects.create(
+            module=self.module,
+            reassessment_requested=True,
+            reassessment_new_method="Coursework",
+            current_flag=True
+        )
+
+    def test_row_per_assessment(self):
+        """
+        Test that there is a row for each current assessment and
+        modules without assessments still have a row
+        """
+        rows = list(TrackingSummaryBuilder().rows())
+        self.assertEquals(len(rows), 3)
+        for row in rows:
+            self.assertEquals(len(row), len(TRACKING_SUMMARY_HEADERS))
+
+        headers = list(TRACKING_SUMMARY_HEADERS)
+        exam = dict(zip(headers, rows[0]))
+        self.assertEquals(exam['Module Code'], 'CM3301')
+        self.assertEquals(exam['Module Level'], 'L6')
+        self.assertEquals(exam['Semester'], 'Autumn Semester')
+        self.assertEquals(exam['Assessment Title'], 'Exam')
+        self.assertEquals(exam['New Reassessment Method'], 'Coursework')
+        self.assertEquals(exam['Lectures'], '')
+        self.assertEquals(
+            dict(zip(headers, rows[1]))['Assessment Title'], 'Coursework'
+        )
+
+        empty = dict(zip(headers, rows[2]))
+        self.assertEquals(empty['Module Code'], 'CM3302')
+        self.assertEquals(empty['Assessment Title'], '')
+
+    def test_query_count_is_constant(self):
+        """
+        Test that the number of queries does not depend on the modules
+        """
+        with self.assertNumQueries(5):
+            list(TrackingSummaryBuilder().rows())
+
+    def test_download(self):
+        """
+        Test that the summary is streamed as a csv
+        """
+        self.login()
+        response = self.client.get(reverse('TrackingSummaryDownload'))
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(isinstance(response, StreamingHttpResponse))
+        self.assertEquals(len(self.get_content(response).splitlines()), 4)
+
+    def test_api(self):
+        """
+        Test that the summary is streamed as a json list
+        """
+        self.login()
+        response = self.client.get(reverse('TrackingSummaryApi'))
+        self.assertEquals(response.status_code, 200)
+        rows = json.loads(self.get_content(response))
+        self.assertEquals(
+            [(row['module_code'], row['assessment_title']) for row in rows],
+            [('CM3301', 'Exam'), ('CM3301', 'Coursework'), ('CM3302', '')]
+        )
+
+
+class TestModuleHandbook(DataGenerationTestCase):
+    """
+    Test case for the module handbook
+    """
+    def test_sections(self):
+        """
+        Test that each module has a section with its answers in form order
+        """
+        sections = list(HandbookBuilder().sections())
+        self.assertEquals(
+            [section.module.module_code for section in sections],
+            ['CM3301', 'CM3302']
+        )
+        self.assertEquals(
+            sections[0].fields,
+            [('Aims', 'Learn things'), ('Syllabus', 'Docker, Python')]
+        )
+        self.assertEquals(sections[1].fields, [])
+
+    def test_queries_per_chunk(self):
+        """
+        Test that the modules are loaded with a fixed number of
+        queries for each chunk
+        """
+        with self.assertNumQueries(5):
+            list(HandbookBuilder(chunk_size=2).sections())
+        with self.assertNumQueries(9):
+            list(HandbookBuilder(chunk_size=1).sections())
+
+    def test_view_is_streamed(self):
+        """
+        Test that the handbook is streamed as one document with contents
+        """
+        self.login()
+        response = self.client.get(reverse('ModuleHandbookView'))
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(isinstance(response, StreamingHttpResponse))
+        content = self.get_content(response)
+        self.assertIn('<a href="#CM3301">CM3301: Test Module</a>', content)
+        self.assertIn('<section id="CM3302">', content)
+        self.assertIn('<dd>Docker, Python</dd>', content)
+        self.assertTrue(content.rstrip().endswith('</html>'))
+
+
+class TestReportSnapshots(DataGenerationTestCase):
+    """
+    Test case for the materialized report snapshots
+    """
+    def test_snapshot_per_module_per_report(self):
+        """
+        Test that every module has a snapshot for each report
+        """
+        ReportSnapshot.objects.all().delete()
+        self.assertEquals(rebuild_snapshots(), 4)
+        snapshot = ReportSnapshot.objects.get(
+            report=MODULE_SHEET, module=self.module
+        )
+        self.assertEquals(snapshot.form_version, self.version)
+        self.assertEquals(snapshot.get_rows(), [
+            ['CM3301', 'Test Module', 'Learn things', 'Docker, Python']
+        ])
+        snapshot = ReportSnapshot.objects.get(
+            report=LAB_SHEET, module=self.empty_module
+        )
+        self.assertEquals(snapshot.form_version, None)
+
+    def test_module_save_refreshes_snapshots(self):
+        """
+        Test that changes to the module details are in the snapshots
+        """
+        self.module.module_name = "Renamed Module"
+        self.module.save()
+        snapshot = ReportSnapshot.objects.get(
+            report=LAB_SHEET, module=self.module
+        )
+        self.assertEquals(snapshot.get_rows()[0][1], "Renamed Module")
+
+    def test_unchanged_snapshots_are_not_saved(self):
+        """
+        Test that refreshing or rebuilding snapshots whose rows have not
+        changed leaves their last_modified as it was
+        """
+        rebuild_snapshots()
+        before = timezone.now() - timedelta(days=1)
+        ReportSnapshot.objects.update(last_modified=before)
+
+        self.module.save()
+        refresh_snapshots(self.empty_module)
+        self.assertEquals(rebuild_snapshots(), 0)
+        self.assertEquals(
+            set(ReportSnapshot.objects.values_list('last_modified', flat=True)),
+            {before}
+        )
+
+        self.module.module_name = "Renamed Module"
+        self.module.save()
+        self.assertEquals(
+            set(ReportSnapshot.objects.filter(
+                last_modified__gt=before
+            ).values_list('report', 'module')),
+            {(MODULE_SHEET, 'CM3301'), (LAB_SHEET, 'CM3301')}
+        )
+
+    def test_check_snapshots(self):
+        """
+        Test that the checker finds snapshots that are out of date
+        """
+        rebuild_snapshots()
+        self.assertEquals(check_snapshots(), [])
+
+        ModuleDescriptionEntry.objects.create_new_entry(
+            ModuleDescription.objects.create_new(
+                self.empty_module, self.version
+            ),
+            self.aims,
+            "New aims"
+        )
+        self.assertEquals(
+            check_snapshots(), [(MODULE_SHEET, 'CM3302', 'stale')]
+        )
+
+        refresh_snapshots(self.empty_module)
+        self.assertEquals(check_snapshots(), [])
+
+
+
+class TestModuleSheetView(DataGenerationTestCase):
+    """
+    Test case for the paginated module sheet page
+    """
+    def setUp(self):
+        super(TestModuleSheetView, self).setUp()
+        self.url = reverse('ModuleSheetView')
+        self.login()
+
+    def test_defaults_to_newest_version(self):
+        """
+        Test that only the newest version table is shown by default
+        """
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 200)
+        tables = response.context['multiple_tables']
+        self.assertEquals(len(tables), 1)
+        self.assertEquals(
+            tables[0]['headers'], ['Module Code', 'Module Name', 'Aims', 'Syllabus']
+        )
+        self.assertEquals(
+            tables[0]['modules'],
+            [['CM3301', 'Test Module', 'Learn things', 'Docker, Python']]
+        )
+
+    def test_no_description_version(self):
+        """
+        Test that version=none shows the modules without a description
+        """
+        response = self.client.get(self.url, {'version': 'none'})
+        tables = response.context['multiple_tables']
+        self.assertEquals(tables[0]['modules'], [['CM3302', 'Empty Module']])
+
+    def test_unknown_version(self):
+        """
+        Test that an unknown version is a 404
+        """
+        response = self.client.get(self.url, {'version': 999})
+        self.assertEquals(response.status_code, 404)
+
+    def test_field_projection(self):
+        """
+        Test that only the chosen fields are shown
+        """
+        response = self.client.get(self.url, {'fields': self.syllabus.pk})
+        tables = response.context['multiple_tables']
+        self.assertEquals(
+            tables[0]['headers'], ['Module Code', 'Module Name', 'Syllabus']
+        )
+        self.assertEquals(
+            tables[0]['modules'], [['CM3301', 'Test Module', 'Docker, Python']]
+        )
+
+    def test_paginated_over_modules(self):
+        """
+        Test that only a page of modules is shown
+        """
+        for i in range(30):
+            module = Module.objects.create(
+                module_code="CM4{:03}".format(i),
+                module_name="Module {}".format(i),
+                module_credits="10",
+                module_level="L6",
+                semester="Autumn Semester",
+                delivery_language="English",
+                module_leader=self.user
+            )
+            ModuleDescriptionEntry.objects.create_new_entry(
+                ModuleDescription.objects.create_new(module, self.version),
+                self.aims,
+                "Aims {}".format(i)
+            )
+
+        response = self.client.get(self.url)
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEquals(len(response.context['multiple_tables'][0]['modules']), 25)
+
+        response = self.client.get(self.url, {'page': 2})
+        self.assertEquals(len(response.context['multiple_tables'][0]['modules']), 6)
+
+
+class TestModuleSheetWorkbookDownload(DataGenerationTestCase):
+    """
+    Test case for the xlsx workbook download
+    """
+    def test_worksheet_per_version(self):
+        """
+        Test that each form version and the lab sheet
+        have their own worksheet
+        """
+        self.login()
+        response = self.client.get(reverse('ModuleSheetWorkbookDownload'))
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(
+            response['Content-Disposition'],
+            'attachment; filename=ModelSummarySheet.xlsx'
+        )
+
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)))
+        self.assertEquals(len(workbook.sheetnames), 3)
+        self.assertEquals(workbook.sheetnames[1:],
+                          ['No Description', 'Lab Organisation'])
+
+        rows = list(workbook.worksheets[0].values)
+        self.assertEquals(rows, [
+            ('Module Code', 'Module Name', 'Aims', 'Syllabus'),
+            ('CM3301', 'Test Module', 'Learn things', 'Docker, Python'),
+        ])
+        rows = list(workbook.worksheets[2].values)
+        self.assertEquals(len(rows), 3)
+
+
+class TestConditionalDownloads(DataGenerationTestCase):
+    """
+    Test case for the conditional GET and compression of the downloads
+    """
+    def setUp(self):
+        super(TestConditionalDownloads, self).setUp()
+        self.url = reverse('labSheetDownload')
+        self.login()
+
+    def test_validators_are_sent(self):
+        """
+        Test that every download sends an ETag, and no Last-Modified
+        as it would not move when a module is deleted
+        """
+        for name in ('labSheetDownload', 'ModuleSheetDownload',
+                     'ModuleSheetWorkbookDownload'):
+            response = self.client.get(reverse(name))
+            self.assertEquals(response.status_code, 200)
+            self.assertTrue(response.has_header('ETag'))
+            self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_not_modified(self):
+        """
+        Test that a repeat request gets a 304 without a body
+        """
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 304)
+        self.assertEquals(response.content, b'')
+
+    def test_modified_after_refresh(self):
+        """
+        Test that the ETag changes when the snapshots change
+        """
+        etag = self.client.get(self.url)['ETag']
+        ReportSnapshot.objects.filter(module=self.empty_module).delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 200)
+        self.assertNotEquals(response['ETag'], etag)
+
+    def test_modified_after_delete(self):
+        """
+        Test that the ETag changes when a module is deleted
+        """
+        etag = self.client.get(self.url)['ETag']
+        self.empty_module.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 200)
+
+    def test_modified_after_new_definition(self):
+        """
+        Test that the ETag changes when a field gets a new definition
+        """
+        etag = self.client.get(self.url)['ETag']
+        FormFieldDefinition.objects.get_definition(FormFieldDefinition(
+            entity_label="Goals", entity_type="text-input"
+        ))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 200)
+
+    def test_gzip(self):
+        """
+        Test that the csv is gzipped when the client accepts it
+        and a gzipped ETag still matches
+        """
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEquals(response['Content-Encoding'], 'gzip')
+        content = gzip.decompress(b''.join(response.streaming_content))
+        self.assertIn(b'"CM3301"', content)
+
+        response = self.client.get(
+            self.url,
+            HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEquals(response.status_code, 304)
+
+
+class TestReportJobs(DataGenerationTestCase):
+    """
+    Test case for the background report jobs
+    """
+    def setUp(self):
+        super(TestReportJobs, self).setUp()
+        self.jobs_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            REPORT_JOBS_ROOT=self.jobs_root
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.jobs_root)
+        super(TestReportJobs, self).tearDown()
+
+    def test_identical_jobs_are_deduplicated(self):
+        """
+        Test that queueing an export which is already queued
+        returns the existing job
+        """
+        self.login()
+        url = reverse('ReportJobCreate')
+        first = self.client.post(url, {'export': 'lab_sheet_csv'})
+        second = self.client.post(url, {'export': 'lab_sheet_csv'})
+        self.assertEquals(first.status_code, 202)
+        self.assertEquals(second.status_code, 200)
+        self.assertEquals(first.json()['job_id'], second.json()['job_id'])
+        self.assertEquals(ReportJob.objects.count(), 1)
+
+    def test_invalid_export(self):
+        """
+        Test that an unknown export is rejected
+        """
+        self.login()
+        response = self.client.post(reverse('ReportJobCreate'), {
+            'export': 'unknown'
+        })
+        self.assertEquals(response.status_code, 400)
+
+    def test_worker_builds_download(self):
+        """
+        Test that the worker builds the file, which can then be downloaded
+        """
+        job, _ = ReportJob.objects.enqueue('module_sheet_csv', self.user)
+        self.login()
+        download_url = reverse('ReportJobDownload', kwargs={'pk': job.pk})
+        self.assertEquals(self.client.get(download_url).status_code, 404)
+
+        self.assertEquals(run_queued_jobs(), 1)
+        status = self.client.get(
+            reverse('ReportJobStatus', kwargs={'pk': job.pk})
+        ).json()
+        self.assertEquals(status['status'], 'Finished')
+        self.assertEquals(status['download_url'], download_url)
+
+        response = self.client.get(download_url)
+        self.assertEquals(response.status_code, 200)
+        lines = self.get_content(response).splitlines()
+        self.assertEquals(
+            lines[1], '"CM3301","Test Module","Learn things","Docker, Python"'
+        )
+
+        # a new job can be queued once the previous one has finished
+        _, created = ReportJob.objects.enqueue('module_sheet_csv')
+        self.assertTrue(created)
+
+    def test_stale_job_is_failed(self):
+        """
+        Test that a job left running by a worker which stopped is failed,
+        so the export can be queued and built again
+        """
+        stale, _ = ReportJob.objects.enqueue('lab_sheet_csv')
+        self.assertEquals(ReportJob.objects.claim_next(), stale)
+        job, created = ReportJob.objects.enqueue('lab_sheet_csv')
+        self.assertEquals((job, created), (stale, False))
+
+        ReportJob.objects.filter(pk=stale.pk).update(
+            started=timezone.now() - timedelta(days=1)
+        )
+        job, created = ReportJob.objects.enqueue('lab_sheet_csv')
+        self.assertTrue(created)
+        stale.refresh_from_db()
+        self.assertEquals(stale.status, 'Failed')
+        self.assertIsNone(stale.active_export)
+
+        self.assertEquals(run_queued_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEquals(job.status, 'Finished')
+
+    def test_stale_job_is_not_finished(self):
+        """
+        Test that a worker which finishes a job after it was failed as
+        stale leaves it failed, and its file is removed
+        """
+        job, _ = ReportJob.objects.enqueue('lab_sheet_csv')
+        job = ReportJob.objects.claim_next()
+        ReportJob.objects.filter(pk=job.pk).update(
+            started=timezone.now() - timedelta(days=1)
+        )
+        self.assertEquals(ReportJob.objects.fail_stale(), 1)
+
+        run_job(job)
+        self.assertEquals(job.status, 'Failed')
+        self.assertEquals(ReportJob.objects.get(pk=job.pk).status, 'Failed')
+        self.assertEquals(os.listdir(self.jobs_root), [])
+
+    def test_failed_job_files_are_removed(self):
+        """
+        Test that a job which fails leaves no file behind
+        """
+        job, _ = ReportJob.objects.enqueue('lab_sheet_csv')
+        job = ReportJob.objects.claim_next()
+        with open(os.path.join(self.jobs_root, job.get_build_filename()), 'w'):
+            pass
+        self.assertTrue(job.fail("Broken"))
+        self.assertEquals(os.listdir(self.jobs_root), [])
+        # a failed job can not be failed or finished again
+        self.assertFalse(job.finish('file'))
+        self.assertEquals(job.status, 'Failed')
+
+    def test_superseded_files_are_removed(self):
+        """
+        Test that finishing a job removes the file of the export's
+        previous job, which can then no longer be downloaded
+        """
+        old, _ = ReportJob.objects.enqueue('lab_sheet_csv')
+        run_queued_jobs()
+        new, _ = ReportJob.objects.enqueue('lab_sheet_csv')
+        run_queued_jobs()
+        old.refresh_from_db()
+        new.refresh_from_db()
+        self.assertEquals(os.listdir(self.jobs_root), [new.filename])
+        self.assertEquals(old.filename, '')
+
+        self.login()
+        response = self.client.get(
+            reverse('ReportJobDownload', kwargs={'pk': old.pk})
+        )
+        self.assertEquals(response.status_code, 404)
+
+
+class TestReportDelta(DataGenerationTestCase):
+    """
+    Test case for the delta exports of the report snapshots
+    """
+    def setUp(self):
+        super(TestReportDelta, self).setUp()
+        self.url = reverse('ReportDelta')
+        self.login()
+        self.before = timezone.now() - timedelta(days=2)
+        self.after = timezone.now() - timedelta(days=1)
+
+        refresh_snapshots(self.empty_module)
+        ReportSnapshot.objects.filter(module=self.module).update(
+            last_modified=self.before
+        )
+        ReportSnapshot.objects.filter(module=self.empty_module).update(
+            last_modified=self.after
+        )
+
+    def changed_modules(self, data):
+        return [(c['report'], c['module_code']) for c in data['changes']]
+
+    def test_since(self):
+        """
+        Test that only the snapshots changed after since are returned
+        """
+        since = self.before + timedelta(hours=1)
+        response = self.client.get(self.url, {'since': since.isoformat()})
+        self.assertEquals(response.status_code, 200)
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEquals(
+            self.changed_modules(data),
+            [(MODULE_SHEET, 'CM3302'), (LAB_SHEET, 'CM3302')]
+        )
+        self.assertEquals(
+            data['changes'][0]['rows'], [['CM3302', 'Empty Module']]
+        )
+        self.assertFalse(data['more'])
+        self.assertFalse(data['includes_deletions'])
+
+    def test_cursor_pages(self):
+        """
+        Test that following the cursor returns every change once and
+        then nothing until there is another change
+        """
+        seen = []
+        cursor = ''
+        while True:
+            response = self.client.get(self.url, {'cursor': cursor, 'limit': 1})
+            data = json.loads(response.content.decode('utf-8'))
+            seen.extend(self.changed_modules(data))
+            cursor = data['cursor']
+            if not data['more']:
+                break
+        self.assertEquals(len(seen), 4)
+        self.assertEquals(len(set(seen)), 4)
+
+        response = self.client.get(self.url, {'cursor': cursor})
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEquals(data['changes'], [])
+        self.assertEquals(data['cursor'], cursor)
+
+        self.module.module_name = "Renamed Module"
+        self.module.save()
+        response = self.client.get(self.url, {'cursor': cursor})
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEquals(
+            self.changed_modules(data),
+            [(MODULE_SHEET, 'CM3301'), (LAB_SHEET, 'CM3301')]
+        )
+
+    def test_invalid_cursor(self):
+        """
+        Test that an unreadable cursor or since is a bad request
+        """
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEquals(response.status_code, 400)
+        response = self.client.get(self.url, {'since': 'yesterday'})
+        self.assertEquals(response.status_code, 400)
+
+    def test_command(self):
+        """
+        Test that the command exports the changes and the cursor
+        """
+        output = StringIO()
+        call_command(
+            'export_report_delta',
+            since=(self.before + timedelta(hours=1)).isoformat(),
+            report=LAB_SHEET,
+            stdout=output
+        )
+        data = json.loads(output.getvalue())
+        self.assertEquals(self.changed_modules(data), [(LAB_SHEET, 'CM3302')])
+        self.assertTrue(data['cursor'])
+
+    def test_batch_size(self):
+        """
+        Test that the command rejects a batch size which could never
+        finish, and report_changes always returns at least one change
+        """
+        for batch_size in (0, -1):
+            with self.assertRaises(CommandError):
+                call_command(
+                    'export_report_delta', batch_size=batch_size, stdout=StringIO()
+                )
+        page = report_changes(limit=0)
+        self.assertEquals(len(page['changes']), 1)
+        self.assertTrue(page['more'])
+
+
+class TestDescriptionSearch(DataGenerationTestCase):
+    """
+    Test case for searching the current module descriptions
+    """
+    def setUp(self):
+        super(TestDescriptionSearch, self).setUp()
+        rebuild_index()
+        self.login()
+
+    def test_view(self):
+        """
+        Test that the matching answers are shown with the term marked
+        """
+        response = self.client.get(
+            reverse('DescriptionSearchView'), {'q': 'python', 'label': 'Syllabus'}
+        )
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(len(response.context['object_list']), 1)
+        self.assertContains(response, 'Docker, <mark>Python</mark>')
+        self.assertEquals(response.context['labels'], ['Aims', 'Syllabus'])
+
+    def test_api(self):
+        """
+        Test that the api returns the count and a page of results
+        """
+        response = self.client.get(
+            reverse('DescriptionSearchApi'), {'q': 'learn', 'limit': 5}
+        )
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEquals(data['count'], 1)
+        self.assertEquals(data['results'], [{
+            'module_code': 'CM3301',
+            'module_name': 'Test Module',
+            'label': 'Aims',
+            'snippet': '<mark>Learn</mark> things'
+        }])
+
+    def test_api_bad_limit(self):
+        """
+        Test that a limit which is not a number is rejected
+        """
+        response = self.client.get(
+            reverse('DescriptionSearchApi'), {'q': 'learn', 'limit': 'all'}
+        )
+        self.assertEquals(response.status_code, 400)
+
+    def test_rebuild_command(self):
+        """
+        Test that the command reports the number of answers indexed
+        """
+        out = StringIO()
+        call_command('rebuild_description_search', stdout=out)
+        self.assertIn('Indexed 2 module description answers', out.getvalue())
+
+
+class TestReportBundle(TransactionTestCase):
+    """
+    Test case for the zip bundle of the reports. The reports are built
+    in other threads, so the data has to be committed for them to see it.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user1',
+            first_name='user',
+            last_name='user',
+            email='user@example.com',
+            password='password'
+        )
+        Module.objects.create(
+            module_code="CM3301",
+            module_name="Test Module",
+            module_credits="10",
+            module_level="L6",
+            semester="Autumn Semester",
+            delivery_language="English",
+            module_leader=self.user
+        )
+
+    def test_bundle(self):
+        """
+        Test that the zip has a member for each report
+        """
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('ReportBundleDownload'))
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response['Content-Type'], 'application/zip')
+        # the tracking summary is built live, so there is no validator
+        self.assertFalse(response.has_header('ETag'))
+
+        content = b''.join(response.streaming_content)
+        with zipfile.ZipFile(BytesIO(content)) as bundle:
+            self.assertEquals(
+                sorted(bundle.namelist()),
+                ['LabOrganisationSheet.csv', 'ModelSummarySheet.csv',
+                 'TrackingFormSummary.csv']
+            )
+            lab_sheet = bundle.read('LabOrganisationSheet.csv').decode('utf-8')
+        self.assertIn('"CM3301","Test Module"', lab_sheet)
+
+    def test_export_files_are_removed(self):
+        """
+        Test that the files the exports are built in are removed, also
+        when the download is stopped part way
+        """
+        self.client.force_login(self.user)
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.object(tempfile, 'tempdir', directory):
+                response = self.client.get(reverse('ReportBundleDownload'))
+                b''.join(response.streaming_content)
+                self.assertEquals(os.listdir(directory), [])
+
+                response = self.client.get(reverse('ReportBundleDownload'))
+                next(iter(response.streaming_content))
+                response.close()
+                self.assertEquals(os.listdir(directory), [])
 
-# Create your tests here.
@@ -0,0 +1,27 @@
+from django.views import View
+from dataGeneration.utils.exports import tracking_summary_csv_rows
+from dataGeneration.utils.streaming import (csv_download_response,
+                                            json_stream_response)
+from dataGeneration.utils.tracking_summary import (TrackingSummaryBuilder,
+                                                   TRACKING_SUMMARY_KEYS)
+
+
+class TrackingSummaryDownload(View):
+    '''
+    this will be calleed for downloading the tracking form summary as csv
+    there is a row for each current assessment of every module
+    '''
+    def get(self, request, *args, **kwargs):
+        return csv_download_response(tracking_summary_csv_rows(), 'TrackingFormSummary.csv')
+
+
+class TrackingSummaryApi(View):
+    '''
+    returns the tracking form summary as a streamed json list
+    each row is an object keyed by the tracking form field names
+    '''
+    def get(self, request, *args, **kwargs):
+        rows = TrackingSummaryBuilder().rows()
+        return json_stream_response(
+            dict(zip(TRACKING_SUMMARY_KEYS, row)) for row in rows
+        )
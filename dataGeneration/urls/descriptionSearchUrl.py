@@ -0,0 +1,9 @@
+from django.conf.urls import url
+from django.contrib.auth.decorators import login_required
+from dataGeneration.searchview import *
+
+
+urlpatterns = [
+    url(r'^descriptionSearch/$', login_required(DescriptionSearchView.as_view()), name='DescriptionSearchView'),
+    url(r'^descriptionSearchApi/$', login_required(DescriptionSearchApi.as_view()), name='DescriptionSearchApi'),
+]
@@ -9,4 +9,5 @@ from dataGeneration.views import *
 urlpatterns = [
     url(r'^labSheetPage/$', login_required(labSheetView.as_view()), name='labSheetView'),
     url(r'^labSheetDownload/$', login_required(labSheetDownload.as_view()), name='labSheetDownload'),
+    url(r'^labSheetApi/$', login_required(labSheetApi.as_view()), name='labSheetApi'),
 ]
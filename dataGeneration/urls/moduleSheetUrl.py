@@ -9,4 +9,6 @@ urlpatterns = [
     # url(r'^labSheetPage/$', login_required(TemplateView.as_view(template_name='lab_sheet.html')), name='index'),
     url(r'^moduleSheetPage/$', login_required(ModuleSheetView.as_view()), name='ModuleSheetView'),
     url(r'^moduleSheetDownload/$', login_required(ModuleSheetDownload.as_view()), name='ModuleSheetDownload'),
+    url(r'^moduleSheetDownload/xlsx/$', login_required(ModuleSheetWorkbookDownload.as_view()), name='ModuleSheetWorkbookDownload'),
+    url(r'^moduleHandbook/$', login_required(ModuleHandbookView.as_view()), name='ModuleHandbookView'),
 ]
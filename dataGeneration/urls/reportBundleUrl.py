@@ -0,0 +1,8 @@
+from django.conf.urls import url
+from django.contrib.auth.decorators import login_required
+from dataGeneration.bundleview import *
+
+
+urlpatterns = [
+    url(r'^reportBundle/$', login_required(ReportBundleDownload.as_view()), name='ReportBundleDownload'),
+]
@@ -0,0 +1,8 @@
+from django.conf.urls import url
+from django.contrib.auth.decorators import login_required
+from dataGeneration.deltaview import *
+
+
+urlpatterns = [
+    url(r'^reportDelta/$', login_required(ReportDelta.as_view()), name='ReportDelta'),
+]
@@ -0,0 +1,10 @@
+from django.conf.urls import url
+from django.contrib.auth.decorators import login_required
+from dataGeneration.jobview import *
+
+
+urlpatterns = [
+    url(r'^reportJobs/$', login_required(ReportJobCreate.as_view()), name='ReportJobCreate'),
+    url(r'^reportJobs/(?P<pk>[0-9]+)/$', login_required(ReportJobStatus.as_view()), name='ReportJobStatus'),
+    url(r'^reportJobs/(?P<pk>[0-9]+)/download/$', login_required(ReportJobDownload.as_view()), name='ReportJobDownload'),
+]
@@ -0,0 +1,9 @@
+from django.conf.urls import url
+from django.contrib.auth.decorators import login_required
+from dataGeneration.trackingview import *
+
+
+urlpatterns = [
+    url(r'^trackingSummaryDownload/$', login_required(TrackingSummaryDownload.as_view()), name='TrackingSummaryDownload'),
+    url(r'^trackingSummaryApi/$', login_required(TrackingSummaryApi.as_view()), name='TrackingSummaryApi'),
+]
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.db import connection
+from django.http import StreamingHttpResponse
+
+from dataGeneration.models import (MODULE_SHEET_CSV, LAB_SHEET_CSV,
+                                   TRACKING_SUMMARY_CSV)
+from dataGeneration.utils.exports import EXPORTS
+
+"""
+Zip bundle of several report exports. Each export is built in its own
+thread over its own database connection, and is added to the zip as
+soon as it has finished, so a bundle takes about as long as its
+slowest export. The zip is written to a temporary file and the bytes of
+each member are streamed out once it has been added.
+"""
+
+# exports that are put into the bundle, in the order they are started
+BUNDLE_EXPORTS = (
+    MODULE_SHEET_CSV,
+    LAB_SHEET_CSV,
+    TRACKING_SUMMARY_CSV,
+)
+
+BUNDLE_CHUNK_SIZE = 64 * 1024
+
+
+def build_export(export):
+    """
+    Writes an export to a named temporary file. Run in a worker thread,
+    so the thread's database connection is closed once it is done.
+
+    Return:
+        tuple of the export and the path of the file, which the caller
+        removes
+    """
+    try:
+        with tempfile.NamedTemporaryFile(delete=False) as output:
+            try:
+                export.write(output)
+            except Exception:
+                output.close()
+                os.remove(output.name)
+                raise
+        return export, output.name
+    finally:
+        connection.close()
+
+
+def read_written(zip_file, start):
+    """
+    Generator of the bytes of a file from start up to its current
+    position, leaving the file at that position
+    """
+    end = zip_file.tell()
+    zip_file.seek(start)
+    while zip_file.tell() < end:
+        yield zip_file.read(min(BUNDLE_CHUNK_SIZE, end - zip_file.tell()))
+    zip_file.seek(end)
+
+
+def stream_bundle(exports):
+    """
+    Generator of the bytes of a zip containing the exports. The exports
+    are built concurrently and each is written into the zip as it
+    completes. A member is only streamed once it is complete, as the
+    zip goes back to fill in its header.
+
+    Arguments:
+        exports         List of the Export objects to bundle
+    """
+    with tempfile.TemporaryFile() as zip_file, \
+            ThreadPoolExecutor(max_workers=len(exports)) as executor:
+        futures = [executor.submit(build_export, export) for export in exports]
+        try:
+            streamed = 0
+            with zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_DEFLATED) as bundle:
+                for future in as_completed(futures):
+                    export, path = future.result()
+                    try:
+                        bundle.write(path, export.filename)
+                    finally:
+                        os.remove(path)
+                    for chunk in read_written(zip_file, streamed):
+                        yield chunk
+                    streamed = zip_file.tell()
+            # the zip directory is written when the zip is closed
+            for chunk in read_written(zip_file, streamed):
+                yield chunk
+        finally:
+            # remove the files of the exports which were never added,
+            # once every export has finished
+            executor.shutdown(wait=True)
+            for future in futures:
+                if not future.exception():
+                    _, path = future.result()
+                    if os.path.exists(path):
+                        os.remove(path)
+
+
+def bundle_download_response(filename):
+    """
+    Creates a response which streams a zip of the bundle exports
+    """
+    response = StreamingHttpResponse(
+        stream_bundle([EXPORTS[export] for export in BUNDLE_EXPORTS]),
+        content_type='application/zip'
+    )
+    response['Content-Disposition'] = 'attachment; filename={}'.format(
+        filename
+    )
+    return response
@@ -0,0 +1,50 @@
+import hashlib
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+from dataGeneration.models import ReportSnapshot
+from forms.models import (ModuleDescriptionFormVersion, FormFieldEntity,
+                          FormFieldDefinition)
+
+"""
+Conditional GET support for the report downloads. The downloads are
+built from the report snapshots, the form versions, their fields and the
+field definitions, so a fingerprint of those tables changes whenever a
+download would. Only an ETag is sent. A Last-Modified from the newest
+timestamp would not move when a module and its snapshots are deleted.
+"""
+
+
+def report_fingerprint():
+    """
+    Returns a fingerprint string of the tables the reports are built
+    from, with an aggregate query per table. Definitions are never edited,
+    as a changed field gets a new definition, so their count and newest
+    id are enough.
+    """
+    snapshots = ReportSnapshot.objects.aggregate(
+        count=Count('pk'), newest=Max('last_modified')
+    )
+    versions = ModuleDescriptionFormVersion.objects.aggregate(
+        count=Count('pk'), newest=Max('creation_date')
+    )
+    fields = FormFieldEntity.objects.aggregate(
+        count=Count('pk'), newest=Max('pk')
+    )
+    definitions = FormFieldDefinition.objects.aggregate(
+        count=Count('pk'), newest=Max('pk')
+    )
+    return "{}:{}:{}:{}:{}:{}:{}:{}".format(
+        snapshots['count'], snapshots['newest'],
+        versions['count'], versions['newest'],
+        fields['count'], fields['newest'],
+        definitions['count'], definitions['newest']
+    )
+
+
+def report_etag(request, *args, **kwargs):
+    return hashlib.md5(report_fingerprint().encode('utf-8')).hexdigest()
+
+
+# answers repeat downloads with a 304 before the report is built
+report_condition = condition(etag_func=report_etag)
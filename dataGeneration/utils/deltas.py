@@ -0,0 +1,130 @@
+import base64
+import json
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from dataGeneration.models import ReportSnapshot
+
+"""
+Delta exports of the reports. A report snapshot is refreshed whenever the
+description or tracking form of its module changes, so the snapshots
+modified after a point in time are exactly the changed rows. Changes are
+read in (last_modified, pk) order and the position of the last change is
+returned as an opaque cursor to continue from.
+
+Deleted modules are not reported. Their snapshots are removed along with
+them, so there is no row left to return, and a consumer has to compare
+the full list of module codes to find them.
+"""
+
+DEFAULT_DELTA_LIMIT = 500
+
+
+class DeltaError(ValueError):
+    """
+    Raised when a since timestamp or cursor can not be read
+    """
+    pass
+
+
+def encode_cursor(last_modified, pk):
+    """
+    Encodes the position of a change as an opaque cursor
+    """
+    position = json.dumps([last_modified.isoformat(), pk])
+    return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor into the (last_modified, pk) of a change
+    """
+    try:
+        position = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        timestamp, pk = json.loads(position.decode('utf-8'))
+        last_modified = parse_datetime(timestamp)
+    except (TypeError, ValueError, UnicodeError):
+        raise DeltaError("Invalid cursor")
+    if last_modified is None or not isinstance(pk, int):
+        raise DeltaError("Invalid cursor")
+    return last_modified, pk
+
+
+def parse_since(since):
+    """
+    Parses an ISO 8601 timestamp. Naive timestamps are taken to be in
+    the current time zone.
+    """
+    try:
+        timestamp = parse_datetime(since)
+    except ValueError:
+        timestamp = None
+    if timestamp is None:
+        raise DeltaError("since must be an ISO 8601 timestamp")
+    if settings.USE_TZ and timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    return timestamp
+
+
+def report_changes(since=None, cursor=None, report=None,
+                   limit=DEFAULT_DELTA_LIMIT):
+    """
+    Returns the report snapshots changed after a timestamp or cursor.
+    With neither, every snapshot is returned.
+
+    Arguments:
+        since           Optional datetime to return changes after
+        cursor          Optional cursor returned by a previous call
+        report          Optional report to return the changes of
+        limit           Max number of changes to return
+
+    Return:
+        dict of the changes, the next cursor and if there are more.
+        The cursor is left as it was when there are no changes.
+        includes_deletions is always False, as deleted modules are not
+        reported.
+    """
+    limit = max(1, limit)
+    snapshots = ReportSnapshot.objects.all()
+    if report is not None:
+        snapshots = snapshots.filter(report=report)
+    if cursor is not None:
+        last_modified, pk = decode_cursor(cursor)
+        snapshots = snapshots.filter(
+            Q(last_modified__gt=last_modified) |
+            Q(last_modified=last_modified, pk__gt=pk)
+        )
+    elif since is not None:
+        snapshots = snapshots.filter(last_modified__gt=since)
+
+    # one extra row tells if there is another page of changes
+    changed = list(snapshots.order_by('last_modified', 'pk')[:limit + 1])
+    more = len(changed) > limit
+    changed = changed[:limit]
+
+    if changed:
+        next_cursor = encode_cursor(changed[-1].last_modified, changed[-1].pk)
+    else:
+        next_cursor = cursor
+
+    return {
+        'changes': [change_data(snapshot) for snapshot in changed],
+        'cursor': next_cursor,
+        'more': more,
+        'includes_deletions': False
+    }
+
+
+def change_data(snapshot):
+    """
+    json representation of a changed report snapshot
+    """
+    return {
+        'report': snapshot.report,
+        'module_code': snapshot.module_id,
+        'form_version': snapshot.form_version_id,
+        'last_modified': snapshot.last_modified.isoformat(),
+        'rows': snapshot.get_rows()
+    }
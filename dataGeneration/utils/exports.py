@@ -0,0 +1,110 @@
+import shutil
+from dataGeneration.models import (MODULE_SHEET_CSV, LAB_SHEET_CSV,
+                                   REPORTS_XLSX, TRACKING_SUMMARY_CSV)
+from dataGeneration.utils.lab_sheet import LAB_SHEET_HEADERS
+from dataGeneration.utils.snapshots import module_sheet_tables, lab_sheet_rows
+from dataGeneration.utils.streaming import stream_csv
+from dataGeneration.utils.tracking_summary import (TrackingSummaryBuilder,
+                                                   TRACKING_SUMMARY_HEADERS)
+from dataGeneration.utils.workbook import (report_worksheets, write_workbook,
+                                           XLSX_CONTENT_TYPE)
+
+
+def module_sheet_csv_rows():
+    """
+    Generator of the csv rows (header + rows) for each version table
+    followed by the table of modules without any fields
+    """
+    for table in module_sheet_tables():
+        yield table.headers
+        for row in table.rows:
+            yield row
+        yield ["\n"]
+
+
+def lab_sheet_csv_rows():
+    """
+    Generator of the header row followed by the lab sheet rows
+    """
+    yield LAB_SHEET_HEADERS
+    for row in lab_sheet_rows():
+        yield row
+
+
+def tracking_summary_csv_rows():
+    """
+    Generator of the header row followed by the tracking summary rows
+    """
+    yield TRACKING_SUMMARY_HEADERS
+    for row in TrackingSummaryBuilder().rows():
+        yield row
+
+
+def write_csv(rows, output):
+    """
+    Writes the rows to an open binary file as csv
+    """
+    for line in stream_csv(rows):
+        output.write(line.encode('utf-8'))
+
+
+def write_module_sheet_csv(output):
+    write_csv(module_sheet_csv_rows(), output)
+
+
+def write_lab_sheet_csv(output):
+    write_csv(lab_sheet_csv_rows(), output)
+
+
+def write_tracking_summary_csv(output):
+    write_csv(tracking_summary_csv_rows(), output)
+
+
+def write_reports_xlsx(output):
+    with write_workbook(report_worksheets()) as workbook:
+        shutil.copyfileobj(workbook, output)
+
+
+class Export(object):
+    """
+    Describes a report export that can be written to a file
+    """
+    def __init__(self, name, filename, content_type, writer):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.writer = writer
+
+    def write(self, output):
+        """
+        Writes the export to an open binary file
+        """
+        self.writer(output)
+
+
+EXPORTS = {
+    MODULE_SHEET_CSV: Export(
+        MODULE_SHEET_CSV,
+        'ModelSummarySheet.csv',
+        'text/csv',
+        write_module_sheet_csv
+    ),
+    LAB_SHEET_CSV: Export(
+        LAB_SHEET_CSV,
+        'LabOrganisationSheet.csv',
+        'text/csv',
+        write_lab_sheet_csv
+    ),
+    TRACKING_SUMMARY_CSV: Export(
+        TRACKING_SUMMARY_CSV,
+        'TrackingFormSummary.csv',
+        'text/csv',
+        write_tracking_summary_csv
+    ),
+    REPORTS_XLSX: Export(
+        REPORTS_XLSX,
+        'ModelSummarySheet.xlsx',
+        XLSX_CONTENT_TYPE,
+        write_reports_xlsx
+    ),
+}
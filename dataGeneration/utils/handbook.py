@@ -0,0 +1,149 @@
+from itertools import groupby
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+
+from core.models import Module
+from forms.models import ModuleDescriptionEntry, ModuleTeaching, ModuleAssessment
+from dataGeneration.utils.module_sheet import current_descriptions, entry_answer
+
+"""
+Module handbook. The handbook is a single html document with a section
+for each module, holding the answers of its current module description
+and the key parts of its tracking form. Modules are loaded a chunk at a
+time with a fixed number of queries per chunk, and each section is
+rendered as it is needed, so the whole handbook is never in memory.
+"""
+
+HANDBOOK_CHUNK_SIZE = 200
+
+
+class HandbookSection(object):
+    """
+    The contents of the handbook for a single module
+    """
+    def __init__(self, module, fields, teaching_hours, assessments):
+        self.module = module
+        # list of (label, answer) in form order
+        self.fields = fields
+        self.teaching_hours = teaching_hours
+        # list of (title, type, weight)
+        self.assessments = assessments
+
+
+class HandbookBuilder(object):
+    """
+    Builds the sections of the module handbook, in module code order
+    """
+
+    def __init__(self, modules=None, chunk_size=HANDBOOK_CHUNK_SIZE):
+        self.modules = Module.objects.all() if modules is None else modules
+        self.chunk_size = chunk_size
+
+    def contents(self):
+        """
+        Generator of chunks of the (code, name) of the modules
+        """
+        queryset = self.modules.order_by('module_code').values_list(
+            'module_code', 'module_name'
+        )
+        chunk = []
+        for module in queryset.iterator():
+            chunk.append(module)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def sections(self):
+        """
+        Generator of the HandbookSection of each module
+        """
+        for chunk in self.contents():
+            module_codes = [module_code for module_code, _ in chunk]
+            fields = self._fields_by_module(module_codes)
+            teaching = {
+                teaching.module_id: teaching.total_teaching_hours()
+                for teaching in ModuleTeaching.objects.filter(
+                    current_flag=True, module__in=module_codes
+                )
+            }
+            assessments = self._assessments_by_module(module_codes)
+
+            modules = Module.objects.filter(
+                module_code__in=module_codes
+            ).select_related('module_leader').order_by('module_code')
+            for module in modules:
+                yield HandbookSection(
+                    module,
+                    fields.get(module.pk, []),
+                    teaching.get(module.pk),
+                    assessments.get(module.pk, [])
+                )
+
+    def _fields_by_module(self, module_codes):
+        """
+        Returns a dict of the (label, answer) of each field of the
+        current description of the modules, in form order
+        """
+        entries = ModuleDescriptionEntry.objects.filter(
+            module_description_id__in=current_descriptions().filter(
+                module__in=module_codes
+            ).values('pk')
+        ).order_by(
+            'module_description_id__module_id', 'field_id__entity_order'
+        ).values_list(
+            'module_description_id__module_id',
+            'field_id__definition__entity_label',
+            'answer__string_entry',
+            'answer__boolean_entry',
+            'answer__integer_entry'
+        )
+        return {
+            module_code: [
+                (entry[1], entry_answer(*entry[2:])) for entry in module_entries
+            ]
+            for module_code, module_entries in groupby(
+                entries, key=lambda entry: entry[0]
+            )
+        }
+
+    def _assessments_by_module(self, module_codes):
+        """
+        Returns a dict of the (title, type, weight) of the
+        current assessments of the modules
+        """
+        assessments = {}
+        queryset = ModuleAssessment.objects.filter(
+            current_flag=True, module__in=module_codes
+        ).order_by('module_id', 'assessment_id').values_list(
+            'module_id', 'assessment_title', 'assessment_type',
+            'assessment_weight'
+        )
+        for values in queryset:
+            assessments.setdefault(values[0], []).append(values[1:])
+        return assessments
+
+
+def stream_handbook(builder):
+    """
+    Generator of the html of the handbook. The table of contents and
+    each module section are rendered as they are requested.
+    """
+    yield render_to_string('handbook/start.html')
+    for chunk in builder.contents():
+        yield render_to_string('handbook/contents.html', {'modules': chunk})
+    yield render_to_string('handbook/middle.html')
+    for section in builder.sections():
+        yield render_to_string('handbook/module.html', {'section': section})
+    yield render_to_string('handbook/end.html')
+
+
+def handbook_response(builder=None):
+    """
+    Creates a response which streams the handbook
+    """
+    return StreamingHttpResponse(
+        stream_handbook(builder or HandbookBuilder()),
+        content_type='text/html'
+    )
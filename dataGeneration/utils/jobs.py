@@ -0,0 +1,64 @@
+import os
+from django.conf import settings
+
+from dataGeneration.models import ReportJob
+from dataGeneration.utils.exports import EXPORTS
+
+
+def job_file_path(job):
+    """
+    Returns the path of the file built for a job
+    """
+    return os.path.join(settings.REPORT_JOBS_ROOT, job.filename)
+
+
+def run_job(job):
+    """
+    Builds the export of a claimed job and records the result on it.
+    The file is written under a temporary name and moved into place
+    once it is complete. The files of the older jobs of the export are
+    removed once it has finished.
+
+    Return:
+        The ReportJob that was run
+    """
+    export = EXPORTS[job.export]
+    filename = job.get_build_filename()
+    path = os.path.join(settings.REPORT_JOBS_ROOT, filename)
+    partial_path = path + '.part'
+
+    try:
+        os.makedirs(settings.REPORT_JOBS_ROOT, exist_ok=True)
+        with open(partial_path, 'wb') as output:
+            export.write(output)
+        os.replace(partial_path, path)
+    except Exception as error:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        job.fail(str(error))
+        return job
+
+    if job.finish(filename):
+        job.remove_superseded()
+    else:
+        # the job was failed as stale while it was being built
+        os.remove(path)
+    return job
+
+
+def run_queued_jobs():
+    """
+    Runs queued jobs until the queue is empty. Jobs left running by a
+    worker which stopped are failed first.
+
+    Return:
+        int of the number of jobs that were run
+    """
+    ReportJob.objects.fail_stale()
+    count = 0
+    job = ReportJob.objects.claim_next()
+    while job is not None:
+        run_job(job)
+        count += 1
+        job = ReportJob.objects.claim_next()
+    return count
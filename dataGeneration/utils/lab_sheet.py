@@ -0,0 +1,101 @@
+from core.models import Module
+from forms.models import ModuleSoftware, ModuleSupport, ModuleTeaching
+
+LAB_SHEET_HEADERS = (
+    'Module Code',
+    'Module Name',
+    'Software Required',
+    'Version of Software Rquired',
+    'Indicative Hours for Practical Workshops',
+    'Skills of the Tutor Required ',
+)
+
+NO_LAB_TUTOR = 'No Lab Tutor Required'
+
+# keys of the lab sheet rows in the json api
+LAB_SHEET_KEYS = (
+    'module_code',
+    'module_name',
+    'software_name',
+    'software_version',
+    'practical_hours',
+    'tutor_skills',
+)
+
+
+def filter_lab_modules(modules, semester=None, software_name=None):
+    """
+    Filters the modules of the lab sheet in the database.
+
+    Arguments:
+        modules         Queryset of the modules to filter
+        semester        Optional semester the modules are taught in
+        software_name   Optional part of the name of a current software
+                        item the modules require
+    """
+    if semester:
+        modules = modules.filter(semester=semester)
+    if software_name:
+        modules = modules.filter(module_code__in=ModuleSoftware.objects.filter(
+            current_flag=True, software_name__icontains=software_name
+        ).values('module_id'))
+    return modules
+
+
+class LabSheetBuilder(object):
+    """
+    Builds the lab organisation sheet. The current software, teaching
+    and support rows for all of the modules are loaded in three queries
+    and joined in memory by module code, so the number of queries does
+    not depend on the number of modules.
+
+    Each row is a tuple in the order of LAB_SHEET_HEADERS, with one
+    row for each software item that a module requires. When a software
+    name is given only the matching software items are included.
+    """
+
+    def __init__(self, modules=None, software_name=None):
+        self.modules = Module.objects.all() if modules is None else modules
+        self.software_name = software_name
+
+    def rows(self):
+        """
+        Generator of the rows of the lab sheet
+        """
+        module_codes = self.modules.values('pk')
+        software = self._software_by_module(module_codes)
+        teaching = dict(ModuleTeaching.objects.filter(
+            current_flag=True, module__in=module_codes
+        ).values_list('module_id', 'teaching_practical_workshops'))
+        support = dict(ModuleSupport.objects.filter(
+            current_flag=True, module__in=module_codes
+        ).values_list('module_id', 'lab_support_skills'))
+
+        queryset = self.modules.values_list('module_code', 'module_name')
+        for module_code, module_name in queryset.iterator():
+            hours = teaching.get(module_code, '')
+            skills = support.get(module_code) or NO_LAB_TUTOR
+
+            # modules without software still have a row on the sheet
+            for name, version in software.get(module_code, (('', ''),)):
+                yield (module_code, module_name, name, version, hours, skills)
+
+    def _software_by_module(self, module_codes):
+        """
+        Returns a dict of the (name, version) of the current
+        software for each module.
+        """
+        software = {}
+        queryset = ModuleSoftware.objects.filter(
+            current_flag=True, module__in=module_codes
+        )
+        if self.software_name:
+            queryset = queryset.filter(
+                software_name__icontains=self.software_name
+            )
+        queryset = queryset.order_by('module_id', 'software_id').values_list(
+            'module_id', 'software_name', 'software_version'
+        )
+        for module_code, name, version in queryset:
+            software.setdefault(module_code, []).append((name, version))
+        return software
@@ -0,0 +1,183 @@
+from itertools import groupby
+
+from core.models import Module
+from forms.models import (ModuleDescription, ModuleDescriptionEntry,
+                          ModuleDescriptionFormVersion, FormFieldEntity,
+                          CurrentModuleDescription)
+
+BASE_HEADERS = ['Module Code', 'Module Name']
+
+
+def current_descriptions():
+    """
+    Returns a queryset of the current ModuleDescription
+    of each module.
+    """
+    return ModuleDescription.objects.filter(
+        pk__in=CurrentModuleDescription.objects.values('description_id')
+    )
+
+
+def entry_answer(string_entry, boolean_entry, integer_entry):
+    """
+    Returns the answer stored in an entry, whichever type it is.
+    """
+    for value in (string_entry, boolean_entry, integer_entry):
+        if value is not None:
+            return value
+    return ''
+
+
+def fields_by_version(versions=None, field_ids=None):
+    """
+    Returns a dict of the (id, label) of the fields for each
+    form version, in form order.
+
+    Arguments:
+        versions        Optional queryset of the versions to include
+        field_ids       Optional list of the only fields to include
+    """
+    fields = {}
+    queryset = FormFieldEntity.objects.all()
+    if versions is not None:
+        queryset = queryset.filter(module_description_version__in=versions)
+    if field_ids is not None:
+        queryset = queryset.filter(entity_id__in=field_ids)
+    queryset = queryset.order_by(
+        'module_description_version_id', 'entity_order'
+    ).values_list('module_description_version_id', 'entity_id',
+                  'definition__entity_label')
+    for version_id, field_id, label in queryset:
+        fields.setdefault(version_id, []).append((field_id, label))
+    return fields
+
+
+class VersionCursor(object):
+    """
+    Wraps rows which are ordered by form version (the first column),
+    so that each version table can take its own rows from the same cursor.
+    """
+    def __init__(self, entries):
+        self.entries = entries
+        self.current = next(entries, None)
+
+    def take_version(self, version_id):
+        """
+        Generator of the rows for the given version
+        """
+        # skip over rows of earlier versions that were not consumed
+        while self.current is not None and self.current[0] < version_id:
+            self.current = next(self.entries, None)
+
+        while self.current is not None and self.current[0] == version_id:
+            yield self.current
+            self.current = next(self.entries, None)
+
+
+class ModuleSheetTable(object):
+    """
+    A single table of the module sheet. The rows are
+    a generator, so can only be iterated over once.
+    """
+    def __init__(self, version, headers, rows):
+        self.version = version
+        self.headers = headers
+        self.rows = rows
+
+
+class ModuleSheetPivot(object):
+    """
+    Pivots the module description entries into a table for each
+    form version, with one row per module. The entries are fetched
+    in a single query, ordered by form version, module and field order,
+    and grouped in one pass.
+
+    Tables share the same cursor, so they must be consumed in order.
+
+    Arguments:
+        modules         Optional queryset of the modules to include
+        versions        Optional queryset of the form versions to include
+        field_ids       Optional list of the only fields to include
+    """
+
+    def __init__(self, modules=None, versions=None, field_ids=None):
+        self.modules = Module.objects.all() if modules is None else modules
+        if versions is None:
+            versions = ModuleDescriptionFormVersion.objects.all()
+        self.versions = versions
+        self.field_ids = field_ids
+
+        # codes of the modules that have been put into a version table
+        self.module_codes_with_entries = set()
+
+    def tables(self, include_empty=True):
+        """
+        Generator of a ModuleSheetTable for each form version, followed by
+        a table for the modules that do not have a description.
+        """
+        fields = fields_by_version(self.versions, self.field_ids)
+        cursor = VersionCursor(self._entries())
+
+        for version in self.versions.order_by('pk'):
+            version_fields = fields.get(version.pk, [])
+            headers = BASE_HEADERS + [label for _, label in version_fields]
+            field_ids = [field_id for field_id, _ in version_fields]
+            rows = self._rows(cursor.take_version(version.pk), field_ids)
+            yield ModuleSheetTable(version, headers, rows)
+
+        if include_empty:
+            yield ModuleSheetTable(
+                None, list(BASE_HEADERS), self._empty_rows()
+            )
+
+    def _entries(self):
+        """
+        Returns an iterator over the entries of the current descriptions,
+        with the columns needed from the joined tables.
+        """
+        entries = ModuleDescriptionEntry.objects.filter(
+            module_description_id__in=current_descriptions().values('pk'),
+            module_description_id__module__in=self.modules.values('pk'),
+            module_description_id__form_version__in=self.versions
+        )
+        if self.field_ids is not None:
+            entries = entries.filter(field_id__in=self.field_ids)
+
+        return entries.order_by(
+            'module_description_id__form_version_id',
+            'module_description_id__module_id',
+            'field_id__entity_order'
+        ).values_list(
+            'module_description_id__form_version_id',
+            'module_description_id__module_id',
+            'module_description_id__module__module_name',
+            'field_id',
+            'answer__string_entry',
+            'answer__boolean_entry',
+            'answer__integer_entry'
+        ).iterator()
+
+    def _rows(self, version_entries, field_ids):
+        """
+        Generator of the rows for a single version
+        """
+        for module_code, module_entries in groupby(
+                version_entries, key=lambda entry: entry[1]):
+            answers = {}
+            module_name = ''
+            for entry in module_entries:
+                module_name = entry[2]
+                answers[entry[3]] = entry_answer(*entry[4:])
+            self.module_codes_with_entries.add(module_code)
+            yield [module_code, module_name] + [
+                answers.get(field_id, '') for field_id in field_ids
+            ]
+
+    def _empty_rows(self):
+        """
+        Generator of the rows for modules which are not in any version table
+        """
+        queryset = self.modules.values_list('module_code', 'module_name')
+        for module_code, module_name in queryset.iterator():
+            if module_code not in self.module_codes_with_entries:
+                yield [module_code, module_name]
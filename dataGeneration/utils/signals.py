@@ -0,0 +1,12 @@
+from core.models import Module
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from dataGeneration.utils.snapshots import refresh_snapshots
+
+
+@receiver(post_save, sender=Module)
+def module_snapshot_refresh(sender, instance, raw=False, **kwargs):
+    # module details are shown on every report, so keep
+    # the snapshots in step with them.
+    if not raw:
+        refresh_snapshots(instance)
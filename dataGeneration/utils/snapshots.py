@@ -0,0 +1,214 @@
+import json
+from django.db import transaction
+
+from core.models import Module
+from forms.models import ModuleDescriptionFormVersion
+from dataGeneration.models import ReportSnapshot, MODULE_SHEET, LAB_SHEET
+from dataGeneration.utils.lab_sheet import LabSheetBuilder
+from dataGeneration.utils.module_sheet import (ModuleSheetPivot,
+                                               ModuleSheetTable,
+                                               VersionCursor,
+                                               fields_by_version,
+                                               BASE_HEADERS)
+
+"""
+Materialized report snapshots. Each report keeps one ReportSnapshot per
+module holding the rows of the report for that module. The snapshots are
+refreshed for a module when its description is published or its tracking
+form changes, and the report views read the rows directly from them.
+"""
+
+
+def compute_module_sheet(modules):
+    """
+    Computes the module sheet live for the given modules.
+
+    Return:
+        dict of module code to a tuple of (form version id, rows)
+    """
+    computed = {}
+    for table in ModuleSheetPivot(modules).tables():
+        version_id = table.version.pk if table.version is not None else None
+        for row in table.rows:
+            computed[row[0]] = (version_id, [row])
+    return computed
+
+
+def compute_lab_sheet(modules):
+    """
+    Computes the lab sheet live for the given modules.
+
+    Return:
+        dict of module code to a tuple of (None, rows)
+    """
+    computed = {}
+    for row in LabSheetBuilder(modules).rows():
+        computed.setdefault(row[0], (None, []))[1].append(row)
+    return computed
+
+
+REPORT_BUILDERS = (
+    (MODULE_SHEET, compute_module_sheet),
+    (LAB_SHEET, compute_lab_sheet),
+)
+
+
+def refresh_snapshots(module):
+    """
+    Recomputes the snapshots of every report for a single module
+    """
+    refresh_module_snapshots(Module.objects.filter(pk=module.pk))
+
+
+def refresh_module_snapshots(modules):
+    """
+    Recomputes the snapshots of every report for a queryset of modules,
+    computing each report once for all of them
+    """
+    with transaction.atomic():
+        for report, compute in REPORT_BUILDERS:
+            write_snapshots(
+                report,
+                compute(modules),
+                ReportSnapshot.objects.filter(report=report, module__in=modules)
+            )
+
+
+def rebuild_snapshots():
+    """
+    Recomputes every snapshot from scratch, removing the snapshots of
+    modules which are no longer in a report.
+
+    Return:
+        int of the number of snapshots created or changed
+    """
+    modules = Module.objects.all()
+    written = 0
+    with transaction.atomic():
+        for report, compute in REPORT_BUILDERS:
+            computed = compute(modules)
+            stored = ReportSnapshot.objects.filter(report=report)
+            written += write_snapshots(report, computed, stored)
+            orphaned = [
+                pk for pk, module_code in stored.values_list('pk', 'module_id')
+                if module_code not in computed
+            ]
+            if orphaned:
+                ReportSnapshot.objects.filter(pk__in=orphaned).delete()
+    return written
+
+
+def write_snapshots(report, computed, stored):
+    """
+    Saves the computed snapshots of a report which differ from the stored
+    snapshots, so last_modified only moves for the modules whose rows or
+    form version actually changed.
+
+    Arguments:
+        report      Report the snapshots are for
+        computed    dict of module code to a tuple of (form version id, rows)
+        stored      Queryset of the stored snapshots of the modules
+
+    Return:
+        int of the number of snapshots created or changed
+    """
+    existing = {snapshot.module_id: snapshot for snapshot in stored}
+    changed = 0
+    created = []
+    for module_code, (version_id, rows) in computed.items():
+        serialized = json.dumps(rows)
+        snapshot = existing.get(module_code)
+        if snapshot is None:
+            created.append(ReportSnapshot(
+                report=report,
+                module_id=module_code,
+                form_version_id=version_id,
+                rows=serialized
+            ))
+        elif (snapshot.rows != serialized
+                or snapshot.form_version_id != version_id):
+            snapshot.rows = serialized
+            snapshot.form_version_id = version_id
+            snapshot.save(update_fields=['rows', 'form_version', 'last_modified'])
+            changed += 1
+    ReportSnapshot.objects.bulk_create(created, batch_size=500)
+    return changed + len(created)
+
+
+def check_snapshots():
+    """
+    Compares the snapshots against a live recompute of every report.
+
+    Return:
+        list of (report, module code, problem) tuples. Empty if
+        the snapshots are consistent.
+    """
+    problems = []
+    modules = Module.objects.all()
+    for report, compute in REPORT_BUILDERS:
+        stored = {
+            module_code: (version_id, json.loads(rows))
+            for module_code, version_id, rows in ReportSnapshot.objects.filter(
+                report=report
+            ).values_list('module_id', 'form_version_id', 'rows')
+        }
+
+        for module_code, (version_id, rows) in compute(modules).items():
+            # round trip through json so tuples compare equal to lists
+            expected = (version_id, json.loads(json.dumps(rows)))
+            snapshot = stored.pop(module_code, None)
+            if snapshot is None:
+                problems.append((report, module_code, 'missing'))
+            elif snapshot != expected:
+                problems.append((report, module_code, 'stale'))
+
+        for module_code in stored:
+            problems.append((report, module_code, 'orphaned'))
+    return problems
+
+
+def module_sheet_tables():
+    """
+    Generator of the module sheet tables read from the snapshots. Has
+    the same tables as ModuleSheetPivot.tables()
+    """
+    fields = fields_by_version()
+    cursor = VersionCursor(ReportSnapshot.objects.filter(
+        report=MODULE_SHEET,
+        form_version__isnull=False
+    ).order_by('form_version_id', 'module_id').values_list(
+        'form_version_id', 'rows'
+    ).iterator())
+
+    for version in ModuleDescriptionFormVersion.objects.order_by('pk'):
+        headers = BASE_HEADERS + [
+            label for _, label in fields.get(version.pk, [])
+        ]
+        rows = _snapshot_rows(cursor.take_version(version.pk))
+        yield ModuleSheetTable(version, headers, rows)
+
+    empty = ReportSnapshot.objects.for_report(MODULE_SHEET).filter(
+        form_version__isnull=True
+    ).values_list('form_version_id', 'rows').iterator()
+    yield ModuleSheetTable(None, list(BASE_HEADERS), _snapshot_rows(empty))
+
+
+def lab_sheet_rows():
+    """
+    Generator of the lab sheet rows read from the snapshots. Has
+    the same rows as LabSheetBuilder.rows()
+    """
+    snapshots = ReportSnapshot.objects.for_report(LAB_SHEET).values_list(
+        'form_version_id', 'rows'
+    ).iterator()
+    for row in _snapshot_rows(snapshots):
+        yield tuple(row)
+
+
+def _snapshot_rows(snapshots):
+    """
+    Generator of the rows stored in (form version id, rows) snapshots
+    """
+    for _, rows in snapshots:
+        for row in json.loads(rows):
+            yield row
@@ -0,0 +1,84 @@
+import csv
+import json
+from django.http import StreamingHttpResponse
+
+
+class Echo(object):
+    """
+    Pseudo-buffer which returns whatever is written to it. This
+    allows the csv writer to format a row without needing a file.
+    """
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """
+    Generator which formats each row as a line of csv as it
+    is requested, so only a single row is held in memory.
+
+    Arguments:
+        rows        Iterable of lists to write out
+
+    Return:
+        Generator of csv formatted strings
+    """
+    writer = csv.writer(Echo(), quoting=csv.QUOTE_ALL)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_download_response(rows, filename):
+    """
+    Creates a streaming response that downloads the rows as a
+    csv file. Bytes are sent to the client as the rows are generated.
+
+    Arguments:
+        rows        Iterable of lists to write out
+        filename    Name of the file the client will save
+
+    Return:
+        StreamingHttpResponse
+    """
+    response = StreamingHttpResponse(
+        stream_csv(rows),
+        content_type='text/csv'
+    )
+    response['Content-Disposition'] = 'attachment; filename={}'.format(
+        filename
+    )
+    return response
+
+
+def stream_json(items):
+    """
+    Generator which formats the items as a json list one item at a
+    time, so only a single item is held in memory.
+
+    Arguments:
+        items       Iterable of json serializable objects
+
+    Return:
+        Generator of json formatted strings
+    """
+    yield '['
+    for index, item in enumerate(items):
+        yield (',' if index else '') + json.dumps(item)
+    yield ']'
+
+
+def json_stream_response(items):
+    """
+    Creates a streaming response of the items as a json list
+
+    Arguments:
+        items       Iterable of json serializable objects
+
+    Return:
+        StreamingHttpResponse
+    """
+    return StreamingHttpResponse(
+        stream_json(items),
+        content_type='application/json'
+    )
+
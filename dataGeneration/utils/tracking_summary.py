@@ -0,0 +1,141 @@
+from core.models import Module
+from forms.models import (ModuleTeaching, ModuleAssessment,
+                          ModuleReassessment, ModuleChangeSummary)
+
+MODULE_COLUMNS = (
+    ('module_code', 'Module Code'),
+    ('module_name', 'Module Name'),
+    ('module_level', 'Module Level'),
+    ('semester', 'Semester'),
+)
+
+TEACHING_COLUMNS = (
+    ('teaching_lectures', 'Lectures'),
+    ('teaching_tutorials', 'Seminars and Tutorials'),
+    ('teaching_online', 'Online Activities'),
+    ('teaching_practical_workshops', 'Practical Classes and Workshops'),
+    ('teaching_supervised_time', 'Supervised Time'),
+    ('teaching_fieldworks', 'Fieldwork'),
+    ('teaching_external_visits', 'External Visits'),
+    ('teaching_schedule_assessment', 'Scheduled Examination/Assessment'),
+    ('teaching_placement', 'Placement'),
+)
+
+ASSESSMENT_COLUMNS = (
+    ('assessment_title', 'Assessment Title'),
+    ('assessment_type', 'Assessment Type'),
+    ('assessment_weight', 'Assessment Weighting'),
+    ('assessment_duration', 'Assessment Duration (hours)'),
+    ('assessment_hand_out', 'Hand Out Week'),
+    ('assessment_hand_in', 'Hand In Week'),
+    ('assessment_semester', 'Assessment Semester'),
+    ('learning_outcomes_covered', 'Learning Outcomes Covered'),
+)
+
+REASSESSMENT_COLUMNS = (
+    ('reassessment_requested', 'Reassessment Change Requested'),
+    ('reassessment_new_method', 'New Reassessment Method'),
+    ('reassessment_rationale', 'Reassessment Rationale'),
+)
+
+CHANGE_SUMMARY_COLUMNS = (
+    ('changes_to_outcomes', 'Changes to Learning Outcomes'),
+    ('changes_to_outcomes_desc', 'Learning Outcome Changes'),
+    ('changes_to_teaching', 'Changes to Teaching'),
+    ('changes_to_teaching_desc', 'Teaching Changes'),
+    ('changes_to_assessments', 'Changes to Assessments'),
+    ('changes_to_assessments_desc', 'Assessment Changes'),
+    ('changes_other', 'Other Changes'),
+    ('changes_other_desc', 'Description of Other Changes'),
+    ('changes_rationale', 'Rationale for Changes'),
+)
+
+TRACKING_SUMMARY_COLUMNS = (
+    MODULE_COLUMNS +
+    TEACHING_COLUMNS +
+    ASSESSMENT_COLUMNS +
+    REASSESSMENT_COLUMNS +
+    CHANGE_SUMMARY_COLUMNS
+)
+
+TRACKING_SUMMARY_KEYS = tuple(key for key, _ in TRACKING_SUMMARY_COLUMNS)
+TRACKING_SUMMARY_HEADERS = tuple(
+    header for _, header in TRACKING_SUMMARY_COLUMNS
+)
+
+
+class TrackingSummaryBuilder(object):
+    """
+    Builds the summary of the current tracking forms of the modules.
+    Each tracking section is loaded for all of the modules in a single
+    query and joined in memory by module code, so the number of queries
+    does not depend on the number of modules.
+
+    Each row is a tuple in the order of TRACKING_SUMMARY_COLUMNS, with
+    one row for each current assessment of a module. Modules without an
+    assessment still have a row, and sections without a current row
+    are left blank.
+    """
+
+    def __init__(self, modules=None):
+        self.modules = Module.objects.all() if modules is None else modules
+
+    def rows(self):
+        """
+        Generator of the rows of the tracking summary
+        """
+        module_codes = self.modules.values('pk')
+        teaching = self._current_by_module(
+            ModuleTeaching, TEACHING_COLUMNS, module_codes
+        )
+        reassessment = self._current_by_module(
+            ModuleReassessment, REASSESSMENT_COLUMNS, module_codes
+        )
+        change_summary = self._current_by_module(
+            ModuleChangeSummary, CHANGE_SUMMARY_COLUMNS, module_codes
+        )
+        assessments = self._assessments_by_module(module_codes)
+
+        no_teaching = ('',) * len(TEACHING_COLUMNS)
+        no_assessment = (('',) * len(ASSESSMENT_COLUMNS),)
+        no_reassessment = ('',) * len(REASSESSMENT_COLUMNS)
+        no_change_summary = ('',) * len(CHANGE_SUMMARY_COLUMNS)
+
+        queryset = self.modules.order_by('module_code').values_list(
+            *[key for key, _ in MODULE_COLUMNS]
+        )
+        for module in queryset.iterator():
+            module_code = module[0]
+            for assessment in assessments.get(module_code, no_assessment):
+                yield (
+                    module +
+                    teaching.get(module_code, no_teaching) +
+                    assessment +
+                    reassessment.get(module_code, no_reassessment) +
+                    change_summary.get(module_code, no_change_summary)
+                )
+
+    def _current_by_module(self, model, columns, module_codes):
+        """
+        Returns a dict of the values of the current row of a
+        single row tracking section for each module
+        """
+        queryset = model.objects.filter(
+            current_flag=True, module__in=module_codes
+        ).values_list('module_id', *[key for key, _ in columns])
+        return {values[0]: values[1:] for values in queryset}
+
+    def _assessments_by_module(self, module_codes):
+        """
+        Returns a dict of the values of the current
+        assessments for each module
+        """
+        assessments = {}
+        queryset = ModuleAssessment.objects.filter(
+            current_flag=True, module__in=module_codes
+        ).order_by('module_id', 'assessment_id').values_list(
+            'module_id', *[key for key, _ in ASSESSMENT_COLUMNS]
+        )
+        for values in queryset:
+            assessments.setdefault(values[0], []).append(values[1:])
+        return assessments
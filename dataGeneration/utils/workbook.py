@@ -0,0 +1,87 @@
+import tempfile
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from dataGeneration.utils.lab_sheet import LAB_SHEET_HEADERS
+from dataGeneration.utils.snapshots import module_sheet_tables, lab_sheet_rows
+
+XLSX_CONTENT_TYPE = (
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+)
+
+
+def report_worksheets():
+    """
+    Generator of the (title, rows) of each worksheet in the reports
+    workbook. There is a worksheet for each form version of the module
+    sheet, the modules without a description and the lab sheet. The rows
+    come from the same generators as the csv downloads.
+    """
+    for table in module_sheet_tables():
+        if table.version is None:
+            title = "No Description"
+        else:
+            title = "Version {} - {:%Y-%m-%d}".format(
+                table.version.pk, table.version.creation_date
+            )
+        yield title, _with_headers(table.headers, table.rows)
+
+    yield "Lab Organisation", _with_headers(LAB_SHEET_HEADERS, lab_sheet_rows())
+
+
+def write_workbook(worksheets):
+    """
+    Writes the worksheets to a temporary xlsx file. The workbook is
+    write-only, so each row is written out as it is appended and
+    memory does not grow with the number of rows.
+
+    Arguments:
+        worksheets      Iterable of (title, rows) tuples
+
+    Return:
+        Temporary file containing the workbook, at the start of the file
+    """
+    workbook = Workbook(write_only=True)
+    for title, rows in worksheets:
+        worksheet = workbook.create_sheet(title=title)
+        for row in rows:
+            worksheet.append([_clean(value) for value in row])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def xlsx_download_response(worksheets, filename):
+    """
+    Creates a response which downloads the worksheets as an xlsx file.
+    The file is streamed to the client in chunks.
+    """
+    response = FileResponse(
+        write_workbook(worksheets),
+        content_type=XLSX_CONTENT_TYPE
+    )
+    response['Content-Disposition'] = 'attachment; filename={}'.format(
+        filename
+    )
+    return response
+
+
+def _with_headers(headers, rows):
+    """
+    Generator of the header row followed by the rows
+    """
+    yield headers
+    for row in rows:
+        yield row
+
+
+def _clean(value):
+    """
+    Removes characters which are not allowed in a worksheet cell
+    """
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub('', value)
+    return value
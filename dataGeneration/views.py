@@ -1,76 +1,28 @@
+from django.http import JsonResponse
 from django.shortcuts import render
-from forms.models import ModuleAssessment,ModuleSoftware,ModuleSupport, ModuleTeaching,ModuleDescription
-from core.models import *
+from django.utils.decorators import method_decorator
 from django.views import View
-from timeline.models import  *
-from django.http import HttpResponse
-import random
-import csv
+from django.views.decorators.gzip import gzip_page
+from core.models import Module
+from dataGeneration.utils.lab_sheet import (LAB_SHEET_HEADERS, LAB_SHEET_KEYS,
+                                           LabSheetBuilder, filter_lab_modules)
+from dataGeneration.utils.snapshots import lab_sheet_rows
+from dataGeneration.utils.conditional import report_condition
+from dataGeneration.utils.exports import lab_sheet_csv_rows
+from dataGeneration.utils.streaming import csv_download_response
 #Create your views here.
 
 
 
+@method_decorator([gzip_page, report_condition], name='get')
 class labSheetDownload(View):
     '''
     this will be calleed for downloading the csv data
+    the rows are read from the report snapshots and streamed to the client
+    repeat downloads get a 304 while the snapshots are unchanged
     '''
     def get(self, request, *args, **kwargs):
-
-        software_list = ModuleSoftware.objects.all()
-        indicative = ModuleTeaching.objects.all()
-        modules = Module.objects.all()
-        support_list = ModuleSupport.objects.all()
-        _modules = []
-
-        # Define the header row for the csv file
-        rows = [[
-          	'Module Code',
-        	'Module Name',
-            'Software Required',
-            'Version of Software Rquired',
-            'Indicative Hours for Practical Workshops',
-            'Skills of the Tutor Required '
-        ]]
-        for module in modules:
-            try:
-                software = software_list.get(module=module.module_code)
-                teaching = indicative.get(module=module.module_code)
-                support = support_list.get(module=module.module_code)
-            except:
-                software = None
-                teaching = None
-                support = None
-
-            # append the rows for the csv file
-            rows.append([
-                module.module_code,
-                module.module_name,
-                software.software_name if software != None else '',
-                software.software_version if software != None else '',
-                teaching.teaching_practical_workshops if teaching != None else '',
-                support.lab_support_skills if (support != None and support.lab_support_skills != '') else 'No Lab Tutor Required',
-            ])
-
-        # Write the table data to a temporary csv file
-        # define the file name
-        filename = "/tmp/labsheet_{}.csv".format(random.randint(1, 100000))
-
-        # Open the file for writing and use csv module for writing
-        with open(filename, 'w') as myfile:
-            # Initialize the csv writer
-            wr = csv.writer(myfile, quoting=csv.QUOTE_ALL)
-            # write the data (header + rows) using the csv writer
-            wr.writerows(rows)
-            print(rows)
-
-        # Read the csv file, and send the file as an HTTP response back to the client,
-        # which gets downloaded on the user's machine
-        with open(filename, 'r') as myfile:
-            # Create an HTTPResponse with attachment
-            response = HttpResponse(myfile, content_type='text/csv')
-            # Set the reponse headers (this triggers the download on client side)
-            response['Content-Disposition'] = 'attachment; filename=LabOrganisationSheet.csv'
-            return response
+        return csv_download_response(lab_sheet_csv_rows(), 'LabOrganisationSheet.csv')
 
 
 
@@ -78,33 +30,55 @@ class labSheetDownload(View):
 class labSheetView(View):
     '''
         gets the list of elements in the table.
-        each module is iterated over and then checked for module code in software, teaching and support
+        the rows are read from the report snapshots
     '''
     def get(self, request, *args, **kwargs):
-        software_list = ModuleSoftware.objects.all()
-        indicative = ModuleTeaching.objects.all()
-        modules = Module.objects.all()
-        support_list = ModuleSupport.objects.all()
-        _modules = []
+        rows = list(lab_sheet_rows())
+        return render(request,'lab_sheet.html', {
+            'headers': LAB_SHEET_HEADERS,
+            'modules': rows
+        })
 
-        for module in modules:
-            #error handling, so If an error is encountered, a try block code execution is stopped and transferred down to the except block.
-            try:
-                software = software_list.get(module=module.module_code)
-                teaching = indicative.get(module=module.module_code)
-                support = support_list.get(module=module.module_code)
-            except:
-                software = None
-                teaching = None
-                support = None
-            _modules.append({
-                'module_code': module.module_code,
-                'module_name': module.module_name,
-                'software_name': software.software_name if software != None else '',
-                'software_version': software.software_version if software != None else '',
-                'indicative_hours': teaching.teaching_practical_workshops if teaching != None else '',
-                'skills': support.lab_support_skills if (support != None and support.lab_support_skills != '') else 'No Lab Tutor Required',
-            })
 
 
-        return render(request,'lab_sheet.html', { 'modules': _modules })
+
+class labSheetApi(View):
+    '''
+        returns the lab sheet rows as json, one page of modules at a time.
+        pages are keyed by module code, ?after= takes the next_after of the
+        last page. ?semester= and ?software= filter the modules in the database
+    '''
+    default_limit = 50
+    max_limit = 200
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.GET.get('limit', self.default_limit))
+        except ValueError:
+            return JsonResponse({'error': 'limit must be a number'}, status=400)
+        limit = max(1, min(limit, self.max_limit))
+        software_name = request.GET.get('software', '')
+
+        modules = filter_lab_modules(
+            Module.objects.all(),
+            semester=request.GET.get('semester', ''),
+            software_name=software_name
+        )
+        after = request.GET.get('after', '')
+        if after:
+            modules = modules.filter(module_code__gt=after)
+
+        # one extra module tells if there is another page
+        module_codes = list(modules.order_by('module_code').values_list(
+            'module_code', flat=True
+        )[:limit + 1])
+        next_after = module_codes[limit - 1] if len(module_codes) > limit else None
+
+        page = Module.objects.filter(
+            module_code__in=module_codes[:limit]
+        ).order_by('module_code')
+        rows = LabSheetBuilder(page, software_name=software_name).rows()
+        return JsonResponse({
+            'results': [dict(zip(LAB_SHEET_KEYS, row)) for row in rows],
+            'next_after': next_after
+        })
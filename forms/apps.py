@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class FormsConfig(AppConfig):
     name = 'forms'
+
+    def ready(self):
+        import forms.utils.signals
@@ -1,5 +1,5 @@
 from django import forms
-from forms.models.module_description import FormFieldEntity, ModuleDescriptionFormVersion
+from forms.utils.form_schema import get_form_schema, get_most_recent_version_id
 
 class ModuleDescriptionForm(forms.Form):
     """
@@ -11,51 +11,51 @@ class ModuleDescriptionForm(forms.Form):
         in the initialization of the form.
         """
         # Retrieve the form version from the kwargs, then collect all of the fields
-        # we need to create. If there is no version, get the most recent one
+        # we need to create. If there is no version, get the most recent one.
+        # The compiled fields of each version are cached, see forms.utils.form_schema
         if 'md_version' in kwargs:
             self.md_version = kwargs.pop('md_version')
-            self.form_entities = FormFieldEntity.objects.get_form_dict(self.md_version)
         else:
-            self.md_version = ModuleDescriptionFormVersion.objects.get_most_recent().module_description_version
-            self.form_entities = FormFieldEntity.objects.get_most_recent_form()
+            self.md_version = get_most_recent_version_id()
+        self.form_entities = get_form_schema(self.md_version)
         super(ModuleDescriptionForm, self).__init__(*args, **kwargs)
 
         # Loop through all of the entities and determine what widget to render
         # depending on its type
         for e in self.form_entities:
-            entity_type = e.get('entity_type')
+            entity_type = e.entity_type
             if entity_type == "text-input":
-                self.fields['field_entity_%s' % e.get('entity_id')] = forms.CharField(
+                self.fields['field_entity_%s' % e.entity_id] = forms.CharField(
                     widget=forms.TextInput(attrs={'class':'form-control form-control-sm'}),
-                    label=e.get('entity_label'),
-                    max_length=e.get('entity_max_length'),
-                    required=e.get('entity_required')
+                    label=e.entity_label,
+                    max_length=e.entity_max_length,
+                    required=e.entity_required
                 )
             elif entity_type == "text-area":
-                self.fields['field_entity_%s' % e.get('entity_id')] = forms.CharField(
+                self.fields['field_entity_%s' % e.entity_id] = forms.CharField(
                     widget=forms.Textarea(attrs={'rows':'6', 'class':'form-control form-control-sm'}),
-                    label=e.get('entity_label'),
-                    max_length=e.get('entity_max_length'),
-                    required=e.get('entity_required')
+                    label=e.entity_label,
+                    max_length=e.entity_max_length,
+                    required=e.entity_required
                 )
             elif entity_type == "multi-choice":
-                self.fields['field_entity_%s' % e.get('entity_id')] = forms.ChoiceField(
+                self.fields['field_entity_%s' % e.entity_id] = forms.ChoiceField(
                     widget=forms.Select(attrs={'class':'form-control form-control-sm'}),
-                    choices=[(choice.strip(),choice.strip()) for choice in e.get('entity_choices').split(',')],
-                    label=e.get('entity_label'),
-                    required=e.get('entity_required')
+                    choices=e.choices,
+                    label=e.entity_label,
+                    required=e.entity_required
                 )
             elif entity_type == "radio-buttons":
-                self.fields['field_entity_%s' % e.get('entity_id')] = forms.ChoiceField(
+                self.fields['field_entity_%s' % e.entity_id] = forms.ChoiceField(
                     widget=forms.RadioSelect(),
-                    choices=[(choice.strip(),choice.strip()) for choice in e.get('entity_choices').split(',')],
-                    label=e.get('entity_label'),
-                    required=e.get('entity_required')
+                    choices=e.choices,
+                    label=e.entity_label,
+                    required=e.entity_required
                 )
             elif entity_type == "check-box":
-                self.fields['field_entity_%s' % e.get('entity_id')] = forms.BooleanField(
+                self.fields['field_entity_%s' % e.entity_id] = forms.BooleanField(
                     widget=forms.CheckboxInput,
-                    label=e.get('entity_label'),
+                    label=e.entity_label,
                     required=False
                 )
 
@@ -1,13 +1,16 @@
 from django import forms
-from forms.models.module_description import FormFieldEntity
+from forms.models.module_description import FormFieldDefinition
 
 class FieldEntityForm(forms.ModelForm):
     """
-    Form used to describe a single entity in the module description form structure
+    Form used to describe a single entity in the module description form structure.
+    The form edits the definition of the field, along with its order in the form.
     """
+    entity_order = forms.IntegerField(min_value=0)
+
     class Meta:
-        model = FormFieldEntity
-        exclude = ('entity_id','module_description_version','entity_default')
+        model = FormFieldDefinition
+        exclude = ('definition_hash','entity_default')
 
     def clean(self):
         data = super().clean()
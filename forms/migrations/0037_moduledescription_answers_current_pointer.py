@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.7 on 2026-10-18 10:49
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_remove_module_seen_by_before'),
+        ('forms', '0036_auto_20180423_1435'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrentModuleDescription',
+            fields=[
+                ('module', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='current_description', serialize=False, to='core.Module')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='moduledescription',
+            name='answers',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='currentmoduledescription',
+            name='description',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='current_for', to='forms.ModuleDescription'),
+        ),
+    ]
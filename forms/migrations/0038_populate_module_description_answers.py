@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+from django.db import migrations
+
+
+def entry_value(entity_type, string_entry, boolean_entry, integer_entry):
+    if entity_type == "check-box":
+        return boolean_entry
+    elif entity_type in ("text-input", "text-area", "multi-choice", "radio-buttons"):
+        return string_entry
+    return integer_entry
+
+
+def populate_answers(apps, schema_editor):
+    """
+    Writes the answers snapshot of the existing descriptions and
+    points each module at its most recent description
+    """
+    ModuleDescription = apps.get_model('forms', 'ModuleDescription')
+    ModuleDescriptionEntry = apps.get_model('forms', 'ModuleDescriptionEntry')
+    CurrentModuleDescription = apps.get_model('forms', 'CurrentModuleDescription')
+
+    for description in ModuleDescription.objects.iterator():
+        entries = ModuleDescriptionEntry.objects.filter(
+            module_description_id=description.pk
+        ).order_by('field_id__entity_order').values_list(
+            'field_id', 'field_id__entity_label', 'field_id__entity_type',
+            'string_entry', 'boolean_entry', 'integer_entry'
+        )
+        description.answers = json.dumps([
+            [field_id, label, entity_type, entry_value(entity_type, *values)]
+            for field_id, label, entity_type, *values in entries
+        ])
+        description.save(update_fields=['answers'])
+
+    current = {}
+    for pk, module_id in ModuleDescription.objects.order_by(
+            'created', 'pk').values_list('pk', 'module_id'):
+        current[module_id] = pk
+    CurrentModuleDescription.objects.bulk_create([
+        CurrentModuleDescription(module_id=module_id, description_id=pk)
+        for module_id, pk in current.items()
+    ])
+
+
+def remove_pointers(apps, schema_editor):
+    CurrentModuleDescription = apps.get_model('forms', 'CurrentModuleDescription')
+    CurrentModuleDescription.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0037_moduledescription_answers_current_pointer'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_answers, remove_pointers),
+    ]
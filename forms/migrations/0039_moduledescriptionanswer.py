@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.7 on 2026-10-18 11:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0038_populate_module_description_answers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModuleDescriptionAnswer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value_hash', models.CharField(max_length=40, unique=True)),
+                ('boolean_entry', models.NullBooleanField()),
+                ('string_entry', models.CharField(max_length=2000, null=True)),
+                ('integer_entry', models.IntegerField(null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='moduledescriptionentry',
+            name='answer',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, to='forms.ModuleDescriptionAnswer'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import hashlib
+import json
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def answer_hash(entry_fields):
+    return hashlib.sha1(
+        json.dumps(entry_fields, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+def entry_fields(string_entry, boolean_entry, integer_entry):
+    if string_entry is not None:
+        return {'string_entry': string_entry}
+    elif boolean_entry is not None:
+        return {'boolean_entry': boolean_entry}
+    return {'integer_entry': integer_entry}
+
+
+def deduplicate_answers(apps, schema_editor):
+    """
+    Moves the value of every existing entry into a shared answer row,
+    so entries with the same value point at the same row
+    """
+    ModuleDescriptionEntry = apps.get_model('forms', 'ModuleDescriptionEntry')
+    ModuleDescriptionAnswer = apps.get_model('forms', 'ModuleDescriptionAnswer')
+
+    entries_by_hash = {}
+    values = {}
+    for pk, *value in ModuleDescriptionEntry.objects.values_list(
+            'pk', 'string_entry', 'boolean_entry', 'integer_entry').iterator():
+        fields = entry_fields(*value)
+        value_hash = answer_hash(fields)
+        values[value_hash] = fields
+        entries_by_hash.setdefault(value_hash, []).append(pk)
+
+    ModuleDescriptionAnswer.objects.bulk_create([
+        ModuleDescriptionAnswer(value_hash=value_hash, **fields)
+        for value_hash, fields in values.items()
+    ], batch_size=BATCH_SIZE)
+
+    for value_hash, answer_id in ModuleDescriptionAnswer.objects.values_list(
+            'value_hash', 'pk').iterator():
+        entry_ids = entries_by_hash[value_hash]
+        for start in range(0, len(entry_ids), BATCH_SIZE):
+            ModuleDescriptionEntry.objects.filter(
+                pk__in=entry_ids[start:start + BATCH_SIZE]
+            ).update(answer_id=answer_id)
+
+
+def restore_values(apps, schema_editor):
+    ModuleDescriptionAnswer = apps.get_model('forms', 'ModuleDescriptionAnswer')
+    ModuleDescriptionEntry = apps.get_model('forms', 'ModuleDescriptionEntry')
+    for answer in ModuleDescriptionAnswer.objects.iterator():
+        ModuleDescriptionEntry.objects.filter(answer_id=answer.pk).update(
+            string_entry=answer.string_entry,
+            boolean_entry=answer.boolean_entry,
+            integer_entry=answer.integer_entry
+        )
+    ModuleDescriptionEntry.objects.update(answer=None)
+    ModuleDescriptionAnswer.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0039_moduledescriptionanswer'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_answers, restore_values),
+    ]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.7 on 2026-10-18 11:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0040_deduplicate_module_description_answers'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='moduledescriptionentry',
+            name='boolean_entry',
+        ),
+        migrations.RemoveField(
+            model_name='moduledescriptionentry',
+            name='integer_entry',
+        ),
+        migrations.RemoveField(
+            model_name='moduledescriptionentry',
+            name='string_entry',
+        ),
+        migrations.AlterField(
+            model_name='moduledescriptionentry',
+            name='answer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='forms.ModuleDescriptionAnswer'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.7 on 2026-10-18 11:31
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0041_remove_moduledescriptionentry_values'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormFieldDefinition',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('definition_hash', models.CharField(max_length=40, unique=True)),
+                ('entity_label', models.CharField(max_length=100, verbose_name='Title/Label')),
+                ('entity_required', models.BooleanField(default=True)),
+                ('entity_type', models.CharField(choices=[('text-input', 'Text Input'), ('text-area', 'Text Area'), ('multi-choice', 'Select Box'), ('radio-buttons', 'Radio Buttons'), ('check-box', 'Check Box')], max_length=13, verbose_name='Field Type')),
+                ('entity_choices', models.CharField(blank=True, max_length=100, verbose_name='Choices')),
+                ('entity_default', models.CharField(blank=True, max_length=100, verbose_name='Default')),
+                ('entity_description', models.CharField(blank=True, max_length=1000, verbose_name='Description')),
+                ('entity_placeholder', models.CharField(blank=True, max_length=100, verbose_name='Placeholder')),
+                ('entity_max_length', models.PositiveSmallIntegerField(default=500, verbose_name='Max Length')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='formfieldentity',
+            name='definition',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, to='forms.FormFieldDefinition'),
+        ),
+    ]
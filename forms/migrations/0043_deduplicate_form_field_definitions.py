@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import hashlib
+import json
+from django.db import migrations
+
+DEFINITION_FIELDS = (
+    'entity_label',
+    'entity_required',
+    'entity_type',
+    'entity_choices',
+    'entity_default',
+    'entity_description',
+    'entity_placeholder',
+    'entity_max_length',
+)
+
+
+def definition_hash(content):
+    return hashlib.sha1(
+        json.dumps(content, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+def deduplicate_definitions(apps, schema_editor):
+    """
+    Moves the content of every existing field into a shared definition,
+    so fields with the same content point at the same definition
+    """
+    FormFieldEntity = apps.get_model('forms', 'FormFieldEntity')
+    FormFieldDefinition = apps.get_model('forms', 'FormFieldDefinition')
+
+    fields_by_hash = {}
+    contents = {}
+    for values in FormFieldEntity.objects.values('entity_id', *DEFINITION_FIELDS):
+        content = {name: values[name] for name in DEFINITION_FIELDS}
+        content_hash = definition_hash(content)
+        contents[content_hash] = content
+        fields_by_hash.setdefault(content_hash, []).append(values['entity_id'])
+
+    FormFieldDefinition.objects.bulk_create([
+        FormFieldDefinition(definition_hash=content_hash, **content)
+        for content_hash, content in contents.items()
+    ])
+    for content_hash, definition_id in FormFieldDefinition.objects.values_list(
+            'definition_hash', 'pk'):
+        FormFieldEntity.objects.filter(
+            entity_id__in=fields_by_hash[content_hash]
+        ).update(definition_id=definition_id)
+
+
+def restore_fields(apps, schema_editor):
+    FormFieldEntity = apps.get_model('forms', 'FormFieldEntity')
+    FormFieldDefinition = apps.get_model('forms', 'FormFieldDefinition')
+    for definition in FormFieldDefinition.objects.iterator():
+        FormFieldEntity.objects.filter(definition_id=definition.pk).update(**{
+            name: getattr(definition, name) for name in DEFINITION_FIELDS
+        })
+    FormFieldEntity.objects.update(definition=None)
+    FormFieldDefinition.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0042_formfielddefinition'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_definitions, restore_fields),
+    ]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.7 on 2026-10-18 11:31
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0043_deduplicate_form_field_definitions'),
+    ]
+
+    operations = [
+        # defaults let the columns be added back when the migration is reversed
+        migrations.AlterField(
+            model_name='formfieldentity',
+            name='entity_label',
+            field=models.CharField(default='', max_length=100, verbose_name='Title/Label'),
+        ),
+        migrations.AlterField(
+            model_name='formfieldentity',
+            name='entity_type',
+            field=models.CharField(choices=[('text-input', 'Text Input'), ('text-area', 'Text Area'), ('multi-choice', 'Select Box'), ('radio-buttons', 'Radio Buttons'), ('check-box', 'Check Box')], default='', max_length=13, verbose_name='Field Type'),
+        ),
+        migrations.RemoveField(
+            model_name='formfieldentity',
+            name='entity_choices',
+        ),
+        migrations.RemoveField(
+            model_name='formfieldentity',
+            name='entity_default',
+        ),
+        migrations.RemoveField(
+            model_name='formfieldentity',
+            name='entity_description',
+        ),
+        migrations.RemoveField(
+            model_name='formfieldentity',
+            name='entity_label',
+        ),
+        migrations.RemoveField(
+            model_name='formfieldentity',
+            name='entity_max_length',
+        ),
+        migrations.RemoveField(
+            model_name='formfieldentity',
+            name='entity_placeholder',
+        ),
+        migrations.RemoveField(
+            model_name='formfieldentity',
+            name='entity_required',
+        ),
+        migrations.RemoveField(
+            model_name='formfieldentity',
+            name='entity_type',
+        ),
+        migrations.AlterField(
+            model_name='formfieldentity',
+            name='definition',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='forms.FormFieldDefinition'),
+        ),
+    ]
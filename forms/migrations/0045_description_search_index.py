@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+from django.db import migrations
+
+SEARCH_TABLE = 'forms_descriptionsearch'
+
+
+def create_index(apps, schema_editor):
+    """
+    Creates the FTS5 index of the current module description answers
+    and fills it from the answers snapshots. Only SQLite has FTS5, so
+    other databases are left without an index.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE {} USING fts5("
+        "answer, label, module_code UNINDEXED, description_id UNINDEXED, "
+        "field_id UNINDEXED, tokenize='porter unicode61')".format(SEARCH_TABLE)
+    )
+
+    CurrentModuleDescription = apps.get_model('forms', 'CurrentModuleDescription')
+    rows = []
+    for current in CurrentModuleDescription.objects.select_related('description'):
+        description = current.description
+        if not description.answers:
+            continue
+        for field_id, label, entity_type, value in json.loads(description.answers):
+            if isinstance(value, str) and value.strip():
+                rows.append((value, label, description.module_id,
+                             description.pk, field_id))
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO {} (answer, label, module_code, description_id, field_id) "
+            "VALUES (%s, %s, %s, %s, %s)".format(SEARCH_TABLE),
+            rows
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS {}".format(SEARCH_TABLE))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0044_remove_formfieldentity_definition_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+SEARCH_TABLE = 'forms_descriptionsearch'
+SEARCH_MODULES_TABLE = 'forms_descriptionsearch_module'
+
+
+def create_modules_table(apps, schema_editor):
+    """
+    Creates the table of the module of each indexed answer, keyed by the
+    rowid of the answer in the FTS5 index. module_code is not indexed in
+    FTS5, so a module's answers are found through this table instead.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE TABLE {} (rowid INTEGER PRIMARY KEY, "
+        "module_code VARCHAR(10) NOT NULL)".format(SEARCH_MODULES_TABLE)
+    )
+    schema_editor.execute(
+        "CREATE INDEX {0}_module_code ON {0} (module_code)".format(
+            SEARCH_MODULES_TABLE
+        )
+    )
+    schema_editor.execute(
+        "INSERT INTO {} (rowid, module_code) SELECT rowid, module_code "
+        "FROM {}".format(SEARCH_MODULES_TABLE, SEARCH_TABLE)
+    )
+
+
+def drop_modules_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS {}".format(SEARCH_MODULES_TABLE))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0046_create_cache_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_modules_table, drop_modules_table),
+    ]
@@ -1,4 +1,5 @@
 from .module_description_form_version import *
+from .form_field_definition import *
 from .form_field_entity import *
 from .module_description import *
-from .module_description_entry import *
\ No newline at end of file
+from .module_description_entry import *
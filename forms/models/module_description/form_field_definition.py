@@ -0,0 +1,106 @@
+import hashlib
+import json
+from django.db import models
+
+# the fields which make up the content of a field definition
+DEFINITION_FIELDS = (
+    'entity_label',
+    'entity_required',
+    'entity_type',
+    'entity_choices',
+    'entity_default',
+    'entity_description',
+    'entity_placeholder',
+    'entity_max_length',
+)
+
+class FormFieldDefinitionManager(models.Manager):
+    """
+    Manager for the FormFieldDefinition model
+    """
+    def get_definition(self, definition):
+        """
+        Returns the stored definition with the same content as an
+        unsaved definition, creating it if it is new
+        """
+        stored, _ = self.get_or_create(
+            definition_hash=definition.get_hash(),
+            defaults=definition.get_content()
+        )
+        return stored
+
+    def get_definition_ids(self, definitions):
+        """
+        Returns a dict of hash to the id of the stored definition for each
+        unsaved definition, only creating the definitions which are new.
+        """
+        definitions = {
+            definition.get_hash(): definition for definition in definitions
+        }
+        definition_ids = dict(self.filter(
+            definition_hash__in=list(definitions)
+        ).values_list('definition_hash', 'pk'))
+
+        new_hashes = [
+            definition_hash for definition_hash in definitions
+            if definition_hash not in definition_ids
+        ]
+        if new_hashes:
+            new_definitions = []
+            for definition_hash in new_hashes:
+                definition = definitions[definition_hash]
+                definition.definition_hash = definition_hash
+                new_definitions.append(definition)
+            self.bulk_create(new_definitions)
+            # bulk_create does not set the ids on every database
+            definition_ids.update(self.filter(
+                definition_hash__in=new_hashes
+            ).values_list('definition_hash', 'pk'))
+        return definition_ids
+
+class FormFieldDefinition(models.Model):
+    """
+    The content of a field within a dynamic form. Definitions are stored
+    once by a hash of their content and shared by every form version
+    which has the same field.
+    """
+    ENTITY_TYPE_OPTIONS = (
+        ("text-input", "Text Input"),
+        ("text-area", "Text Area"),
+        ("multi-choice", "Select Box"),
+        ("radio-buttons", "Radio Buttons"),
+        ("check-box", "Check Box")
+    )
+
+    definition_hash = models.CharField(max_length=40, unique=True)
+    entity_label = models.CharField(max_length=100, verbose_name="Title/Label")
+    entity_required = models.BooleanField(default=True)
+    entity_type = models.CharField(choices=ENTITY_TYPE_OPTIONS, max_length=13, verbose_name="Field Type")
+    entity_choices = models.CharField(blank=True, max_length=100, verbose_name="Choices")
+    entity_default = models.CharField(blank=True, max_length=100, verbose_name="Default")
+    entity_description = models.CharField(blank=True, max_length=1000, verbose_name="Description")
+    entity_placeholder = models.CharField(blank=True, max_length=100, verbose_name="Placeholder")
+    entity_max_length = models.PositiveSmallIntegerField(default=500, verbose_name="Max Length")
+
+    objects = FormFieldDefinitionManager()
+
+    def __str__(self):
+        return "FormFieldDefinition: {} ({})".format(self.entity_label, self.entity_type)
+
+    def save(self, *args, **kwargs):
+        self.definition_hash = self.get_hash()
+        super(FormFieldDefinition, self).save(*args, **kwargs)
+
+    def get_content(self):
+        """
+        Returns a dict of the content of the definition
+        """
+        return {name: getattr(self, name) for name in DEFINITION_FIELDS}
+
+    def get_hash(self):
+        """
+        Returns the hash of the content of the definition
+        """
+        return hashlib.sha1(
+            json.dumps(self.get_content(), sort_keys=True).encode('utf-8')
+        ).hexdigest()
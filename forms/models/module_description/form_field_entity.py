@@ -1,6 +1,15 @@
 from django.db import models
+from django.db.models import F
 
-from forms.models.module_description import ModuleDescriptionFormVersion
+from forms.models.module_description import (ModuleDescriptionFormVersion,
+                                             FormFieldDefinition,
+                                             DEFINITION_FIELDS)
+
+# values() of a field, with expressions which read its content from its definition
+FIELD_VALUES = ('entity_id', 'entity_order', 'module_description_version')
+DEFINITION_VALUES = {
+    name: F('definition__' + name) for name in DEFINITION_FIELDS
+}
 
 class FormFieldEntityManager(models.Manager):
     """
@@ -14,7 +23,7 @@ class FormFieldEntityManager(models.Manager):
         newest_version = ModuleDescriptionFormVersion.objects.get_most_recent()
         newest_version_fields = self.filter(
             module_description_version=newest_version
-        ).order_by('entity_order').values()
+        ).order_by('entity_order').values(*FIELD_VALUES, **DEFINITION_VALUES)
         return newest_version_fields
 
     def get_form_dict(self, version_id):
@@ -24,7 +33,7 @@ class FormFieldEntityManager(models.Manager):
         version = ModuleDescriptionFormVersion.objects.get(pk=version_id)
         chosen_version_fields = self.filter(
             module_description_version=version
-        ).order_by('entity_order').values()
+        ).order_by('entity_order').values(*FIELD_VALUES, **DEFINITION_VALUES)
         return chosen_version_fields
 
     def get_form(self, version_id):
@@ -34,31 +43,52 @@ class FormFieldEntityManager(models.Manager):
         version = ModuleDescriptionFormVersion.objects.get(pk=version_id)
         chosen_version_fields = self.filter(
             module_description_version=version
-        ).order_by('entity_order')
+        ).select_related('definition').order_by('entity_order')
         return chosen_version_fields
 
+    def create_field(self, version, entity_order, **definition):
+        """
+        Adds a field to a form version, sharing the stored definition
+        when another version already has a field with the same content.
+        """
+        return self.create(
+            module_description_version=version,
+            entity_order=entity_order,
+            definition=FormFieldDefinition.objects.get_definition(
+                FormFieldDefinition(**definition)
+            )
+        )
+
+    def bulk_create_fields(self, version, fields):
+        """
+        Adds the fields of a form version. Only the definitions which are
+        new are written, and the fields are added in a single query.
+
+        Arguments:
+            version     ModuleDescriptionFormVersion of the fields
+            fields      List of (entity_order, unsaved FormFieldDefinition)
+        """
+        definition_ids = FormFieldDefinition.objects.get_definition_ids(
+            [definition for _, definition in fields]
+        )
+        return self.bulk_create([
+            self.model(
+                module_description_version=version,
+                entity_order=entity_order,
+                definition_id=definition_ids[definition.get_hash()])
+            for entity_order, definition in fields
+        ])
+
 class FormFieldEntity(models.Model):
     """
-    Represents an entity within a dynamic form
+    Represents an entity within a dynamic form. The entity places a
+    shared FormFieldDefinition at a position within a form version.
     """
-    ENTITY_TYPE_OPTIONS = (
-        ("text-input", "Text Input"),
-        ("text-area", "Text Area"),
-        ("multi-choice", "Select Box"),
-        ("radio-buttons", "Radio Buttons"),
-        ("check-box", "Check Box")
-    )
+    ENTITY_TYPE_OPTIONS = FormFieldDefinition.ENTITY_TYPE_OPTIONS
 
     entity_id = models.AutoField(primary_key=True)
     entity_order = models.PositiveSmallIntegerField()
-    entity_label = models.CharField(max_length=100, verbose_name="Title/Label")
-    entity_required = models.BooleanField(default=True)
-    entity_type = models.CharField(choices=ENTITY_TYPE_OPTIONS, max_length=13, verbose_name="Field Type")
-    entity_choices = models.CharField(blank=True, max_length=100, verbose_name="Choices")
-    entity_default = models.CharField(blank=True, max_length=100, verbose_name="Default")
-    entity_description = models.CharField(blank=True, max_length=1000, verbose_name="Description")
-    entity_placeholder = models.CharField(blank=True, max_length=100, verbose_name="Placeholder")
-    entity_max_length = models.PositiveSmallIntegerField(default=500, verbose_name="Max Length")
+    definition = models.ForeignKey(FormFieldDefinition, on_delete=models.PROTECT)
     module_description_version = models.ForeignKey(ModuleDescriptionFormVersion)
 
     objects = FormFieldEntityManager()
@@ -67,4 +97,36 @@ class FormFieldEntity(models.Model):
         ordering = ['entity_order']
 
     def __str__(self):
-        return "FormFieldEntity: {} ({})".format(self.entity_label, self.entity_type)
\ No newline at end of file
+        return "FormFieldEntity: {} ({})".format(self.entity_label, self.entity_type)
+
+    @property
+    def entity_label(self):
+        return self.definition.entity_label
+
+    @property
+    def entity_required(self):
+        return self.definition.entity_required
+
+    @property
+    def entity_type(self):
+        return self.definition.entity_type
+
+    @property
+    def entity_choices(self):
+        return self.definition.entity_choices
+
+    @property
+    def entity_default(self):
+        return self.definition.entity_default
+
+    @property
+    def entity_description(self):
+        return self.definition.entity_description
+
+    @property
+    def entity_placeholder(self):
+        return self.definition.entity_placeholder
+
+    @property
+    def entity_max_length(self):
+        return self.definition.entity_max_length
@@ -1,3 +1,6 @@
+import hashlib
+import json
+from collections import OrderedDict, namedtuple
 from django.db import models
 from django.utils import timezone
 
@@ -5,19 +8,33 @@ from core.models import Module
 from forms.models.module_description import ModuleDescriptionFormVersion
 from timeline.models.integrate.entry import TLEntry
 
+# an answer of a module description along with the field it answers
+Answer = namedtuple('Answer', ['label', 'entity_type', 'value'])
+
 class ModuleDescriptionManager(models.Manager):
     """
     Manager for the module description object
     """
-    def create_new(self, module, form_version):
+    def create_new(self, module, form_version, answers=None):
         """
         Create a new ModuleDescription and assign it to a given
-        module and form version
+        module and form version. The new description becomes the
+        current description of the module.
+
+        Arguments:
+            module          Module the description is for
+            form_version    ModuleDescriptionFormVersion of the description
+            answers         Optional list of (field id, label, type, value)
+                            of every answer, in form order, stored as a
+                            snapshot on the description
         """
-        return ModuleDescription.objects.create(
+        description = ModuleDescription.objects.create(
             module_id=module.pk,
             form_version=form_version,
+            answers=json.dumps(answers) if answers is not None else '',
         )
+        CurrentModuleDescription.objects.set_current(description)
+        return description
 
     def get_most_recent(self, module):
         """
@@ -31,6 +48,10 @@ class ModuleDescription(TLEntry):
     """
     form_version = models.ForeignKey(ModuleDescriptionFormVersion, on_delete=models.PROTECT)
 
+    # json snapshot of the answers written when the description is published,
+    # the ModuleDescriptionEntry rows are still the source for queries
+    answers = models.TextField(blank=True, default='')
+
     objects = ModuleDescriptionManager()
 
     def __str__(self):
@@ -41,4 +62,119 @@ class ModuleDescription(TLEntry):
         return "{} Module Description master for {}".format(description_phase, self.module_id)
 
     def title(self):
-        return "Module Description"
\ No newline at end of file
+        return "Module Description"
+
+    def get_answer_map(self):
+        """
+        Returns an OrderedDict of field id to the Answer of each field, in
+        form order. Read from the snapshot, or from the entries for
+        descriptions without one.
+        """
+        if not self.answers:
+            return self.moduledescriptionentry_set.get_answer_map(self)
+        return OrderedDict(
+            (field_id, Answer(label, entity_type, value))
+            for field_id, label, entity_type, value in json.loads(self.answers)
+        )
+
+    def get_answer_hashes(self, answer_map=None):
+        """
+        Returns an OrderedDict of field label to a hash of its answer.
+        Labels are used as fields are recreated in each form version.
+        """
+        if answer_map is None:
+            answer_map = self.get_answer_map()
+        return OrderedDict(
+            (answer.label, hashlib.sha1(
+                json.dumps(answer.value).encode('utf-8')
+            ).hexdigest())
+            for answer in answer_map.values()
+        )
+
+    def get_previous(self):
+        """
+        Returns the description of the module published before this
+        one, or None if this is the first
+        """
+        return ModuleDescription.objects.filter(
+            models.Q(created__lt=self.created) |
+            models.Q(created=self.created, pk__lt=self.pk),
+            module_id=self.module_id
+        ).order_by('-created', '-pk').first()
+
+    def diff_answers(self, previous):
+        """
+        Compares the answers against a previous description. The hashes
+        of the answers are compared first, so only the fields which have
+        changed are compared in detail.
+
+        Return:
+            list of (label, original, updated) of each changed field, in
+            form order followed by the removed fields. Missing answers are None.
+        """
+        answers = self.get_answer_map()
+        hashes = self.get_answer_hashes(answers)
+        if previous is None:
+            previous_answers, previous_hashes = OrderedDict(), OrderedDict()
+        else:
+            previous_answers = previous.get_answer_map()
+            previous_hashes = previous.get_answer_hashes(previous_answers)
+
+        changed = [
+            label for label in list(hashes) + list(previous_hashes)
+            if hashes.get(label) != previous_hashes.get(label)
+        ]
+        values = {answer.label: answer.value for answer in answers.values()}
+        previous_values = {
+            answer.label: answer.value for answer in previous_answers.values()
+        }
+        return [
+            (label, previous_values.get(label), values.get(label))
+            for label in OrderedDict.fromkeys(changed)
+        ]
+
+
+class CurrentModuleDescriptionManager(models.Manager):
+    """
+    Manager for the CurrentModuleDescription model
+    """
+    def set_current(self, description):
+        """
+        Points the module of a description at it
+        """
+        updated = self.filter(module_id=description.module_id).update(
+            description=description
+        )
+        if not updated:
+            self.create(module_id=description.module_id, description=description)
+
+    def get_current(self, module):
+        """
+        Returns the current ModuleDescription of a module, with its
+        form version, in a single query
+        """
+        return self.select_related('description__form_version').get(
+            module_id=module
+        ).description
+
+
+class CurrentModuleDescription(models.Model):
+    """
+    Pointer from a module to its current module description
+    """
+    module = models.OneToOneField(
+        Module,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='current_description'
+    )
+    description = models.ForeignKey(
+        ModuleDescription,
+        on_delete=models.CASCADE,
+        related_name='current_for'
+    )
+
+    objects = CurrentModuleDescriptionManager()
+
+    def __str__(self):
+        return "Current Module Description of {}".format(self.module_id)
@@ -1,6 +1,102 @@
-from django.db import models
+import hashlib
+import json
+from collections import OrderedDict
+from django.db import models, transaction, IntegrityError
+
+from forms.models.module_description import (FormFieldEntity, ModuleDescription,
+                                             Answer)
+
+# hashes looked up per query, kept below the 999 variables older SQLite
+# builds allow in a query
+ANSWER_LOOKUP_CHUNK_SIZE = 500
+
+
+def answer_hash(entry_fields):
+    """
+    Returns the hash of the value of an answer, which includes
+    the type of the value so that True and 1 are kept apart
+    """
+    return hashlib.sha1(
+        json.dumps(entry_fields, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+class ModuleDescriptionAnswerManager(models.Manager):
+    """
+    Manager for the ModuleDescriptionAnswer model
+    """
+    def get_answer(self, entry_fields):
+        """
+        Returns the answer row holding a value, creating it if
+        no description has given that answer before
+        """
+        answer, _ = self.get_or_create(
+            value_hash=answer_hash(entry_fields), defaults=entry_fields
+        )
+        return answer
+
+    def get_answer_ids(self, entry_fields_list):
+        """
+        Returns a dict of hash to the id of the answer row for each value,
+        only creating rows for the values which have not been seen before.
+
+        Arguments:
+            entry_fields_list   List of the entry fields of each value, as
+                                given by get_entry_fields
+        """
+        values = {
+            answer_hash(entry_fields): entry_fields
+            for entry_fields in entry_fields_list
+        }
+        answer_ids = self.read_answer_ids(list(values))
+
+        new_hashes = [value_hash for value_hash in values if value_hash not in answer_ids]
+        if new_hashes:
+            try:
+                with transaction.atomic():
+                    self.bulk_create([
+                        self.model(value_hash=value_hash, **values[value_hash])
+                        for value_hash in new_hashes
+                    ])
+            except IntegrityError:
+                # another publish wrote some of the values since they were
+                # read, so the rest are created one at a time below
+                pass
+            # bulk_create does not set the ids on every database
+            answer_ids.update(self.read_answer_ids(new_hashes))
+            for value_hash in new_hashes:
+                if value_hash not in answer_ids:
+                    answer_ids[value_hash] = self.get_or_create(
+                        value_hash=value_hash, defaults=values[value_hash]
+                    )[0].pk
+        return answer_ids
+
+    def read_answer_ids(self, hashes):
+        """
+        Returns a dict of hash to the id of the existing answer rows
+        with the hashes, looked up a chunk of hashes at a time
+        """
+        answer_ids = {}
+        for start in range(0, len(hashes), ANSWER_LOOKUP_CHUNK_SIZE):
+            answer_ids.update(self.filter(
+                value_hash__in=hashes[start:start + ANSWER_LOOKUP_CHUNK_SIZE]
+            ).values_list('value_hash', 'pk'))
+        return answer_ids
+
+
+class ModuleDescriptionAnswer(models.Model):
+    """
+    A value given as the answer to a module description field. Values
+    are stored once and shared by every entry with the same answer, so
+    a new description only adds rows for the answers which changed.
+    """
+    value_hash = models.CharField(max_length=40, unique=True)
+    boolean_entry = models.NullBooleanField(null=True)
+    string_entry = models.CharField(null=True, max_length = 2000)
+    integer_entry = models.IntegerField(null=True)
+
+    objects = ModuleDescriptionAnswerManager()
 
-from forms.models.module_description import FormFieldEntity, ModuleDescription
 
 class ModuleDescriptionEntryManager(models.Manager):
     """
@@ -11,22 +107,62 @@ class ModuleDescriptionEntryManager(models.Manager):
         Creates a new ModuleDescriptionEntry object and links it to
         a ModuleDescription 'parent',and  a FormFieldEntity. 
         """
-        # Determines what type the entry is and sets the appropriate field
-        if isinstance(entry, str):
+        entry_fields = self.get_entry_fields(entry)
+        if entry_fields is not None:
             return self.create(
                 module_description_id=md_id,
                 field_id=field_id,
-                string_entry=entry)
-        elif isinstance(entry, bool):
-            return self.create(
+                answer=ModuleDescriptionAnswer.objects.get_answer(entry_fields))
+
+    def bulk_create_entries(self, md_id, entries):
+        """
+        Creates the entries of a module description. The entries point at
+        the existing answer rows, so only the changed answers are written.
+
+        Arguments:
+            md_id       ModuleDescription 'parent' of the entries
+            entries     List of (FormFieldEntity, entry) tuples
+        """
+        return self.bulk_create_many(
+            [(md_id, field_id, entry) for field_id, entry in entries]
+        )
+
+    def bulk_create_many(self, entries):
+        """
+        Creates the entries of any number of module descriptions, with
+        the answers shared in the same way as bulk_create_entries.
+
+        Arguments:
+            entries     List of (ModuleDescription, FormFieldEntity, entry)
+        """
+        new_entries = []
+        for md_id, field_id, entry in entries:
+            entry_fields = self.get_entry_fields(entry)
+            if entry_fields is not None:
+                new_entries.append((md_id, field_id, entry_fields))
+        answer_ids = ModuleDescriptionAnswer.objects.get_answer_ids(
+            [entry_fields for _, _, entry_fields in new_entries]
+        )
+        return self.bulk_create([
+            self.model(
                 module_description_id=md_id,
                 field_id=field_id,
-                boolean_entry=entry)
+                answer_id=answer_ids[answer_hash(entry_fields)])
+            for md_id, field_id, entry_fields in new_entries
+        ])
+
+    def get_entry_fields(self, entry):
+        """
+        Determines what type the entry is and returns the
+        appropriate field to set, or None for other types
+        """
+        if isinstance(entry, str):
+            return {'string_entry': entry}
+        elif isinstance(entry, bool):
+            return {'boolean_entry': entry}
         elif isinstance(entry, int):
-            return self.create(
-                module_description_id=md_id,
-                field_id=field_id,
-                integer_entry=entry)
+            return {'integer_entry': entry}
+        return None
 
     # Return the values for the most recent module description of a given model
     def get_last_description(self, module):
@@ -36,15 +172,53 @@ class ModuleDescriptionEntryManager(models.Manager):
     # Returns the values for a module description given it's id
     def get_full_description(self, module_description):
         return self.filter(module_description_id=module_description)
+
+    def get_answer_map(self, module_description):
+        """
+        Returns an OrderedDict of field id to the Answer for each entry of a
+        module description, in form order. The fields are joined in, so
+        this is a single query.
+        """
+        entries = self.filter(
+            module_description_id=module_description
+        ).order_by('field_id__entity_order').values_list(
+            'field_id',
+            'field_id__definition__entity_label',
+            'field_id__definition__entity_type',
+            'answer__string_entry',
+            'answer__boolean_entry',
+            'answer__integer_entry'
+        )
+        answers = OrderedDict()
+        for field_id, label, entity_type, string, boolean, integer in entries:
+            if entity_type == "check-box":
+                value = boolean
+            elif entity_type in ("text-input", "text-area", "multi-choice", "radio-buttons"):
+                value = string
+            else:
+                value = integer
+            answers[field_id] = Answer(label, entity_type, value)
+        return answers
     
 class ModuleDescriptionEntry(models.Model):
     """
-    Represents the answer to a single field within a module description
+    Represents the answer to a single field within a module description.
+    The value itself is held by a shared ModuleDescriptionAnswer.
     """
     module_description_id = models.ForeignKey(ModuleDescription)
     field_id = models.ForeignKey(FormFieldEntity)
-    boolean_entry = models.NullBooleanField(null=True)
-    string_entry = models.CharField(null=True, max_length = 2000)
-    integer_entry = models.IntegerField(null=True)
+    answer = models.ForeignKey(ModuleDescriptionAnswer, on_delete=models.PROTECT)
+
+    objects = ModuleDescriptionEntryManager()
+
+    @property
+    def boolean_entry(self):
+        return self.answer.boolean_entry
+
+    @property
+    def string_entry(self):
+        return self.answer.string_entry
 
-    objects = ModuleDescriptionEntryManager()
\ No newline at end of file
+    @property
+    def integer_entry(self):
+        return self.answer.integer_entry
@@ -0,0 +1,74 @@
+from django.test import TestCase
+from core.models import User, Module
+from forms.models import (ModuleDescription, ModuleDescriptionEntry,
+                          ModuleDescriptionFormVersion, FormFieldEntity)
+from forms.utils.form_schema import form_schema_cache
+
+
+class ModuleDescriptionTestCase(TestCase):
+    """
+    Base test case with a module and a module description form version.
+    The form schema cache is cleared around each test.
+    """
+    # (label, type, answer) of the fields of the form version
+    FIELDS = (
+        ("Aims", "text-input", "Learn things"),
+        ("Syllabus", "text-area", "Docker, Python"),
+        ("Exam", "check-box", True),
+    )
+
+    def setUp(self):
+        super(ModuleDescriptionTestCase, self).setUp()
+        form_schema_cache.clear()
+        self.user = User.objects.create_user(
+            username='user1',
+            first_name='user',
+            last_name='user',
+            email='user@example.com',
+            password='password'
+        )
+        self.module = Module.objects.create(
+            module_code="CM3301",
+            module_name="Test Module",
+            module_credits="10",
+            module_level="L6",
+            semester="Autumn Semester",
+            delivery_language="English",
+            module_leader=self.user
+        )
+        self.version = ModuleDescriptionFormVersion.objects.create_new_version()
+        self.fields = [
+            FormFieldEntity.objects.create_field(
+                self.version,
+                order,
+                entity_label=label,
+                entity_type=entity_type
+            )
+            for order, (label, entity_type, _) in enumerate(self.FIELDS)
+        ]
+
+    def tearDown(self):
+        form_schema_cache.clear()
+        super(ModuleDescriptionTestCase, self).tearDown()
+
+    def create_description(self):
+        """
+        Creates a module description answering every field
+        """
+        description = ModuleDescription.objects.create_new(
+            self.module, self.version
+        )
+        for field, (_, _, answer) in zip(self.fields, self.FIELDS):
+            ModuleDescriptionEntry.objects.create_new_entry(
+                description, field, answer
+            )
+        return description
+
+    def form_answers(self):
+        """
+        Returns the answers keyed by their form field names
+        """
+        return {
+            "field_entity_{}".format(field.pk): answer
+            for field, (_, _, answer) in zip(self.fields, self.FIELDS)
+        }
@@ -0,0 +1,196 @@
+import io
+import json
+import tempfile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Module
+from forms.models import ModuleDescription, CurrentModuleDescription
+from forms.tests.common import ModuleDescriptionTestCase
+from forms.utils.description_import import (DescriptionImporter, read_records,
+                                            RowError)
+from forms.utils.description_search import DescriptionSearch
+from forms.utils.module_description import publish_module_description
+from timeline.models import TimelineEntry
+
+
+class TestDescriptionImport(ModuleDescriptionTestCase):
+    """
+    Test case for the bulk import of module descriptions
+    """
+    def create_module(self, module_code):
+        return Module.objects.create(
+            module_code=module_code,
+            module_name="Module {}".format(module_code),
+            module_credits="10",
+            module_level="L6",
+            semester="Autumn Semester",
+            delivery_language="English",
+            module_leader=self.user
+        )
+
+    def record(self, module_code, **answers):
+        record = {
+            "Module Code": module_code,
+            "Aims": "Learn things",
+            "Syllabus": "Docker, Python",
+            "Exam": "yes",
+        }
+        record.update(answers)
+        return record
+
+    def run_import(self, records, batch_size=2):
+        return DescriptionImporter(
+            self.version, user=self.user, batch_size=batch_size
+        ).run(enumerate(records, start=1))
+
+    def test_import_descriptions(self):
+        """
+        Test that each record becomes the current description of its module
+        """
+        self.create_module("CM3302")
+        importer = self.run_import([
+            self.record("CM3301"),
+            self.record("CM3302", Syllabus="Kubernetes", Exam="no"),
+        ])
+
+        self.assertEquals(importer.imported, 2)
+        self.assertEquals(importer.errors, [])
+        answers = {
+            current.module_id: [
+                answer.value
+                for answer in current.description.get_answer_map().values()
+            ]
+            for current in CurrentModuleDescription.objects.all()
+        }
+        self.assertEquals(answers, {
+            "CM3301": ["Learn things", "Docker, Python", True],
+            "CM3302": ["Learn things", "Kubernetes", False],
+        })
+        # the entries agree with the snapshot
+        description = ModuleDescription.objects.get(module="CM3302")
+        description.answers = ''
+        self.assertEquals(
+            [answer.value for answer in description.get_answer_map().values()],
+            ["Learn things", "Kubernetes", False]
+        )
+        self.assertEquals(TimelineEntry.objects.filter(
+            entry_type='Module-Description', status='Confirmed'
+        ).count(), 2)
+        self.assertEquals(len(DescriptionSearch("kubernetes")), 1)
+
+    def test_import_replaces_description(self):
+        """
+        Test that the timeline entry lists the changes from the
+        description the import replaces
+        """
+        publish_module_description(
+            self.module, self.version, self.form_answers(), self.user
+        )
+        self.run_import([self.record("CM3301", Syllabus="Kubernetes")])
+
+        self.assertEquals(
+            CurrentModuleDescription.objects.get(module=self.module).description,
+            ModuleDescription.objects.latest('pk')
+        )
+        self.assertEquals(
+            TimelineEntry.objects.latest('pk').changes,
+            "* Syllabus: Docker, Python -> Kubernetes\n"
+        )
+        self.assertEquals(len(DescriptionSearch("docker")), 0)
+
+    def test_invalid_rows_are_reported(self):
+        """
+        Test that the rows which can not be imported are reported and
+        the other rows are still imported
+        """
+        importer = self.run_import([
+            self.record("CM9999"),
+            self.record("CM3301", Exam="maybe"),
+            self.record(""),
+            self.record("CM3301", Aims="x" * 600, Notes="ignored"),
+            self.record("CM3301"),
+            self.record("CM3301"),
+        ])
+
+        self.assertEquals(importer.imported, 1)
+        self.assertEquals(importer.unknown_columns, {"Notes"})
+        self.assertEquals([error[:2] for error in importer.errors], [
+            (1, "CM9999"),
+            (2, "CM3301"),
+            (3, ""),
+            (4, "CM3301"),
+            (6, "CM3301"),
+        ])
+        self.assertEquals(
+            importer.errors[0], RowError(1, "CM9999", "Unknown module")
+        )
+        self.assertEquals(ModuleDescription.objects.count(), 1)
+
+    def test_batch_queries_are_constant(self):
+        """
+        Test that the number of queries writing a batch does not depend on
+        the number of descriptions in it. The report snapshots are left out,
+        they are refreshed a module at a time.
+        """
+        def count_queries(module_codes):
+            for module_code in module_codes:
+                self.create_module(module_code)
+            records = [
+                self.record(code, Syllabus="Syllabus of {}".format(code))
+                for code in module_codes
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.run_import(records, batch_size=len(records))
+            return len([
+                query for query in queries.captured_queries
+                if 'reportsnapshot' not in query['sql']
+                and 'SAVEPOINT' not in query['sql']
+            ])
+
+        # the form schema and content types are cached by the first import
+        count_queries(["CM4000"])
+        self.assertEquals(
+            count_queries(["CM4001", "CM4002"]),
+            count_queries(["CM5001", "CM5002", "CM5003", "CM5004", "CM5005"])
+        )
+
+    def test_read_records(self):
+        """
+        Test that csv and json files are read with their row numbers
+        """
+        csv_file = io.StringIO("Module Code,Aims\nCM3301,Learn things\n")
+        self.assertEquals(
+            list(read_records(csv_file, 'csv')),
+            [(2, {"Module Code": "CM3301", "Aims": "Learn things"})]
+        )
+        json_file = io.StringIO(json.dumps([{"Module Code": "CM3301"}]))
+        self.assertEquals(
+            list(read_records(json_file, 'json')),
+            [(1, {"Module Code": "CM3301"})]
+        )
+        with self.assertRaises(ValueError):
+            list(read_records(io.StringIO("{}"), 'json'))
+
+    def test_command(self):
+        """
+        Test that the command imports a csv file and lists the failed rows
+        """
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as csv_file:
+            csv_file.write(
+                "Module Code,Aims,Syllabus,Exam\n"
+                "CM3301,Learn things,Docker,yes\n"
+                "CM9999,Learn things,Docker,no\n"
+            )
+            csv_file.flush()
+            out, err = io.StringIO(), io.StringIO()
+            call_command(
+                'import_module_descriptions', csv_file.name,
+                user='user1', stdout=out, stderr=err
+            )
+        self.assertIn('Imported 1 module descriptions, 1 rows failed', out.getvalue())
+        self.assertIn('Row 3 CM9999: Unknown module', err.getvalue())
+        self.assertEquals(
+            TimelineEntry.objects.get().changes_by, self.user
+        )
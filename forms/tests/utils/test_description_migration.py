@@ -0,0 +1,218 @@
+import io
+from django.core.management import call_command
+
+from core.models import Module
+from forms.models import (ModuleDescription, ModuleDescriptionFormVersion,
+                          FormFieldEntity, CurrentModuleDescription)
+from forms.tests.common import ModuleDescriptionTestCase
+from forms.utils.description_migration import (DescriptionMigration,
+                                               MigrationError, field_mapping)
+from forms.utils.form_schema import get_form_schema
+from forms.utils.module_description import publish_module_description
+from timeline.models import TimelineEntry
+
+
+class TestDescriptionMigration(ModuleDescriptionTestCase):
+    """
+    Test case for moving the module descriptions to a new form version
+    """
+    # (label, type, required) of the fields of the new form version
+    NEW_FIELDS = (
+        ("Aims", "text-input", True),
+        ("Content", "text-area", True),
+        ("Exam", "text-input", False),
+        ("Reading", "text-area", True),
+    )
+
+    def setUp(self):
+        super(TestDescriptionMigration, self).setUp()
+        self.publish(self.module)
+        self.new_version = ModuleDescriptionFormVersion.objects.create_new_version()
+        self.new_fields = [
+            FormFieldEntity.objects.create_field(
+                self.new_version,
+                order,
+                entity_label=label,
+                entity_type=entity_type,
+                entity_required=required
+            )
+            for order, (label, entity_type, required) in enumerate(self.NEW_FIELDS)
+        ]
+
+    def publish(self, module):
+        return publish_module_description(
+            module, self.version, self.form_answers(), self.user
+        )
+
+    def create_module(self, module_code):
+        module = Module.objects.create(
+            module_code=module_code,
+            module_name="Module {}".format(module_code),
+            module_credits="10",
+            module_level="L6",
+            semester="Autumn Semester",
+            delivery_language="English",
+            module_leader=self.user
+        )
+        self.publish(module)
+        return module
+
+    def current_answers(self, module):
+        description = CurrentModuleDescription.objects.get(
+            module=module
+        ).description
+        return description.form_version, {
+            answer.label: answer.value
+            for answer in description.get_answer_map().values()
+        }
+
+    def test_migrate_by_label(self):
+        """
+        Test that answers are carried over to the fields with the same
+        label and the answers which do not fit are dropped
+        """
+        migration = DescriptionMigration(self.new_version, user=self.user).run()
+
+        self.assertEquals(migration.migrated, 1)
+        self.assertEquals(
+            self.current_answers(self.module),
+            (self.new_version, {"Aims": "Learn things"})
+        )
+        # the check box answer does not fit a text input
+        self.assertEquals(dict(migration.dropped), {"Syllabus": 1, "Exam": 1})
+        self.assertEquals(dict(migration.unanswered), {"Content": 1, "Reading": 1})
+        self.assertEquals(
+            TimelineEntry.objects.latest('pk').changes_by, self.user
+        )
+
+    def test_migrate_with_mapping(self):
+        """
+        Test that an explicit mapping moves answers between labels
+        """
+        DescriptionMigration(
+            self.new_version, mapping={"Syllabus": "Content", "Aims": None}
+        ).run()
+        self.assertEquals(
+            self.current_answers(self.module),
+            (self.new_version, {"Content": "Docker, Python"})
+        )
+
+    def test_bad_mapping(self):
+        """
+        Test that a mapping of unknown labels is rejected before
+        anything is written
+        """
+        with self.assertRaises(MigrationError):
+            DescriptionMigration(
+                self.new_version, mapping={"Syllabus": "Missing"}
+            ).run()
+        with self.assertRaises(MigrationError):
+            field_mapping(
+                get_form_schema(self.version.pk),
+                get_form_schema(self.new_version.pk),
+                {"Missing": "Content"}
+            )
+        self.assertEquals(ModuleDescription.objects.count(), 1)
+
+    def test_mapping_over_several_versions(self):
+        """
+        Test that a mapped label only needs to be in one of the versions
+        being migrated from, and is used by the versions which have it
+        """
+        old_version = ModuleDescriptionFormVersion.objects.create_new_version()
+        goals = FormFieldEntity.objects.create_field(
+            old_version, 0, entity_label="Goals", entity_type="text-input"
+        )
+        module = self.create_module("CM3302")
+        publish_module_description(
+            module, old_version,
+            {"field_entity_{}".format(goals.pk): "Learn more things"}, self.user
+        )
+
+        DescriptionMigration(self.new_version, mapping={"Goals": "Aims"}).run()
+        self.assertEquals(
+            self.current_answers(module),
+            (self.new_version, {"Aims": "Learn more things"})
+        )
+        self.assertEquals(
+            self.current_answers(self.module),
+            (self.new_version, {"Aims": "Learn things"})
+        )
+
+    def test_mapping_collision(self):
+        """
+        Test that moving the answers of two fields to the same field is
+        rejected before anything is written
+        """
+        with self.assertRaises(MigrationError):
+            DescriptionMigration(
+                self.new_version, mapping={"Syllabus": "Aims"}
+            ).run()
+        self.assertEquals(ModuleDescription.objects.count(), 1)
+
+    def test_dry_run(self):
+        """
+        Test that a dry run reports the migration without writing it
+        """
+        progress = []
+        migration = DescriptionMigration(
+            self.new_version,
+            dry_run=True,
+            progress=lambda done, total: progress.append((done, total))
+        ).run()
+        self.assertEquals(migration.migrated, 1)
+        self.assertEquals(progress, [(1, 1)])
+        self.assertEquals(ModuleDescription.objects.count(), 1)
+        self.assertEquals(self.current_answers(self.module)[0], self.version)
+
+    def test_chunks(self):
+        """
+        Test that the modules are migrated a chunk at a time, and modules
+        already on the new version are left alone
+        """
+        for module_code in ("CM3302", "CM3303", "CM3304"):
+            self.create_module(module_code)
+        progress = []
+        DescriptionMigration(
+            self.new_version,
+            chunk_size=3,
+            progress=lambda done, total: progress.append((done, total))
+        ).run()
+        self.assertEquals(progress, [(3, 4), (4, 4)])
+
+        progress = []
+        self.create_module("CM3305")
+        DescriptionMigration(
+            self.new_version,
+            progress=lambda done, total: progress.append((done, total))
+        ).run()
+        self.assertEquals(progress, [(1, 1)])
+        self.assertEquals(
+            set(CurrentModuleDescription.objects.values_list(
+                'description__form_version', flat=True
+            )),
+            {self.new_version.pk}
+        )
+        self.assertEquals(ModuleDescription.objects.count(), 10)
+
+        progress = []
+        DescriptionMigration(
+            self.new_version,
+            progress=lambda done, total: progress.append((done, total))
+        ).run()
+        self.assertEquals(progress, [])
+
+    def test_command(self):
+        """
+        Test that the command reads the mapping and reports the migration
+        """
+        out = io.StringIO()
+        call_command(
+            'migrate_module_descriptions', map=['Syllabus=Content'],
+            dry_run=True, stdout=out
+        )
+        self.assertIn('Would migrate 1 modules to form version {}'.format(
+            self.new_version.pk
+        ), out.getvalue())
+        self.assertIn('1/1 modules', out.getvalue())
+        self.assertIn('1 modules have no answer to Reading', out.getvalue())
@@ -0,0 +1,116 @@
+from django.db import connection
+from forms.tests.common import ModuleDescriptionTestCase
+from forms.utils.description_search import (DescriptionSearch, rebuild_index,
+                                            indexed_labels, insert_rows,
+                                            SEARCH_TABLE, SEARCH_MODULES_TABLE)
+from forms.utils.module_description import publish_module_description
+
+
+class TestDescriptionSearch(ModuleDescriptionTestCase):
+    """
+    Test case for the full text search of the module description answers
+    """
+    def publish(self, syllabus=None):
+        answers = self.form_answers()
+        if syllabus is not None:
+            answers["field_entity_{}".format(self.fields[1].pk)] = syllabus
+        return publish_module_description(
+            self.module, self.version, answers, self.user
+        )
+
+    def row_counts(self):
+        with connection.cursor() as cursor:
+            counts = []
+            for table in (SEARCH_TABLE, SEARCH_MODULES_TABLE):
+                cursor.execute("SELECT COUNT(*) FROM {}".format(table))
+                counts.append(cursor.fetchone()[0])
+            return counts
+
+    def search(self, query, label=None):
+        return [
+            (result.module_code, result.label, str(result.snippet))
+            for result in DescriptionSearch(query, label=label)[:10]
+        ]
+
+    def test_published_answers_are_indexed(self):
+        """
+        Test that the text answers of a published description are found
+        """
+        self.publish()
+        self.assertEquals(
+            self.search("docker"),
+            [("CM3301", "Syllabus", "<mark>Docker</mark>, Python")]
+        )
+        self.assertEquals(indexed_labels(), ["Aims", "Syllabus"])
+
+    def test_prefix_and_stemming(self):
+        """
+        Test that the last word matches as a prefix and words are stemmed
+        """
+        self.publish()
+        self.assertEquals(len(DescriptionSearch("dock")), 1)
+        self.assertEquals(len(DescriptionSearch("learning")), 1)
+
+    def test_publish_replaces_answers(self):
+        """
+        Test that only the current description of a module is indexed
+        """
+        self.publish()
+        self.publish(syllabus="Kubernetes")
+        self.assertEquals(self.search("docker"), [])
+        self.assertEquals(len(DescriptionSearch("kubernetes")), 1)
+
+    def test_label_filter(self):
+        """
+        Test that the answers can be limited to a single field
+        """
+        self.publish(syllabus="Learn Docker")
+        self.assertEquals(len(DescriptionSearch("learn")), 2)
+        self.assertEquals(
+            self.search("learn", label="Aims"),
+            [("CM3301", "Aims", "<mark>Learn</mark> things")]
+        )
+
+    def test_query_syntax_is_escaped(self):
+        """
+        Test that FTS5 syntax and html in the answers are escaped
+        """
+        self.publish(syllabus="<b>Docker</b>")
+        self.assertEquals(
+            self.search('docker" OR (NEAR'),
+            []
+        )
+        self.assertEquals(
+            self.search("docker"),
+            [("CM3301", "Syllabus", "&lt;b&gt;<mark>Docker</mark>&lt;/b&gt;")]
+        )
+        self.assertEquals(len(DescriptionSearch("")), 0)
+
+    def test_rebuild_index(self):
+        """
+        Test that rebuilding indexes the current descriptions
+        """
+        self.publish()
+        self.assertEquals(rebuild_index(), 2)
+        self.assertEquals(len(DescriptionSearch("docker")), 1)
+
+    def test_publish_replaces_module_rows(self):
+        """
+        Test that the rows of a module are replaced along with their modules
+        """
+        self.publish()
+        self.publish(syllabus="Kubernetes")
+        self.assertEquals(self.row_counts(), [2, 2])
+        self.assertEquals(rebuild_index(), 2)
+        self.assertEquals(self.row_counts(), [2, 2])
+
+    def test_count_leaves_out_missing_modules(self):
+        """
+        Test that rows of a module which no longer exists are not counted
+        """
+        self.publish()
+        with connection.cursor() as cursor:
+            insert_rows(cursor, [("Docker again", "Syllabus", "XX0000", 0, 0)])
+        self.assertEquals(self.row_counts(), [3, 3])
+        self.assertEquals(len(DescriptionSearch("docker")), 1)
+        self.assertEquals(len(self.search("docker")), 1)
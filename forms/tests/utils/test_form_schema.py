@@ -0,0 +1,129 @@
+from django.test import TestCase
+from django.utils import timezone
+from forms.forms import ModuleDescriptionForm
+from forms.models import ModuleDescriptionFormVersion, FormFieldEntity
+from forms.utils.form_schema import FormSchemaCache, form_schema_cache
+
+
+class TestFormSchemaCache(TestCase):
+    """
+    Test case for the cache of the module description form schemas
+    """
+    def setUp(self):
+        form_schema_cache.clear()
+        self.version = ModuleDescriptionFormVersion.objects.create_new_version()
+        self.create_field(self.version, 1, "Aims", "text-input")
+        self.create_field(
+            self.version, 2, "Exam", "radio-buttons", choices="Yes, No"
+        )
+
+    def tearDown(self):
+        form_schema_cache.clear()
+
+    def create_field(self, version, order, label, entity_type, choices=""):
+        return FormFieldEntity.objects.create_field(
+            version,
+            order,
+            entity_label=label,
+            entity_type=entity_type,
+            entity_choices=choices
+        )
+
+    def test_schema_is_compiled(self):
+        """
+        Test that the fields are in form order with their choices split
+        """
+        schema = form_schema_cache.get_schema(self.version.pk)
+        self.assertEquals(
+            [field.entity_label for field in schema], ['Aims', 'Exam']
+        )
+        self.assertEquals(schema[1].choices, (('Yes', 'Yes'), ('No', 'No')))
+
+    def test_hot_form_makes_no_queries(self):
+        """
+        Test that building a form again makes no schema queries, and
+        only reads the id of the most recent version
+        """
+        ModuleDescriptionForm()
+        with self.assertNumQueries(1):
+            form = ModuleDescriptionForm()
+        with self.assertNumQueries(0):
+            ModuleDescriptionForm(md_version=str(self.version.pk))
+        self.assertEquals(form.md_version, self.version.pk)
+        self.assertEquals(len(form.fields), 3)
+
+    def test_new_version_is_used(self):
+        """
+        Test that creating a version invalidates the most recent version
+        """
+        ModuleDescriptionForm()
+        version = ModuleDescriptionFormVersion.objects.create_new_version()
+        self.create_field(version, 1, "Syllabus", "text-area")
+
+        form = ModuleDescriptionForm()
+        self.assertEquals(form.md_version, version.pk)
+        self.assertEquals(
+            [field.label for name, field in form.fields.items()
+             if name != 'form_version'],
+            ['Syllabus']
+        )
+
+    def test_version_from_another_process_is_used(self):
+        """
+        Test that a version created without this process knowing, as
+        it would be by another process, is the most recent version
+        """
+        ModuleDescriptionForm()
+        # bulk_create sends no signals, so nothing here is told of it
+        ModuleDescriptionFormVersion.objects.bulk_create([
+            ModuleDescriptionFormVersion(creation_date=timezone.now())
+        ])
+        self.assertEquals(
+            ModuleDescriptionForm().md_version,
+            ModuleDescriptionFormVersion.objects.latest('creation_date').pk
+        )
+
+    def test_field_change_invalidates(self):
+        """
+        Test that adding a field to a cached version drops its schema
+        """
+        form_schema_cache.get_schema(self.version.pk)
+        self.create_field(self.version, 3, "Syllabus", "text-area")
+        self.assertEquals(len(form_schema_cache.get_schema(self.version.pk)), 3)
+
+    def test_missing_version(self):
+        """
+        Test that an unknown version raises DoesNotExist
+        """
+        with self.assertRaises(ModuleDescriptionFormVersion.DoesNotExist):
+            form_schema_cache.get_schema(self.version.pk + 1)
+
+    def test_cache_is_bounded(self):
+        """
+        Test that the least recently used schema is removed
+        """
+        cache = FormSchemaCache(maxsize=1)
+        other = ModuleDescriptionFormVersion.objects.create_new_version()
+        self.create_field(other, 1, "Aims", "text-input")
+
+        cache.get_schema(self.version.pk)
+        cache.get_schema(other.pk)
+        self.assertEquals(list(cache.schemas), [other.pk])
+
+    def test_definitions_are_shared(self):
+        """
+        Test that versions with the same field share its definition
+        """
+        other = ModuleDescriptionFormVersion.objects.create_new_version()
+        self.create_field(other, 1, "Aims", "text-input")
+        form_schema_cache.get_schema(self.version.pk)
+        # only the fields of the version are loaded
+        with self.assertNumQueries(1):
+            schema = form_schema_cache.get_schema(other.pk)
+        self.assertEquals(schema[0].entity_label, "Aims")
+        self.assertEquals(schema[0].entity_order, 1)
+        self.assertEquals(
+            FormFieldEntity.objects.get(pk=schema[0].entity_id).definition_id,
+            FormFieldEntity.objects.get(module_description_version=self.version,
+                                        entity_order=1).definition_id
+        )
@@ -0,0 +1,225 @@
+from unittest import mock
+from timeline.models import TimelineEntry
+from forms.models import (ModuleDescription, ModuleDescriptionEntry,
+                          FormFieldEntity, CurrentModuleDescription,
+                          ModuleDescriptionAnswer)
+from forms.models.module_description import module_description_entry as entry_module
+from forms.models.module_description.module_description_entry import answer_hash
+from forms.tests.common import ModuleDescriptionTestCase
+from forms.utils.module_description import (ModuleDescriptionWrapper,
+                                            CurrentModuleDescriptionWrapper,
+                                            ArchivedModuleDescriptionWrapper,
+                                            publish_module_description)
+
+
+class TestModuleDescriptionWrappers(ModuleDescriptionTestCase):
+    """
+    Test case for the module description wrappers
+    """
+    def setUp(self):
+        super(TestModuleDescriptionWrappers, self).setUp()
+        self.description = self.create_description()
+
+    def test_data_with_labels(self):
+        """
+        Test that the answers are keyed by the field labels
+        """
+        wrapper = CurrentModuleDescriptionWrapper(self.module)
+        self.assertEquals(wrapper.get_data_with_labels(), {
+            "Aims": "Learn things",
+            "Syllabus": "Docker, Python",
+            "Exam": True
+        })
+
+    def test_form_initial(self):
+        """
+        Test that the form is filled in with the answers
+        """
+        form = ArchivedModuleDescriptionWrapper(self.description.pk).get_form()
+        self.assertEquals(form.initial, {
+            "field_entity_{}".format(self.fields[0].pk): "Learn things",
+            "field_entity_{}".format(self.fields[1].pk): "Docker, Python",
+            "field_entity_{}".format(self.fields[2].pk): True
+        })
+
+    def test_query_count_is_constant(self):
+        """
+        Test that the number of queries does not depend on the fields
+        """
+        # warm the form schema cache
+        CurrentModuleDescriptionWrapper(self.module).get_form()
+
+        with self.assertNumQueries(2):
+            wrapper = CurrentModuleDescriptionWrapper(self.module)
+            wrapper.get_data_with_labels()
+            wrapper.get_form()
+
+        with self.assertNumQueries(2):
+            wrapper = ArchivedModuleDescriptionWrapper(self.description.pk)
+            wrapper.get_data_with_labels()
+            wrapper.get_form()
+
+        description = ModuleDescription.objects.select_related(
+            'form_version').get(pk=self.description.pk)
+        with self.assertNumQueries(1):
+            wrapper = ModuleDescriptionWrapper(description)
+            wrapper.get_data_with_labels()
+            wrapper.get_form()
+
+
+class TestPublishModuleDescription(ModuleDescriptionTestCase):
+    """
+    Test case for publishing a module description
+    """
+    def test_publish(self):
+        """
+        Test that the description, its entries and the timeline
+        entry are created
+        """
+        md = publish_module_description(
+            self.module, self.version, self.form_answers(), self.user
+        )
+        self.assertEquals(
+            CurrentModuleDescriptionWrapper(self.module).get_data_with_labels(),
+            {"Aims": "Learn things", "Syllabus": "Docker, Python", "Exam": True}
+        )
+        self.assertEquals(
+            TimelineEntry.objects.filter(object_id=md.pk).count(), 1
+        )
+
+    def test_query_count_is_constant(self):
+        """
+        Test that the number of writes does not depend on the fields
+        """
+        # including the savepoint around writing the new answers and the
+        # search rows kept by rowid
+        with self.assertNumQueries(20):
+            publish_module_description(
+                self.module, self.version, self.form_answers(), self.user
+            )
+
+    def test_unknown_field_writes_nothing(self):
+        """
+        Test that nothing is written when a field is not in the version
+        """
+        answers = self.form_answers()
+        answers["field_entity_999"] = "Unknown"
+        with self.assertRaises(FormFieldEntity.DoesNotExist):
+            publish_module_description(
+                self.module, self.version, answers, self.user
+            )
+        self.assertFalse(ModuleDescription.objects.exists())
+        self.assertFalse(ModuleDescriptionEntry.objects.exists())
+
+    def test_current_pointer(self):
+        """
+        Test that the module points at the newest published description
+        """
+        first = publish_module_description(
+            self.module, self.version, self.form_answers(), self.user
+        )
+        second = publish_module_description(
+            self.module, self.version, self.form_answers(), self.user
+        )
+        self.assertEquals(
+            CurrentModuleDescription.objects.get_current(self.module), second
+        )
+        self.assertNotEquals(first, second)
+
+    def test_read_from_snapshot(self):
+        """
+        Test that a published description is read with a single query
+        """
+        publish_module_description(
+            self.module, self.version, self.form_answers(), self.user
+        )
+        with self.assertNumQueries(1):
+            wrapper = CurrentModuleDescriptionWrapper(self.module)
+            data = wrapper.get_data_with_labels()
+        self.assertEquals(
+            data,
+            {"Aims": "Learn things", "Syllabus": "Docker, Python", "Exam": True}
+        )
+
+
+
+class TestModuleDescriptionAnswers(ModuleDescriptionTestCase):
+    """
+    Test case for the shared answer rows of module description entries
+    """
+    def test_only_changed_answers_are_written(self):
+        """
+        Test that republishing only adds rows for the changed answers
+        """
+        publish_module_description(
+            self.module, self.version, self.form_answers(), self.user
+        )
+        answers = self.form_answers()
+        answers["field_entity_{}".format(self.fields[0].pk)] = "New aims"
+        md = publish_module_description(
+            self.module, self.version, answers, self.user
+        )
+        self.assertEquals(ModuleDescriptionAnswer.objects.count(), 4)
+        self.assertEquals(ModuleDescriptionEntry.objects.count(), 6)
+        self.assertEquals(
+            ModuleDescriptionEntry.objects.get_answer_map(md)[self.fields[0].pk].value,
+            "New aims"
+        )
+
+    def test_entries_resolve_values(self):
+        """
+        Test that the values of an entry are read from its answer
+        """
+        description = self.create_description()
+        self.create_description()
+        self.assertEquals(ModuleDescriptionAnswer.objects.count(), 3)
+        entry = description.moduledescriptionentry_set.get(field_id=self.fields[2])
+        self.assertEquals(entry.boolean_entry, True)
+        self.assertIsNone(entry.integer_entry)
+
+    def test_values_of_different_types(self):
+        """
+        Test that equal values of different types are kept apart
+        """
+        ModuleDescriptionAnswer.objects.get_answer({'boolean_entry': True})
+        ModuleDescriptionAnswer.objects.get_answer({'integer_entry': 1})
+        self.assertEquals(ModuleDescriptionAnswer.objects.count(), 2)
+
+    def test_answer_written_by_another_publish(self):
+        """
+        Test that an answer written by another publish after the answers
+        were read is shared instead of failing the publish
+        """
+        manager = ModuleDescriptionAnswer.objects
+        existing = manager.get_answer({'string_entry': 'Learn things'})
+        read_answer_ids = manager.read_answer_ids
+        reads = []
+
+        def read_before_other_publish(hashes):
+            reads.append(hashes)
+            return {} if len(reads) == 1 else read_answer_ids(hashes)
+
+        with mock.patch.object(manager, 'read_answer_ids', read_before_other_publish):
+            answer_ids = manager.get_answer_ids([
+                {'string_entry': 'Learn things'}, {'string_entry': 'New aims'}
+            ])
+        self.assertEquals(
+            answer_ids[answer_hash({'string_entry': 'Learn things'})], existing.pk
+        )
+        self.assertEquals(
+            set(answer_ids.values()), set(manager.values_list('pk', flat=True))
+        )
+        self.assertEquals(manager.count(), 2)
+
+    def test_answers_are_looked_up_in_chunks(self):
+        """
+        Test that the answers are looked up a chunk of hashes at a time
+        """
+        values = [{'integer_entry': number} for number in range(5)]
+        ModuleDescriptionAnswer.objects.get_answer_ids(values[:3])
+        with mock.patch.object(entry_module, 'ANSWER_LOOKUP_CHUNK_SIZE', 2):
+            # three lookups, the insert in its savepoint and reading it back
+            with self.assertNumQueries(3 + 3 + 1):
+                answer_ids = ModuleDescriptionAnswer.objects.get_answer_ids(values)
+        self.assertEquals(len(answer_ids), 5)
+        self.assertEquals(ModuleDescriptionAnswer.objects.count(), 5)
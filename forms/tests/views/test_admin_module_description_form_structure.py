@@ -0,0 +1,94 @@
+from django.test import TestCase
+from django.urls import reverse
+from core.models import User
+from forms.models import (ModuleDescriptionFormVersion, FormFieldEntity,
+                          FormFieldDefinition)
+from forms.utils.form_schema import form_schema_cache
+
+
+class TestAdminModuleDescriptionFormModify(TestCase):
+    """
+    Test case for saving the structure of the module description form
+    """
+    def setUp(self):
+        form_schema_cache.clear()
+        User.objects.create_user(
+            username='admin1',
+            first_name='admin',
+            last_name='admin',
+            email='admin@example.com',
+            password='password'
+        )
+        self.client.login(username='admin1', password='password')
+        session = self.client.session
+        session['username'] = 'admin1'
+        session.save()
+        self.url = reverse('change_module_description_structure')
+
+    def tearDown(self):
+        form_schema_cache.clear()
+
+    def post_fields(self, labels):
+        data = {
+            'structure_form-TOTAL_FORMS': len(labels),
+            'structure_form-INITIAL_FORMS': 0,
+            'structure_form-MIN_NUM_FORMS': 0,
+            'structure_form-MAX_NUM_FORMS': 1000,
+        }
+        for order, label in enumerate(labels):
+            prefix = 'structure_form-{}-'.format(order)
+            data.update({
+                prefix + 'entity_order': order,
+                prefix + 'entity_required': 'on',
+                prefix + 'entity_label': label,
+                prefix + 'entity_type': 'text-input',
+                prefix + 'entity_choices': '',
+                prefix + 'entity_max_length': 500,
+                prefix + 'entity_description': '',
+                prefix + 'entity_placeholder': '',
+            })
+        return self.client.post(self.url, data)
+
+    def test_fields_are_saved(self):
+        """
+        Test that a new version is created with the posted fields
+        """
+        response = self.post_fields(["Aims", "Syllabus"])
+        self.assertEquals(response.status_code, 302)
+        version = ModuleDescriptionFormVersion.objects.get()
+        self.assertEquals(
+            [field.entity_label for field in FormFieldEntity.objects.get_form(version.pk)],
+            ["Aims", "Syllabus"]
+        )
+
+    def test_definitions_are_shared(self):
+        """
+        Test that a new version only adds definitions for new fields
+        """
+        self.post_fields(["Aims", "Syllabus"])
+        self.post_fields(["Aims", "Syllabus", "Exam"])
+        self.assertEquals(ModuleDescriptionFormVersion.objects.count(), 2)
+        self.assertEquals(FormFieldEntity.objects.count(), 5)
+        self.assertEquals(FormFieldDefinition.objects.count(), 3)
+
+    def test_query_count_is_constant(self):
+        """
+        Test that the number of writes does not depend on the fields
+        """
+        self.post_fields(["Aims"])
+        with self.assertNumQueries(9):
+            self.post_fields(["Aims", "Syllabus", "Exam", "Outcomes"])
+
+    def test_structure_pages(self):
+        """
+        Test that the saved fields are shown when viewing and editing
+        """
+        self.post_fields(["Aims", "Syllabus"])
+        version = ModuleDescriptionFormVersion.objects.get()
+        for url in (reverse('module_description_form_structure'),
+                    reverse('old_module_description_form_structure',
+                            kwargs={'pk': version.pk}),
+                    self.url):
+            response = self.client.get(url)
+            self.assertEquals(response.status_code, 200)
+            self.assertContains(response, "Syllabus")
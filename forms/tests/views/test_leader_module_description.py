@@ -0,0 +1,112 @@
+import json
+from django.core.cache import cache
+from django.urls import reverse
+
+from forms.models import ModuleDescription, FormFieldDefinition
+from forms.tests.common import ModuleDescriptionTestCase
+from forms.utils.module_description import publish_module_description
+
+
+class TestModuleDescriptionPages(ModuleDescriptionTestCase):
+    """
+    Test case for the cached rendering of the read-only module
+    description pages
+    """
+    def setUp(self):
+        super(TestModuleDescriptionPages, self).setUp()
+        cache.clear()
+        self.client.login(username='user1', password='password')
+        session = self.client.session
+        session['username'] = 'user1'
+        session.save()
+        self.description = self.publish()
+
+    def tearDown(self):
+        cache.clear()
+        super(TestModuleDescriptionPages, self).tearDown()
+
+    def publish(self, aims="Learn things"):
+        answers = self.form_answers()
+        answers["field_entity_{}".format(self.fields[0].pk)] = aims
+        return publish_module_description(
+            self.module, self.version, answers, self.user
+        )
+
+    def change_snapshot(self, description, aims):
+        """
+        Changes the answers behind the back of the cache, so the page
+        only shows them if it is rendered again
+        """
+        answers = json.loads(description.answers)
+        answers[0][3] = aims
+        ModuleDescription.objects.filter(pk=description.pk).update(
+            answers=json.dumps(answers)
+        )
+
+    def view(self):
+        return self.client.get(reverse('view_module_description', args=['CM3301']))
+
+    def view_archived(self, description):
+        return self.client.get(reverse(
+            'view_archive_module_description', args=['CM3301', description.pk]
+        ))
+
+    def test_current_is_cached(self):
+        """
+        Test that the current description is rendered once
+        """
+        self.assertContains(self.view(), 'value="Learn things"')
+        self.change_snapshot(self.description, "Changed")
+        response = self.view()
+        self.assertContains(response, 'value="Learn things"')
+        self.assertIsNone(response.context['form'])
+
+    def test_publish_invalidates(self):
+        """
+        Test that a newly published description is shown
+        """
+        self.view()
+        self.publish(aims="Learn more things")
+        self.assertContains(self.view(), 'value="Learn more things"')
+
+    def test_edit_mode_is_not_cached(self):
+        """
+        Test that the form being edited is built from the description
+        """
+        self.view()
+        self.change_snapshot(self.description, "Changed")
+        response = self.client.get(
+            reverse('update_module_description', args=['CM3301'])
+        )
+        self.assertContains(response, 'value="Changed"')
+
+    def test_archived_is_cached(self):
+        """
+        Test that an archived description is rendered once, and is not
+        confused with the current description
+        """
+        self.publish(aims="Learn more things")
+        self.assertContains(self.view_archived(self.description), 'value="Learn things"')
+        self.change_snapshot(self.description, "Changed")
+        self.assertContains(self.view_archived(self.description), 'value="Learn things"')
+        self.assertContains(self.view(), 'value="Learn more things"')
+
+    def test_missing_archived(self):
+        """
+        Test that an archived description which does not exist shows
+        an empty form
+        """
+        response = self.client.get(reverse(
+            'view_archive_module_description', args=['CM3301', 999]
+        ))
+        self.assertFalse(response.context['form_exists'])
+
+    def test_definition_edit_clears(self):
+        """
+        Test that editing a field definition renders the descriptions again
+        """
+        self.view()
+        definition = FormFieldDefinition.objects.get(entity_label="Aims")
+        definition.entity_label = "Goals"
+        definition.save()
+        self.assertContains(self.view(), 'Goals')
@@ -0,0 +1,250 @@
+from django.db import connection
+from django.forms import modelformset_factory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.tests.common_test_utils import LoggedInTestCase, ModuleTestCase
+from forms.forms import (ModuleChangeSummaryForm, ModuleTeachingHoursForm,
+                         ModuleSupportForm, ModuleAssessmentsForm,
+                         ModuleReassessmentForm, ModuleSoftwareForm)
+from forms.models.tracking_form import (ModuleChangeSummary, ModuleTeaching,
+                                        ModuleSupport, ModuleAssessment,
+                                        ModuleReassessment, ModuleSoftware)
+from timeline.models import TimelineEntry
+
+CURRENT = {'current_flag': True, 'staging_flag': False, 'archive_flag': False}
+
+
+def form_data(form, data):
+    """
+    Adds the values a form would be posted with to the data
+    """
+    for field in form:
+        value = field.value()
+        if value is None or value is False:
+            continue
+        data[field.html_name] = 'on' if value is True else value
+    return data
+
+
+class TestLeaderModuleTrackingFormSubmit(LoggedInTestCase, ModuleTestCase):
+    """
+    Test case for submitting the tracking form of a module
+    """
+    def setUp(self):
+        super(TestLeaderModuleTrackingFormSubmit, self).setUp()
+        self.client.login(username='user1', password='password')
+        session = self.client.session
+        session['username'] = 'user1'
+        session.save()
+        self.url = reverse('new_module_tracking_form', args=[self.module.pk])
+
+        ModuleChangeSummary.objects.create(module=self.module, **CURRENT)
+        ModuleTeaching.objects.create(module=self.module, **dict(CURRENT, **{
+            "teaching_lectures": 10,
+            "teaching_tutorials": 5,
+            "teaching_online": 0,
+            "teaching_practical_workshops": 0,
+            "teaching_supervised_time": 0,
+            "teaching_fieldworks": 0,
+            "teaching_external_visits": 0,
+            "teaching_schedule_assessment": 0,
+            "teaching_placement": 0,
+        }))
+        ModuleSupport.objects.create(module=self.module, **CURRENT)
+        ModuleReassessment.objects.create(module=self.module, **CURRENT)
+        ModuleSoftware.objects.create(
+            module=self.module, software_name="Python", **CURRENT
+        )
+
+    def create_assessments(self, count):
+        return [
+            ModuleAssessment.objects.create(module=self.module, **dict(CURRENT, **{
+                "assessment_title": "Assessment {}".format(number),
+                "assessment_type": "Exam",
+                "assessment_weight": 50,
+                "assessment_duration": 2,
+                "assessment_hand_out": "1A",
+                "assessment_hand_in": "2A",
+                "learning_outcomes_covered": "All",
+            }))
+            for number in range(count)
+        ]
+
+    def post_data(self, lectures=10, titles=None, removed=(), new=()):
+        """
+        Returns the post data of the current tracking form, with the
+        given changes made. Each title in new adds an assessment, copied
+        from the first one.
+        """
+        def current(model):
+            return model.objects.filter(module=self.module, current_flag=True)
+
+        data = {}
+        teaching = current(ModuleTeaching).get()
+        teaching.teaching_lectures = lectures
+        form_data(ModuleChangeSummaryForm(instance=current(ModuleChangeSummary).get()), data)
+        form_data(ModuleTeachingHoursForm(instance=teaching), data)
+        form_data(ModuleSupportForm(instance=current(ModuleSupport).get()), data)
+        form_data(ModuleReassessmentForm(instance=current(ModuleReassessment).get()), data)
+
+        assessments = current(ModuleAssessment).exclude(pk__in=removed)
+        formsets = (
+            (ModuleAssessment, ModuleAssessmentsForm, 'assessment_form', assessments),
+            (ModuleSoftware, ModuleSoftwareForm, 'software_form', current(ModuleSoftware)),
+        )
+        for model, form, prefix, queryset in formsets:
+            formset = modelformset_factory(model, form=form, extra=0)(
+                prefix=prefix, queryset=queryset
+            )
+            form_data(formset.management_form, data)
+            for row in formset:
+                if titles and row.instance.pk in titles:
+                    row.initial['assessment_title'] = titles[row.instance.pk]
+                form_data(row, data)
+
+        total = int(data['assessment_form-TOTAL_FORMS'])
+        for number, title in enumerate(new, total):
+            for key, value in list(data.items()):
+                if key.startswith('assessment_form-0-') and not key.endswith('-assessment_id'):
+                    data[key.replace('-0-', '-{}-'.format(number), 1)] = value
+            data['assessment_form-{}-assessment_title'.format(number)] = title
+        data['assessment_form-TOTAL_FORMS'] = total + len(new)
+        return data
+
+    def test_submit(self):
+        """
+        Test that the submitted rows are staged as the next copy, with
+        archived copies and timeline entries for the changes
+        """
+        edited, kept, removed = self.create_assessments(3)
+        response = self.client.post(self.url, self.post_data(
+            lectures=12,
+            titles={edited.pk: "Coursework"},
+            removed=[removed.pk]
+        ))
+        self.assertEquals(response.status_code, 302)
+
+        for model in (ModuleChangeSummary, ModuleTeaching, ModuleSupport,
+                      ModuleReassessment, ModuleSoftware):
+            staged = model.objects.get(module=self.module, staging_flag=True)
+            self.assertEquals((staged.current_flag, staged.copy_number), (False, 2))
+        self.assertEquals(
+            set(ModuleAssessment.objects.filter(
+                module=self.module, staging_flag=True
+            ).values_list('assessment_title', 'copy_number')),
+            {("Coursework", 2), ("Assessment 1", 2)}
+        )
+        self.assertFalse(ModuleAssessment.objects.filter(pk=removed.pk).exists())
+        self.assertEquals(
+            ModuleTeaching.objects.get(module=self.module, staging_flag=True).teaching_lectures,
+            12
+        )
+
+        # an archived copy of each submitted row, as it was
+        archived = ModuleAssessment.objects.filter(archive_flag=True, version_number=2)
+        self.assertEquals(
+            set(archived.values_list('assessment_title', flat=True)),
+            {"Assessment 0", "Assessment 1"}
+        )
+        self.assertEquals(
+            ModuleTeaching.objects.get(archive_flag=True).teaching_lectures, 10
+        )
+
+        parent = TimelineEntry.objects.get(parent_entry=None)
+        children = TimelineEntry.objects.filter(parent_entry=parent).order_by('pk')
+        self.assertEquals(
+            [(child.title, child.changes) for child in children],
+            [("Module Teaching", "* teaching lectures: 10 -> 12\n"),
+             ("Assessment Coursework", "* assessment title: Assessment 0 -> Coursework\n")]
+        )
+        self.assertEquals(
+            ModuleAssessment.objects.get(pk=children[1].revert_object_id).assessment_title,
+            "Assessment 0"
+        )
+
+    def test_submit_queries(self):
+        """
+        Test that the unchanged assessments of a submission do not add
+        to its writes, or to its reads beyond the formset looking up
+        each submitted row
+        """
+        def count_queries(assessments):
+            ModuleAssessment.objects.all().delete()
+            self.create_assessments(assessments)
+            data = self.post_data(lectures=11 + assessments)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(self.url, data)
+            for model in (ModuleChangeSummary, ModuleTeaching, ModuleSupport,
+                          ModuleReassessment, ModuleSoftware, ModuleAssessment):
+                model.objects.filter(module=self.module, staging_flag=True).update(
+                    staging_flag=False, current_flag=True
+                )
+            selects = [
+                query for query in queries.captured_queries
+                if query['sql'].startswith('SELECT')
+            ]
+            return len(selects) - assessments, len(queries) - len(selects)
+
+        self.assertEquals(count_queries(2), count_queries(6))
+
+    def test_new_assessments(self):
+        """
+        Test that new assessments are created in staging, with
+        timeline entries for them
+        """
+        self.create_assessments(1)
+        response = self.client.post(self.url, self.post_data(new=["Lab", "Essay"]))
+        self.assertEquals(response.status_code, 302)
+        self.assertEquals(
+            set(ModuleAssessment.objects.filter(
+                module=self.module, staging_flag=True
+            ).values_list('assessment_title', flat=True)),
+            {"Assessment 0", "Lab", "Essay"}
+        )
+        self.assertFalse(
+            ModuleAssessment.objects.filter(created=None).exists()
+        )
+        parent = TimelineEntry.objects.get(parent_entry=None)
+        self.assertEquals(
+            set(TimelineEntry.objects.filter(parent_entry=parent).values_list(
+                'title', flat=True
+            )),
+            {"Assessment Lab", "Assessment Essay"}
+        )
+
+    def test_new_assessment_writes(self):
+        """
+        Test that the number of writes does not depend on the number
+        of new assessments
+        """
+        def count_writes(titles):
+            ModuleAssessment.objects.all().delete()
+            TimelineEntry.objects.all().delete()
+            self.create_assessments(1)
+            data = self.post_data(new=titles)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(self.url, data)
+            for model in (ModuleChangeSummary, ModuleTeaching, ModuleSupport,
+                          ModuleReassessment, ModuleSoftware):
+                model.objects.filter(module=self.module, staging_flag=True).update(
+                    staging_flag=False, current_flag=True
+                )
+            return len([
+                query for query in queries.captured_queries
+                if not query['sql'].startswith('SELECT')
+            ])
+
+        self.assertEquals(count_writes(["Lab"]), count_writes(["Lab", "Essay", "Quiz"]))
+
+    def test_invalid_submission(self):
+        """
+        Test that nothing is written when the form is not valid
+        """
+        self.create_assessments(1)
+        data = self.post_data()
+        data['teaching_lectures'] = 'many'
+        response = self.client.post(self.url, data)
+        self.assertEquals(response.status_code, 200)
+        self.assertFalse(ModuleTeaching.objects.filter(staging_flag=True).exists())
+        self.assertFalse(TimelineEntry.objects.exists())
@@ -0,0 +1,96 @@
+import time
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+"""
+Cache of the rendered read-only module description forms. Building the
+dynamic form and rendering its widgets is the slow part of viewing a
+description, and the html only depends on the description's answers and
+its form version. Archived descriptions never change, so they are kept
+by their id. The current description of a module is kept by the module,
+along with the description and form version it was rendered from, and
+is only used while the module still points at that description, so a
+newly published description replaces it without anything being dropped.
+The cache is shared by every process through the database cache set in
+the settings.
+
+Every key holds a generation, which is moved on when the fields of a
+form are edited, so the html rendered from the old fields is not used.
+"""
+
+DESCRIPTION_CACHE_PREFIX = 'module_description_form'
+DESCRIPTION_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+DESCRIPTION_FIELDS_TEMPLATE = 'module_description_fields.html'
+
+GENERATION_KEY = DESCRIPTION_CACHE_PREFIX + ':generation'
+
+
+def cache_generation():
+    """
+    Returns the current generation, starting from the time so a
+    generation is never reused if the key is evicted
+    """
+    return cache.get_or_set(
+        GENERATION_KEY, lambda: int(time.time() * 1000), None
+    )
+
+
+def archived_key(description_id):
+    return '{}:{}:archived:{}'.format(
+        DESCRIPTION_CACHE_PREFIX, cache_generation(), description_id
+    )
+
+
+def current_key(module_code):
+    return '{}:{}:current:{}'.format(
+        DESCRIPTION_CACHE_PREFIX, cache_generation(), module_code
+    )
+
+
+def render_fields(form):
+    """
+    Renders the fields of a module description form
+    """
+    return render_to_string(DESCRIPTION_FIELDS_TEMPLATE, {'form': form})
+
+
+def get_archived_html(description_id, build_form):
+    """
+    Returns the rendered form of an archived description, calling
+    build_form to build the form only when it is not cached
+    """
+    key = archived_key(description_id)
+    html = cache.get(key)
+    if html is None:
+        html = render_fields(build_form())
+        cache.set(key, html, DESCRIPTION_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+def get_current_html(module_code, description_id, form_version_id, build_form):
+    """
+    Returns the rendered form of the current description of a module.
+    The cached html is only used if it was rendered from the description
+    and form version the module points at.
+    """
+    key = current_key(module_code)
+    cached = cache.get(key)
+    if cached is not None and cached[:2] == (description_id, form_version_id):
+        return mark_safe(cached[2])
+    html = render_fields(build_form())
+    cache.set(
+        key, (description_id, form_version_id, html), DESCRIPTION_CACHE_TIMEOUT
+    )
+    return mark_safe(html)
+
+
+def clear_description_cache():
+    """
+    Moves on the generation, so every rendered description is rendered again
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # there is no generation yet, so nothing has been cached with one
+        pass
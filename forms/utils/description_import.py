@@ -0,0 +1,303 @@
+import csv
+import json
+from collections import namedtuple
+from django.db import transaction
+from django.db.models import Max
+
+from core.models import Module
+from forms.models import (ModuleDescription, ModuleDescriptionEntry,
+                          CurrentModuleDescription, FormFieldEntity)
+from forms.forms import ModuleDescriptionForm
+from forms.utils.description_search import index_descriptions
+from forms.utils.form_schema import get_form_schema
+from forms.utils.module_description import FIELD_PREFIX
+from timeline.models import TimelineEntry
+from timeline.utils.timeline.factory import EntryFactory
+from dataGeneration.utils.snapshots import refresh_module_snapshots
+
+"""
+Bulk import of module descriptions from CSV or JSON. Each record has a
+module code and an answer for each field, keyed by the field's label in
+the chosen form version. Every record is validated with the form the
+leaders fill in, and the valid records are written a batch at a time,
+with a fixed number of queries for each batch. Records which fail are
+reported and skipped, and the rest of their batch is still imported.
+"""
+
+IMPORT_BATCH_SIZE = 200
+MODULE_CODE_COLUMN = 'Module Code'
+
+# strings which are read as an answer to a check box
+TRUE_VALUES = ('true', 'yes', 'y', '1')
+FALSE_VALUES = ('false', 'no', 'n', '0', '')
+
+# a record which could not be imported, row is the line of a csv file
+# or the position in a json list
+RowError = namedtuple('RowError', ['row', 'module_code', 'message'])
+
+
+def read_records(stream, file_format):
+    """
+    Generator of the (row, record) of a CSV or JSON file, where each
+    record is a dict of column to value
+    """
+    if file_format == 'csv':
+        # the header is the first line
+        for row, record in enumerate(csv.DictReader(stream), start=2):
+            yield row, record
+    elif file_format == 'json':
+        records = json.load(stream)
+        if not isinstance(records, list):
+            raise ValueError("The JSON file must hold a list of records")
+        for row, record in enumerate(records, start=1):
+            yield row, record
+    else:
+        raise ValueError("Unknown format {}".format(file_format))
+
+
+class DescriptionWriter(object):
+    """
+    Writes new current descriptions of a form version for many modules
+    at once, with a fixed number of queries however many there are.
+
+    Arguments:
+        form_version    ModuleDescriptionFormVersion the answers are for
+        user            User the timeline entries are made by
+    """
+    def __init__(self, form_version, user=None):
+        self.form_version = form_version
+        self.user = user
+        self.schema = get_form_schema(form_version.pk)
+
+    def write(self, records):
+        """
+        Writes the descriptions in one transaction, along with their
+        entries, current pointers, timeline entries and search index rows.
+        The report snapshots of the modules are refreshed afterwards.
+
+        Arguments:
+            records     List of (Module, answers), where the answers are a
+                        dict of form field name (field_entity_<id>) to answer
+                        and each module appears once
+
+        Return:
+            list of the new ModuleDescriptions in the order of the records
+        """
+        module_codes = [module.pk for module, _ in records]
+        with transaction.atomic():
+            previous = {
+                current.module_id: current.description
+                for current in CurrentModuleDescription.objects.filter(
+                    module__in=module_codes
+                ).select_related('description')
+            }
+            descriptions = self.create_descriptions(records)
+
+            CurrentModuleDescription.objects.filter(module__in=module_codes).delete()
+            CurrentModuleDescription.objects.bulk_create([
+                CurrentModuleDescription(module_id=md.module_id, description_id=md.pk)
+                for md in descriptions
+            ])
+
+            ModuleDescriptionEntry.objects.bulk_create_many([
+                (md, FormFieldEntity(pk=field_id), value)
+                for md, (_, answers) in zip(descriptions, records)
+                for field_id, value in self.answer_items(answers)
+            ])
+
+            TimelineEntry.objects.bulk_create([
+                self.build_timeline_entry(md, previous.get(md.module_id))
+                for md in descriptions
+            ])
+            index_descriptions(descriptions)
+        refresh_module_snapshots(Module.objects.filter(pk__in=module_codes))
+        return descriptions
+
+    def answer_items(self, answers):
+        """
+        Returns the (field id, value) of the cleaned answers, in form order
+        """
+        return [
+            (field.entity_id, answers[FIELD_PREFIX + str(field.entity_id)])
+            for field in self.schema
+            if FIELD_PREFIX + str(field.entity_id) in answers
+        ]
+
+    def create_descriptions(self, records):
+        """
+        Creates the descriptions with their answers snapshots. bulk_create
+        does not set the ids on every database, so they are read back as
+        the newest description of each module.
+
+        Return:
+            list of the descriptions in the order of the records
+        """
+        fields = {field.entity_id: field for field in self.schema}
+        descriptions = []
+        for module, answers in records:
+            snapshot = [
+                (field_id, fields[field_id].entity_label,
+                 fields[field_id].entity_type, value)
+                for field_id, value in self.answer_items(answers)
+                if ModuleDescriptionEntry.objects.get_entry_fields(value) is not None
+            ]
+            descriptions.append(ModuleDescription(
+                module=module,
+                form_version=self.form_version,
+                answers=json.dumps(snapshot)
+            ))
+        ModuleDescription.objects.bulk_create(descriptions)
+
+        ids = dict(ModuleDescription.objects.filter(
+            module__in=[module.pk for module, _ in records]
+        ).values('module').annotate(newest=Max('pk')).values_list(
+            'module', 'newest'
+        ))
+        for description in descriptions:
+            description.pk = ids[description.module_id]
+        return descriptions
+
+    def build_timeline_entry(self, description, previous):
+        """
+        Builds the timeline entry of a description, comparing it against
+        the description it replaces
+        """
+        entry = EntryFactory.makeEntry('Module_Description', description)
+        entry.changes = description.diff_answers(previous)
+        return entry.build_entry(
+            status='Confirmed',
+            requested_by=self.user,
+            entry_type='Module-Description'
+        )
+
+
+class DescriptionImporter(object):
+    """
+    Imports module descriptions for a form version.
+
+    Arguments:
+        form_version    ModuleDescriptionFormVersion the answers are for
+        user            User the timeline entries are made by
+        batch_size      Number of records written in each transaction
+        module_column   Column holding the module code
+    """
+    def __init__(self, form_version, user=None, batch_size=IMPORT_BATCH_SIZE,
+                 module_column=MODULE_CODE_COLUMN):
+        self.form_version = form_version
+        self.batch_size = batch_size
+        self.module_column = module_column
+        self.writer = DescriptionWriter(form_version, user)
+        self.fields_by_label = {
+            field.entity_label: field for field in self.writer.schema
+        }
+
+        self.imported = 0
+        self.errors = []
+        self.unknown_columns = set()
+        self.seen_modules = set()
+
+    def run(self, records):
+        """
+        Imports the records, a batch at a time
+
+        Arguments:
+            records     Iterable of (row, record) as given by read_records
+        """
+        batch = []
+        for row, record in records:
+            cleaned = self.clean(row, record)
+            if cleaned is not None:
+                batch.append(cleaned)
+            if len(batch) == self.batch_size:
+                self.write_batch(batch)
+                batch = []
+        if batch:
+            self.write_batch(batch)
+        # unknown modules are only found when their batch is written
+        self.errors.sort(key=lambda error: error.row)
+        return self
+
+    def clean(self, row, record):
+        """
+        Validates a record with the module description form.
+
+        Return:
+            tuple of (row, module code, answers) where the answers are the
+            cleaned form data, or None if the record is not valid
+        """
+        if not isinstance(record, dict):
+            self.errors.append(RowError(row, '', "Record is not an object"))
+            return None
+        module_code = str(record.get(self.module_column) or '').strip()
+        if not module_code:
+            self.errors.append(RowError(
+                row, '', "Missing {}".format(self.module_column)
+            ))
+            return None
+        if module_code in self.seen_modules:
+            self.errors.append(RowError(
+                row, module_code, "Module appears more than once"
+            ))
+            return None
+
+        data = {'form_version': self.form_version.pk}
+        for column, value in record.items():
+            if column == self.module_column:
+                continue
+            field = self.fields_by_label.get(column)
+            if field is None:
+                self.unknown_columns.add(column)
+                continue
+            name = FIELD_PREFIX + str(field.entity_id)
+            if field.entity_type == "check-box":
+                value = self.clean_boolean(value)
+                if value is None:
+                    self.errors.append(RowError(
+                        row, module_code, "{}: not a yes or no answer".format(column)
+                    ))
+                    return None
+                if value:
+                    data[name] = 'on'
+            elif value is not None:
+                data[name] = str(value)
+
+        form = ModuleDescriptionForm(data, md_version=self.form_version.pk)
+        if not form.is_valid():
+            for name, messages in form.errors.items():
+                label = form.fields[name].label if name in form.fields else name
+                self.errors.append(RowError(
+                    row, module_code, "{}: {}".format(label, ' '.join(messages))
+                ))
+            return None
+        self.seen_modules.add(module_code)
+        answers = dict(form.cleaned_data)
+        del answers['form_version']
+        return row, module_code, answers
+
+    def clean_boolean(self, value):
+        """
+        Returns the answer to a check box, or None if it is not one
+        """
+        if isinstance(value, bool):
+            return value
+        value = str(value if value is not None else '').strip().lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        return None
+
+    def write_batch(self, batch):
+        """
+        Writes the descriptions of a batch of cleaned records in one
+        transaction. Records for modules which do not exist are reported.
+        """
+        modules = Module.objects.in_bulk([module_code for _, module_code, _ in batch])
+        records = []
+        for row, module_code, answers in batch:
+            if module_code in modules:
+                records.append((modules[module_code], answers))
+            else:
+                self.errors.append(RowError(row, module_code, "Unknown module"))
+        if records:
+            self.imported += len(self.writer.write(records))
@@ -0,0 +1,221 @@
+from collections import Counter
+from django.db import transaction
+
+from forms.models import CurrentModuleDescription
+from forms.utils.description_import import DescriptionWriter
+from forms.utils.form_schema import get_form_schema
+from forms.utils.module_description import FIELD_PREFIX
+
+"""
+Migration of the current module descriptions to a newer form version.
+The answers of each field are carried over to the field of the new
+version with the same label, or to the field given by an explicit
+mapping of labels. Modules are migrated a chunk at a time, and each
+chunk is read and written in one transaction, with a fixed number of
+queries however many modules are in it.
+"""
+
+MIGRATION_CHUNK_SIZE = 200
+
+TEXT_TYPES = ("text-input", "text-area")
+CHOICE_TYPES = ("multi-choice", "radio-buttons")
+
+
+class MigrationError(Exception):
+    """
+    Raised when a mapping names a field which is not in the form versions,
+    or moves the answers of two fields to the same field
+    """
+    pass
+
+
+def field_mapping(source_schema, target_schema, mapping=None,
+                  source_labels=None):
+    """
+    Maps the fields of a form version to the fields of another.
+
+    Arguments:
+        source_schema   FieldSpecs of the version the answers are for
+        target_schema   FieldSpecs of the version they are moved to
+        mapping         Optional dict of source label to target label,
+                        which overrides the fields matched by label. A
+                        target label of None drops the source field.
+        source_labels   Optional set of the labels the mapping may name,
+                        the labels of source_schema if not given. When
+                        migrating from several versions it holds the
+                        labels of all of them, and a mapped label only
+                        applies to the versions which have it.
+
+    Return:
+        dict of the source field id to the target FieldSpec
+    """
+    mapping = mapping or {}
+    if source_labels is None:
+        source_labels = {field.entity_label for field in source_schema}
+    targets = {field.entity_label: field for field in target_schema}
+    for source_label, target_label in mapping.items():
+        if source_label not in source_labels:
+            raise MigrationError(
+                "{} is not a field of the old form versions".format(source_label)
+            )
+        if target_label is not None and target_label not in targets:
+            raise MigrationError(
+                "{} is not a field of the new form version".format(target_label)
+            )
+
+    fields = {}
+    # source label moved to each target label, to find collisions
+    moved_from = {}
+    for field in source_schema:
+        target_label = mapping.get(field.entity_label, field.entity_label)
+        if target_label not in targets:
+            continue
+        if target_label in moved_from:
+            raise MigrationError(
+                "{} and {} would both be moved to {}".format(
+                    moved_from[target_label], field.entity_label, target_label
+                )
+            )
+        moved_from[target_label] = field.entity_label
+        fields[field.entity_id] = targets[target_label]
+    return fields
+
+
+def convert_answer(value, field):
+    """
+    Checks an answer can be given to a field.
+
+    Return:
+        bool of if the answer is valid for the field
+    """
+    if field.entity_type == "check-box":
+        return isinstance(value, bool)
+    if not isinstance(value, str):
+        return False
+    if field.entity_type in TEXT_TYPES:
+        return len(value) <= field.entity_max_length
+    if field.entity_type in CHOICE_TYPES:
+        return value in {choice for choice, _ in field.choices}
+    return False
+
+
+class DescriptionMigration(object):
+    """
+    Moves the current descriptions of every module on another form
+    version to the target form version.
+
+    Arguments:
+        target_version  ModuleDescriptionFormVersion to move the modules to
+        mapping         Optional dict of source label to target label
+        user            User the timeline entries are made by
+        chunk_size      Number of modules migrated in each transaction
+        dry_run         When True the answers are mapped but nothing is written
+        progress        Optional callable given the number of modules done
+                        and the total after each chunk
+    """
+    def __init__(self, target_version, mapping=None, user=None,
+                 chunk_size=MIGRATION_CHUNK_SIZE, dry_run=False, progress=None):
+        self.target_version = target_version
+        self.mapping = mapping
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.progress = progress
+        self.writer = DescriptionWriter(target_version, user)
+        self.target_schema = self.writer.schema
+        # field mappings of each source version, which are checked upfront
+        self.mappings = {}
+        # labels of every source version, which the mapping is checked against
+        self.source_labels = set()
+
+        self.migrated = 0
+        # labels of the answers which could not be carried over
+        self.dropped = Counter()
+        # labels of the required target fields left without an answer
+        self.unanswered = Counter()
+
+    def pending(self):
+        """
+        The current description pointers which are not on the target version
+        """
+        return CurrentModuleDescription.objects.exclude(
+            description__form_version=self.target_version
+        )
+
+    def source_versions(self):
+        """
+        Returns the ids of the form versions which are migrated from
+        """
+        return self.pending().order_by().values_list(
+            'description__form_version', flat=True
+        ).distinct()
+
+    def run(self):
+        """
+        Migrates every module, a chunk at a time. The field mappings of
+        every source version are built first, so a bad mapping stops the
+        migration before anything is written.
+        """
+        schemas = {
+            version_id: get_form_schema(version_id)
+            for version_id in self.source_versions()
+        }
+        self.source_labels = {
+            field.entity_label
+            for schema in schemas.values() for field in schema
+        }
+        for version_id, schema in schemas.items():
+            self.mappings[version_id] = field_mapping(
+                schema, self.target_schema, self.mapping, self.source_labels
+            )
+        total = self.pending().count()
+
+        last = ''
+        while True:
+            with transaction.atomic():
+                chunk = list(self.pending().filter(
+                    module__gt=last
+                ).order_by('module').select_related(
+                    'module', 'description'
+                )[:self.chunk_size])
+                if not chunk:
+                    break
+                records = [
+                    (current.module, self.map_answers(current.description))
+                    for current in chunk
+                ]
+                if not self.dry_run:
+                    self.writer.write(records)
+            last = chunk[-1].module_id
+            self.migrated += len(chunk)
+            if self.progress is not None:
+                self.progress(self.migrated, total)
+        return self
+
+    def map_answers(self, description):
+        """
+        Returns the answers of a description as answers to the target
+        form version, keyed by form field name
+        """
+        fields = self.mappings.get(description.form_version_id)
+        if fields is None:
+            # a version which was published during the migration
+            schema = get_form_schema(description.form_version_id)
+            self.source_labels.update(field.entity_label for field in schema)
+            fields = field_mapping(
+                schema, self.target_schema, self.mapping, self.source_labels
+            )
+            self.mappings[description.form_version_id] = fields
+
+        answers = {}
+        for field_id, answer in description.get_answer_map().items():
+            field = fields.get(field_id)
+            if field is None or not convert_answer(answer.value, field):
+                self.dropped[answer.label] += 1
+                continue
+            answers[FIELD_PREFIX + str(field.entity_id)] = answer.value
+
+        for field in self.target_schema:
+            if (field.entity_required and field.entity_type != "check-box"
+                    and FIELD_PREFIX + str(field.entity_id) not in answers):
+                self.unanswered[field.entity_label] += 1
+        return answers
@@ -0,0 +1,316 @@
+import re
+from collections import namedtuple
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from forms.models import (ModuleDescription, ModuleDescriptionEntry,
+                          CurrentModuleDescription)
+
+"""
+Full text search over the answers of the current module descriptions.
+On SQLite the answers are held in an FTS5 table, with a row for each
+text answer tagged with its field label and module. A module's rows are
+replaced when a new description is published, so the index only ever
+holds the current descriptions. module_code is not indexed by FTS5, so
+the module of each row is also kept in an indexed table by its rowid,
+which is how a module's rows are found. Other databases have no index,
+and search falls back to a plain match over the current entries.
+"""
+
+SEARCH_TABLE = 'forms_descriptionsearch'
+SEARCH_MODULES_TABLE = 'forms_descriptionsearch_module'
+
+# markers put around the matched terms by FTS5, replaced once escaped
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+SearchResult = namedtuple('SearchResult', [
+    'module_code',
+    'module_name',
+    'label',
+    'snippet',
+])
+
+
+def search_available():
+    """
+    Returns if the database has the full text index
+    """
+    return connection.vendor == 'sqlite'
+
+
+def search_terms(query):
+    """
+    Returns the words of a search query
+    """
+    return re.findall(r'\w+', query)
+
+
+def match_expression(terms):
+    """
+    Returns an FTS5 expression matching every term, with the last term
+    matched as a prefix. The terms are quoted, so the query can not use
+    the FTS5 syntax.
+    """
+    quoted = ['"{}"'.format(term) for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def highlight(snippet):
+    """
+    Escapes a snippet and marks the matched terms
+    """
+    return mark_safe(escape(snippet).replace(
+        HIGHLIGHT_START, '<mark>'
+    ).replace(HIGHLIGHT_END, '</mark>'))
+
+
+def description_rows(description, answer_map=None):
+    """
+    Returns the index rows of the text answers of a description
+    """
+    if answer_map is None:
+        answer_map = description.get_answer_map()
+    return [
+        (answer.value, answer.label, description.module_id,
+         description.pk, field_id)
+        for field_id, answer in answer_map.items()
+        if isinstance(answer.value, str) and answer.value.strip()
+    ]
+
+
+def insert_rows(cursor, rows):
+    """
+    Inserts rows into the index, along with their modules. The rows are
+    given the rowids after the largest one when they are inserted, and
+    any rows another transaction added first already have their modules.
+    """
+    cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM {}".format(SEARCH_TABLE))
+    last_rowid = cursor.fetchone()[0]
+    cursor.executemany(
+        "INSERT INTO {} (answer, label, module_code, description_id, field_id) "
+        "VALUES (%s, %s, %s, %s, %s)".format(SEARCH_TABLE),
+        rows
+    )
+    cursor.execute(
+        "INSERT OR IGNORE INTO {} (rowid, module_code) "
+        "SELECT rowid, module_code FROM {} WHERE rowid > %s".format(
+            SEARCH_MODULES_TABLE, SEARCH_TABLE
+        ),
+        [last_rowid]
+    )
+
+
+def delete_rows(cursor, module_codes):
+    """
+    Removes the indexed rows of the modules, found by their rowids
+    """
+    placeholders = ', '.join(['%s'] * len(module_codes))
+    cursor.execute(
+        "DELETE FROM {} WHERE rowid IN (SELECT rowid FROM {} "
+        "WHERE module_code IN ({}))".format(
+            SEARCH_TABLE, SEARCH_MODULES_TABLE, placeholders
+        ),
+        module_codes
+    )
+    cursor.execute(
+        "DELETE FROM {} WHERE module_code IN ({})".format(
+            SEARCH_MODULES_TABLE, placeholders
+        ),
+        module_codes
+    )
+
+
+def index_description(description, answer_map=None):
+    """
+    Replaces the indexed answers of a module with those of its
+    newly published description
+    """
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        delete_rows(cursor, [description.module_id])
+        insert_rows(cursor, description_rows(description, answer_map))
+
+
+def index_descriptions(descriptions):
+    """
+    Replaces the indexed answers of many modules at once, with
+    a single delete and insert. Takes a list of descriptions which
+    are each the newest of their module.
+    """
+    if not search_available() or not descriptions:
+        return
+    module_codes = [description.module_id for description in descriptions]
+    with connection.cursor() as cursor:
+        delete_rows(cursor, module_codes)
+        insert_rows(cursor, [
+            row for description in descriptions
+            for row in description_rows(description)
+        ])
+
+
+def rebuild_index():
+    """
+    Removes every indexed answer and indexes the current description
+    of each module.
+
+    Return:
+        int of the number of answers indexed
+    """
+    if not search_available():
+        return 0
+    descriptions = ModuleDescription.objects.filter(
+        pk__in=CurrentModuleDescription.objects.values('description_id')
+    )
+    indexed = 0
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM {}".format(SEARCH_TABLE))
+        cursor.execute("DELETE FROM {}".format(SEARCH_MODULES_TABLE))
+        for description in descriptions.iterator():
+            rows = description_rows(description)
+            cursor.executemany(
+                "INSERT INTO {} (answer, label, module_code, description_id, "
+                "field_id) VALUES (%s, %s, %s, %s, %s)".format(SEARCH_TABLE),
+                rows
+            )
+            indexed += len(rows)
+        cursor.execute(
+            "INSERT INTO {} (rowid, module_code) SELECT rowid, module_code "
+            "FROM {}".format(SEARCH_MODULES_TABLE, SEARCH_TABLE)
+        )
+    return indexed
+
+
+class DescriptionSearch(object):
+    """
+    The answers of the current module descriptions matching a query,
+    best match first. The results can be counted and sliced, so they can
+    be paginated, and each slice is a single query.
+
+    Arguments:
+        query       Words to search for, every word must match
+        label       Optional field label the answers must be for
+    """
+    def __init__(self, query, label=None):
+        self.terms = search_terms(query)
+        self.label = label or None
+        self._count = None
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start = index.start or 0
+            if index.stop is None:
+                return self.results(start, self.count() - start)
+            return self.results(start, max(index.stop - start, 0))
+        results = self.results(index, 1)
+        if not results:
+            raise IndexError(index)
+        return results[0]
+
+    def count(self):
+        """
+        Returns the number of results. Rows of modules which no longer
+        exist are left out, as they are by results.
+        """
+        if self._count is None:
+            if not self.terms:
+                self._count = 0
+            elif search_available():
+                sql, params = self._where()
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT COUNT(*) FROM {table} "
+                        "JOIN core_module AS m ON m.module_code = {table}.module_code "
+                        "WHERE {where}".format(table=SEARCH_TABLE, where=sql),
+                        params
+                    )
+                    self._count = cursor.fetchone()[0]
+            else:
+                self._count = self._entries().count()
+        return self._count
+
+    def results(self, offset, limit):
+        """
+        Returns a list of the SearchResult in the range
+        """
+        if not self.terms or limit <= 0:
+            return []
+        if not search_available():
+            return self._entry_results(offset, limit)
+
+        sql, params = self._where()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT {table}.module_code, m.module_name, {table}.label, "
+                "snippet({table}, 0, %s, %s, '...', 16) "
+                "FROM {table} "
+                "JOIN core_module AS m ON m.module_code = {table}.module_code "
+                "WHERE {where} ORDER BY {table}.rank LIMIT %s OFFSET %s".format(
+                    table=SEARCH_TABLE, where=sql
+                ),
+                [HIGHLIGHT_START, HIGHLIGHT_END] + params + [limit, offset]
+            )
+            return [
+                SearchResult(code, name, label, highlight(snippet))
+                for code, name, label, snippet in cursor.fetchall()
+            ]
+
+    def _where(self):
+        """
+        Returns the sql and params matching the terms and label
+        """
+        sql = "{0} MATCH %s".format(SEARCH_TABLE)
+        params = [match_expression(self.terms)]
+        if self.label is not None:
+            sql += " AND {0}.label = %s".format(SEARCH_TABLE)
+            params.append(self.label)
+        return sql, params
+
+    def _entries(self):
+        """
+        The current entries matching every term, for
+        databases without the full text index
+        """
+        entries = ModuleDescriptionEntry.objects.filter(
+            module_description_id__in=CurrentModuleDescription.objects.values(
+                'description_id'
+            )
+        )
+        for term in self.terms:
+            entries = entries.filter(answer__string_entry__icontains=term)
+        if self.label is not None:
+            entries = entries.filter(field_id__definition__entity_label=self.label)
+        return entries
+
+    def _entry_results(self, offset, limit):
+        entries = self._entries().order_by(
+            'module_description_id__module_id', 'field_id__entity_order'
+        ).values_list(
+            'module_description_id__module_id',
+            'module_description_id__module__module_name',
+            'field_id__definition__entity_label',
+            'answer__string_entry'
+        )[offset:offset + limit]
+        return [
+            SearchResult(code, name, label, escape(answer))
+            for code, name, label, answer in entries
+        ]
+
+
+def indexed_labels():
+    """
+    Returns the labels of the fields which have indexed answers
+    """
+    if not search_available():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT DISTINCT label FROM {} ORDER BY label".format(SEARCH_TABLE)
+        )
+        return [label for label, in cursor.fetchall()]
@@ -0,0 +1,154 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+from forms.models.module_description import (ModuleDescriptionFormVersion,
+                                             FormFieldEntity,
+                                             FormFieldDefinition)
+
+"""
+Process level cache of the compiled module description form schemas.
+A form version's fields do not change once the version has been created,
+so the schema of a version is loaded once and kept in a bounded LRU. The
+compiled field definitions are shared by every version which uses them,
+so only the definitions a version adds are compiled. The most recent
+version is not cached, as the cache is not shared between processes and
+another process may have created a newer version. Its id is read with a
+single query instead.
+"""
+
+FORM_SCHEMA_CACHE_SIZE = 32
+
+# the parts of a FormFieldEntity needed to build a form field, with the
+# choices already split into (value, label) tuples
+FieldSpec = namedtuple('FieldSpec', [
+    'entity_id',
+    'entity_order',
+    'entity_label',
+    'entity_type',
+    'entity_required',
+    'entity_max_length',
+    'entity_description',
+    'entity_placeholder',
+    'choices',
+])
+
+
+def compile_definition(definition):
+    """
+    Compiles the values of a FormFieldDefinition into a FieldSpec,
+    without the id and order of the field it is used by
+    """
+    choices = ()
+    if definition['entity_choices']:
+        choices = tuple(
+            (choice.strip(), choice.strip())
+            for choice in definition['entity_choices'].split(',')
+        )
+    return FieldSpec(
+        entity_id=None,
+        entity_order=None,
+        entity_label=definition['entity_label'],
+        entity_type=definition['entity_type'],
+        entity_required=definition['entity_required'],
+        entity_max_length=definition['entity_max_length'],
+        entity_description=definition['entity_description'],
+        entity_placeholder=definition['entity_placeholder'],
+        choices=choices
+    )
+
+
+class FormSchemaCache(object):
+    """
+    Bounded LRU of the FieldSpecs of each form version, keyed by the
+    version id. The compiled
+    definitions are kept by their id, which are few as they are shared
+    between versions.
+    """
+    def __init__(self, maxsize=FORM_SCHEMA_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.schemas = OrderedDict()
+        self.definitions = {}
+        self.lock = Lock()
+
+    def get_schema(self, version_id):
+        """
+        Returns a tuple of the FieldSpecs of a form version, in form order.
+        Raises ModuleDescriptionFormVersion.DoesNotExist if there is no
+        such version.
+        """
+        version_id = int(version_id)
+        with self.lock:
+            if version_id in self.schemas:
+                self.schemas.move_to_end(version_id)
+                return self.schemas[version_id]
+
+        entities = list(FormFieldEntity.objects.filter(
+            module_description_version=version_id
+        ).order_by('entity_order').values_list(
+            'entity_id', 'entity_order', 'definition_id'
+        ))
+        if not entities:
+            # only check the version exists when it has no fields
+            ModuleDescriptionFormVersion.objects.get(pk=version_id)
+
+        definition_ids = {definition_id for _, _, definition_id in entities}
+        with self.lock:
+            definitions = {
+                definition_id: self.definitions[definition_id]
+                for definition_id in definition_ids
+                if definition_id in self.definitions
+            }
+        missing = definition_ids - set(definitions)
+        if missing:
+            compiled = {
+                definition['id']: compile_definition(definition)
+                for definition in FormFieldDefinition.objects.filter(
+                    pk__in=missing
+                ).values()
+            }
+            definitions.update(compiled)
+            with self.lock:
+                self.definitions.update(compiled)
+
+        schema = tuple(
+            definitions[definition_id]._replace(
+                entity_id=entity_id, entity_order=entity_order
+            )
+            for entity_id, entity_order, definition_id in entities
+        )
+
+        with self.lock:
+            self.schemas[version_id] = schema
+            self.schemas.move_to_end(version_id)
+            while len(self.schemas) > self.maxsize:
+                self.schemas.popitem(last=False)
+        return schema
+
+    def invalidate(self, version_id):
+        """
+        Removes the schema of a form version
+        """
+        with self.lock:
+            self.schemas.pop(int(version_id), None)
+
+    def clear(self):
+        with self.lock:
+            self.schemas.clear()
+            self.definitions.clear()
+
+
+form_schema_cache = FormSchemaCache()
+
+
+def get_form_schema(version_id):
+    return form_schema_cache.get_schema(version_id)
+
+
+def get_most_recent_version_id():
+    """
+    Returns the id of the most recent form version. Raises
+    ModuleDescriptionFormVersion.DoesNotExist if there are no versions.
+    """
+    return ModuleDescriptionFormVersion.objects.values_list(
+        'pk', flat=True
+    ).latest('creation_date')
@@ -1,43 +1,82 @@
 from abc import ABC, abstractmethod
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 
 from forms.models.module_description import *
 from forms.forms import ModuleDescriptionForm
+from forms.utils.description_search import index_description
+from timeline.utils.timeline.helpers import publish_changes
+
+FIELD_PREFIX = 'field_entity_'
+
+
+def publish_module_description(module, form_version, answers, user):
+    """
+    Publishes a new module description for a module. The field entities
+    are resolved in one query, and the description with its answers
+    snapshot, its entries, the current description pointer, its search
+    index rows and the timeline entry are all written in one transaction,
+    so a description is never left half written.
+
+    Arguments:
+        module          Module the description is for
+        form_version    ModuleDescriptionFormVersion the answers are for
+        answers         dict of form field name (field_entity_<id>) to answer
+        user            User publishing the description
+
+    Return:
+        The new ModuleDescription
+    """
+    field_ids = {name: int(name[len(FIELD_PREFIX):]) for name in answers}
+    fields = FormFieldEntity.objects.filter(
+        module_description_version=form_version
+    ).select_related('definition').in_bulk(list(field_ids.values()))
+    missing = set(field_ids.values()) - set(fields)
+    if missing:
+        raise FormFieldEntity.DoesNotExist(
+            "Fields {} are not part of the form version".format(sorted(missing))
+        )
+
+    entries = sorted(
+        ((fields[field_ids[name]], answer) for name, answer in answers.items()),
+        key=lambda entry: entry[0].entity_order
+    )
+    # snapshot of the answers which are stored as entries, for reading
+    snapshot = [
+        (field.pk, field.entity_label, field.entity_type, answer)
+        for field, answer in entries
+        if ModuleDescriptionEntry.objects.get_entry_fields(answer) is not None
+    ]
+
+    with transaction.atomic():
+        md = ModuleDescription.objects.create_new(module, form_version, snapshot)
+        ModuleDescriptionEntry.objects.bulk_create_entries(md, entries)
+        publish_changes(md, user, 'Module_Description', 'Module-Description')
+        index_description(md)
+    return md
 
 class AbstractModuleDescriptionWrapper(ABC):
     """
-    Abstract Module Description Class
+    Abstract Module Description Class. The answers are read from the
+    snapshot on the description into a field id to answer map, which
+    both the labelled data and the form are built from.
     """
     def __init__(self, module, module_description_master):
         self.module = module 
         self.module_description_master=module_description_master
         self.form_master = module_description_master.form_version
-        self.form = FormFieldEntity.objects.get_form(self.form_master.pk)
-        self.values_queryset = ModuleDescriptionEntry.objects.get_full_description(self.module_description_master)
+        self.answers = self.module_description_master.get_answer_map()
 
     def get_data_with_labels(self):
         data = {}
-        for field in self.form:
-            field_id = field.entity_id
-            field_label = field.entity_label
-            field_type = field.entity_type
-            if field_type in ("text-input", "text-area", "multi-choice", "radio-buttons"):
-                field_data = self.values_queryset.get(field_id=field_id).string_entry
-            elif field_type in ("check-box"):
-                field_data = self.values_queryset.get(field_id=field_id).boolean_entry
-            data[field_label] = field_data
+        for answer in self.answers.values():
+            data[answer.label] = answer.value
         return data
     
     def get_form(self, post_data=False):
         form_data = {}
-        for entry in self.values_queryset:
-            field = entry.field_id
-            id_for_form = "field_entity_" + str(field.pk)
-            field_type = field.entity_type
-            if field_type in ("text-input", "text-area", "multi-choice", "radio-buttons"):
-                 form_data[id_for_form] = entry.string_entry
-            elif field_type in ("check-box"):
-                 form_data[id_for_form] = entry.boolean_entry
+        for field_id, answer in self.answers.items():
+            form_data["field_entity_" + str(field_id)] = answer.value
         if post_data:
             return ModuleDescriptionForm(post_data, md_version=self.form_master.pk, initial=form_data)
         else:
@@ -56,11 +95,12 @@ class CurrentModuleDescriptionWrapper(AbstractModuleDescriptionWrapper):
     The most recent Module Description for a given module
     """
     def __init__(self, module):
-        current_module_description = ModuleDescription.objects.filter(module_id=module).latest('created')
+        current_module_description = CurrentModuleDescription.objects.get_current(module)
         super(CurrentModuleDescriptionWrapper, self).__init__(module, current_module_description)
 
 class ArchivedModuleDescriptionWrapper(AbstractModuleDescriptionWrapper):
     def __init__(self, module_description_pk):
-        module_description = ModuleDescription.objects.get(pk=module_description_pk)
+        module_description = ModuleDescription.objects.select_related(
+            'form_version').get(pk=module_description_pk)
         module = module_description.module_id
         super(ArchivedModuleDescriptionWrapper, self).__init__(module, module_description)
\ No newline at end of file
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from forms.models import (ModuleDescriptionFormVersion, FormFieldEntity,
+                          FormFieldDefinition)
+from forms.utils.form_schema import form_schema_cache
+from forms.utils.description_cache import clear_description_cache
+
+
+@receiver(post_save, sender=FormFieldEntity)
+@receiver(post_delete, sender=FormFieldEntity)
+def invalidate_form_schema(sender, instance, **kwargs):
+    """
+    Fields are added to a version after it has been created, so the
+    cached schema of the version, and the descriptions rendered with
+    it, are dropped whenever one of its fields changes.
+    """
+    form_schema_cache.invalidate(instance.module_description_version_id)
+    clear_description_cache()
+
+
+@receiver(post_save, sender=FormFieldDefinition)
+@receiver(post_delete, sender=FormFieldDefinition)
+def clear_form_schemas(sender, instance, created=False, **kwargs):
+    """
+    Definitions are shared between versions, so every cached
+    schema and rendered description is dropped when a definition is edited
+    """
+    if not created:
+        form_schema_cache.clear()
+        clear_description_cache()
+
+
+@receiver(post_save, sender=ModuleDescriptionFormVersion)
+@receiver(post_delete, sender=ModuleDescriptionFormVersion)
+def invalidate_version_schema(sender, instance, **kwargs):
+    """
+    Drops the cached schema of a version when it is saved or removed
+    """
+    form_schema_cache.invalidate(instance.pk)
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 
 from forms.models.tracking_form import *
+from timeline.utils.timeline.tracking_form import tracking_to_timeline
 
 # Function which accepts a number of forms as kwargs and returns a list of those which are unbound
 def get_unbound_forms(**kwargs):
@@ -15,6 +17,116 @@ def get_unbound_forms(**kwargs):
                 unbounds.append(form_name)
     return unbounds
 
+def stage_object(obj, module):
+    """
+    Moves a submitted tracking form object to staging, as the next copy
+    """
+    obj.module = module
+    obj.current_flag = False
+    obj.staging_flag = True
+    if not obj.is_new:
+        obj.copy_number += 1
+
+
+def bulk_create_staged(model, objects, module):
+    """
+    Creates new rows of a section in staging. Not every database sets the
+    ids of rows made with bulk_create, so they are read back as the newest
+    staged rows of the module. The rows are marked new, as save would.
+    """
+    model.objects.bulk_create(objects)
+    if objects[0].pk is None:
+        pks = model.objects.filter(
+            module=module, staging_flag=True
+        ).order_by('-pk').values_list('pk', flat=True)[:len(objects)]
+        for obj, pk in zip(objects, reversed(list(pks))):
+            obj.pk = pk
+    for obj in objects:
+        obj.is_new = True
+
+
+def stage_formset(formset, module):
+    """
+    Saves the rows of a section with many rows. The edited rows are
+    saved, the new rows are created in bulk, the rows submitted unchanged
+    are moved to staging with a single update, and the rows which were
+    removed from the form are deleted with a single delete.
+
+    Return:
+        list of every submitted object, for the timeline
+    """
+    model = formset.model
+    objects = formset.save(commit=False)
+    new = []
+    for obj in objects:
+        stage_object(obj, module)
+        if obj.pk is None:
+            new.append(obj)
+        else:
+            obj.save()
+    if new:
+        bulk_create_staged(model, new, module)
+
+    # For Timeline to work, the objects list needs to include all objects, not just edited/new ones.
+    saved = {obj.pk for obj in objects}
+    unchanged = []
+    for cleaned_data in formset.cleaned_data:
+        obj = cleaned_data.get(model._meta.pk.name, None)
+        if obj is not None and obj.pk not in saved:
+            obj.module = module
+            obj.current_flag = False
+            obj.staging_flag = True
+            unchanged.append(obj)
+    if unchanged:
+        model.objects.filter(pk__in=[obj.pk for obj in unchanged]).update(
+            current_flag=False, staging_flag=True
+        )
+
+    # every submitted row has left current, so what is left was removed
+    model.objects.filter(module=module, current_flag=True).delete()
+    return objects + unchanged
+
+
+def submit_tracking_form(module, user, change_summary, teaching_hours, support,
+                         assessments, reassessment, software):
+    """
+    Stages a submitted tracking form and creates its timeline entries, in
+    one transaction. Each section is written once, with the unchanged and
+    removed rows of the assessments and software written in bulk.
+
+    Arguments:
+        module          Module the tracking form is for
+        user            User submitting the form
+        change_summary, teaching_hours, support, reassessment
+                        Valid ModelForms of the sections with one row
+        assessments, software
+                        Valid model formsets of the sections with many rows
+    """
+    with transaction.atomic():
+        sections = []
+        for form in (change_summary, teaching_hours, support, reassessment):
+            obj = form.save(commit=False)
+            stage_object(obj, module)
+            obj.save()
+            sections.append(obj)
+        change_summary_object, teaching_hours_object, support_object, reassessment_object = sections
+
+        assessment_objects = stage_formset(assessments, module)
+        software_objects = stage_formset(software, module)
+
+        # this makes the timeline
+        tracking_to_timeline(
+            module.module_code,
+            user,
+            change_summary_object,
+            teaching_hours_object,
+            support_object,
+            assessment_objects,
+            reassessment_object,
+            software_objects
+        )
+
+
 class AbstractTrackingFormWrapper(ABC):
 
     def __init__(self, module):
@@ -2,6 +2,7 @@ from django.views import View
 from django.shortcuts import render, redirect
 from django.forms import modelformset_factory, formset_factory
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 
 from core.models import Module
 from forms.models import ModuleDescriptionFormVersion, FormFieldEntity
@@ -74,17 +75,19 @@ class AdminModuleDescriptionFormModify(View):
 
     # When the form is POSTed a new ModuleDescription 'parent' object is created,
     # and then each of the fields is stored in a FormFieldEntity object, and 
-    # linked to the 'parent' with a foreign key.
+    # linked to the 'parent' with a foreign key. Field definitions which are
+    # unchanged from earlier versions are shared, so only new ones are written.
     def post(self, request, **kwargs):
         field_formset = self.field_formset_object(request.POST, prefix='structure_form')
         
         if field_formset.is_valid():
-            md_version = ModuleDescriptionFormVersion.objects.create_new_version()
-            
-            for form in field_formset:
-                entity = form.save(commit=False)
-                entity.module_description_version = md_version
-                entity.save()
+            fields = [
+                (form.cleaned_data['entity_order'], form.save(commit=False))
+                for form in field_formset if form.cleaned_data
+            ]
+            with transaction.atomic():
+                md_version = ModuleDescriptionFormVersion.objects.create_new_version()
+                FormFieldEntity.objects.bulk_create_fields(md_version, fields)
 
             return redirect('module_description_form_structure') # temp redirect
         return render(request, self.template, {
@@ -6,7 +6,8 @@ from core.models import Module
 from forms.forms import ModuleDetailForm, ModuleDescriptionForm
 from forms.models import ModuleDescription, ModuleDescriptionEntry, ModuleDescriptionFormVersion, FormFieldEntity
 from forms.utils.module_description import *
-from timeline.utils.timeline.helpers import publish_changes
+from forms.utils.description_cache import get_current_html, get_archived_html
+from dataGeneration.utils.snapshots import refresh_snapshots
 
 class LeaderModuleDescriptionView(View):
     """
@@ -27,7 +28,6 @@ class LeaderModuleDescriptionView(View):
 
         edit_form = True if form_type == 'new' else False
         form_version_exists = True
-        form_exists = True
 
         # Populate the ModuleDetails form
         details_form = ModuleDetailForm(instance=module)
@@ -39,30 +39,39 @@ class LeaderModuleDescriptionView(View):
         except ObjectDoesNotExist:
             form_version_exists = False
         
-        # Retrieve the most recent description for this module, and
-        # the form version it used. Convert it to form format.
-        try:
-            current_description = CurrentModuleDescriptionWrapper(module)
-            version_used = current_description.form_master
-        except:
-            form_exists = False
+        # Retrieve the description this module points at, and the form
+        # version it used. It is only converted to form format when the
+        # rendered form is not cached, or it is being edited.
+        current = CurrentModuleDescription.objects.filter(
+            module=module
+        ).values_list('description_id', 'description__form_version_id').first()
+        form_exists = current is not None
+        show_current = False
+        module_description_form = None
+        form_html = None
 
         # We need to check if the existing data was created using the
         # most recent form. If not, we set a flag and only render the
         # most recent form if the user is in edit mode.
-        if form_version_exists and form_exists and version_used == newest_form_version:
+        if form_version_exists and form_exists and current[1] == newest_form_version.pk:
             new_form_version = False
-            module_description_form = current_description.get_form()
+            show_current = True
         else:
             if not form_version_exists:
                 new_form_version = False
-                module_description_form = None
             elif not form_exists or edit_form:
                 new_form_version = False
                 module_description_form = ModuleDescriptionForm()
             else: 
                 new_form_version = True
-                module_description_form = current_description.get_form()
+                show_current = True
+
+        if show_current:
+            build_form = lambda: CurrentModuleDescriptionWrapper(module).get_form()
+            if edit_form:
+                module_description_form = build_form()
+            else:
+                form_html = get_current_html(module.pk, *current, build_form)
 
         # Set the context with the form, and the user chosen stuff
         context = {
@@ -72,6 +81,7 @@ class LeaderModuleDescriptionView(View):
             'module': module,
             'details_form': details_form,
             'form': module_description_form,
+            'form_html': form_html,
             'new_form_version': new_form_version,
             'archived': False
         }
@@ -106,13 +116,13 @@ class LeaderModuleDescriptionView(View):
             # Remove the form version from the cleaned data, as we don't need it
             del module_description_form.cleaned_data['form_version']
 
-            md = ModuleDescription.objects.create_new(module, form_version)         
-            for field, value in module_description_form.cleaned_data.items():
-                # We only want the field id, so we strip 'field_entity_'
-                field_entity = FormFieldEntity.objects.get(pk=field.strip('field_entity_'))
-                ModuleDescriptionEntry.objects.create_new_entry(md, field_entity, value)
-
-            publish_changes(md, request.user, 'Module_Description', 'Module-Description')
+            publish_module_description(
+                module,
+                form_version,
+                module_description_form.cleaned_data,
+                request.user
+            )
+            refresh_snapshots(module)
             return redirect('module_timeline', module_pk=module.pk)
 
         # If the form isn't valid, we rerender the page with the errors
@@ -143,17 +153,17 @@ class ArchivedModuleDescriptionView(View):
         # Populate the ModuleDetails form
         details_form = ModuleDetailForm(instance=module)
         
-        # Retrieve the most recent description for this module, and
-        # the form version it used. Convert it to form format.
+        # Archived descriptions never change, so the form is only built
+        # from the description when its rendered form is not cached
+        module_description_form = None
         try:
-            description = ArchivedModuleDescriptionWrapper(version)
-            version_used = description.form_master
-        except:
+            form_html = get_archived_html(
+                version,
+                lambda: ArchivedModuleDescriptionWrapper(version).get_form()
+            )
+        except ObjectDoesNotExist:
             form_exists = False
-
-        if form_exists:
-            module_description_form = description.get_form()
-        else:
+            form_html = None
             module_description_form = ModuleDescriptionForm()
 
         # Set the context with the form, and the user chosen stuff
@@ -164,6 +174,7 @@ class ArchivedModuleDescriptionView(View):
             'module': module,
             'details_form': details_form,
             'form': module_description_form,
+            'form_html': form_html,
             'new_form_version': new_form_version,
             'archived': True
         }
@@ -10,9 +10,10 @@ from forms.models.tracking_form import ModuleChangeSummary, ModuleTeaching, Modu
 from forms.forms import ModuleChangeSummaryForm, ModuleTeachingHoursForm, ModuleSupportForm, ModuleAssessmentsForm, ModuleReassessmentForm, ModuleSoftwareForm
 from forms.utils.tracking_form import *
 
-from timeline.utils.timeline.tracking_form import tracking_to_timeline, get_form_version_number
+from timeline.utils.timeline.tracking_form import get_form_version_number
 
 from recommenderSystem.forms import ModuleSoftwareSearchForm
+from dataGeneration.utils.snapshots import refresh_snapshots
 
 class LeaderModuleTrackingForm(View):
     """
@@ -84,15 +85,14 @@ class LeaderModuleTrackingForm(View):
         module_pk = kwargs.get('pk')
         module = Module.objects.get(pk=module_pk)
 
-        # Gathering all of the POST data and putting it into its forms. Supply instance data if it exists
+        # Gathering all of the POST data and putting it into its forms. Supply instance data if it exists.
+        # The formsets are limited to the current rows, so each section is only loaded once
         change_summary_form = ModuleChangeSummaryForm(request.POST, instance=ModuleChangeSummary.objects.filter(module=module, current_flag=True).first())
         teaching_hours_form = ModuleTeachingHoursForm(request.POST, instance=ModuleTeaching.objects.filter(module=module, current_flag=True).first())
         support_form = ModuleSupportForm(request.POST, instance=ModuleSupport.objects.filter(module=module, current_flag=True).first())
         reassessment_form = ModuleReassessmentForm(request.POST, instance=ModuleReassessment.objects.filter(module=module, current_flag=True).first())
-        assessment_forms = self.assessment_formset(request.POST, prefix="assessment_form") # Doesn't need instance because there is an id associated with each form
-        software_forms = self.software_formset(request.POST, prefix="software_form")
-        
-        softwareSearch_form = ModuleSoftwareSearchForm(instance=ModuleSoftware.objects.filter(module=module, current_flag=True).first())
+        assessment_forms = self.assessment_formset(request.POST, prefix="assessment_form", queryset=ModuleAssessment.objects.filter(module=module, current_flag=True))
+        software_forms = self.software_formset(request.POST, prefix="software_form", queryset=ModuleSoftware.objects.filter(module=module, current_flag=True))
 
         # Run all of the validation
         valid = [
@@ -104,105 +104,28 @@ class LeaderModuleTrackingForm(View):
             software_forms.is_valid(),
         ]
 
-        # If all forms are valid, save to the database
+        # If all forms are valid, stage them and make the timeline in one transaction
         if all(valid):
-
-            change_summary_object = change_summary_form.save(commit=False)
-            teaching_hours_object = teaching_hours_form.save(commit=False)
-            support_object = support_form.save(commit=False)
-            assessment_objects = assessment_forms.save(commit=False)
-            reassessment_object = reassessment_form.save(commit=False)
-            software_objects = software_forms.save(commit=False)
-
-            change_summary_object.module = module
-            change_summary_object.current_flag = False
-            change_summary_object.staging_flag = True
-            if not change_summary_object.is_new:
-                change_summary_object.copy_number += 1
-            change_summary_form.save()
-
-            teaching_hours_object.module = module
-            teaching_hours_object.current_flag = False
-            teaching_hours_object.staging_flag = True
-            if not teaching_hours_object.is_new:
-                teaching_hours_object.copy_number += 1
-            teaching_hours_object.save()
-
-            support_object.module = module
-            support_object.current_flag = False
-            support_object.staging_flag = True
-            if not support_object.is_new:
-                support_object.copy_number += 1
-            support_object.save()
-
-            reassessment_object.module = module
-            reassessment_object.current_flag = False
-            reassessment_object.staging_flag = True
-            if not reassessment_object.is_new:
-                reassessment_object.copy_number += 1
-            reassessment_object.save()
-
-            for assessment in assessment_objects:
-                assessment.module = module
-                assessment.current_flag = False
-                assessment.staging_flag = True
-                if not assessment.is_new:
-                    assessment.copy_number += 1
-                assessment.save()
-            # For Timeline to work, the assessment objects list needs to include all objects, not just edited/new ones.
-            # So I work out which weren't edited and add them to the list of objects at the end
-            for cleaned_data in assessment_forms.cleaned_data:
-                obj = cleaned_data.get("assessment_id", None)
-                if not obj in assessment_objects and not obj == None:
-                    obj.current_flag=False
-                    obj.staging_flag=True
-                    obj.save()
-                    assessment_objects.append(obj)
-            current_assessments = ModuleAssessment.objects.filter(module=module, current_flag=True)
-            for assessment in current_assessments:
-                if not assessment in assessment_objects:
-                    assessment.delete()
-
-            for software in software_objects:
-                software.module = module
-                software.current_flag = False
-                software.staging_flag = True
-                if not software.is_new:
-                    software.copy_number += 1
-                software.save()
-            # For Timeline to work, the software objects list needs to include all objects, not just edited/new ones.
-            # So I work out which weren't edited and add them to the list of objects at the end
-            for cleaned_data in software_forms.cleaned_data:
-                obj = cleaned_data.get("software_id", None)
-                if not obj in software_objects and not obj == None:
-                    obj.current_flag=False
-                    obj.staging_flag=True
-                    obj.save()
-                    software_objects.append(obj)
-            current_software = ModuleSoftware.objects.filter(module=module, current_flag=True)
-            for software in current_software:
-                if not software in software_objects:
-                    software.delete()
-
-            # this makes the timeline
-            tracking_to_timeline(
-                module.module_code,
+            submit_tracking_form(
+                module,
                 request.user,
-                change_summary_object,
-                teaching_hours_object,
-                support_object,
-                assessment_objects,
-                reassessment_object,
-                software_objects
+                change_summary=change_summary_form,
+                teaching_hours=teaching_hours_form,
+                support=support_form,
+                assessments=assessment_forms,
+                reassessment=reassessment_form,
+                software=software_forms
             )
+            refresh_snapshots(module)
 
             return redirect('module_timeline', module_pk=module_pk)
         else:
+            softwareSearch_form = ModuleSoftwareSearchForm(instance=ModuleSoftware.objects.filter(module=module, current_flag=True).first())
             error_context = {
                 'edit_form': True,
                 'form_exists': True,
                 'pk': module_pk,
-                'module': Module.objects.get(pk=module_pk),
+                'module': module,
                 'change_summary_form': change_summary_form,
                 'teaching_hours_form': teaching_hours_form,
                 'support_form': support_form,
@@ -129,6 +129,23 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join('static'), )
 
+# The rendered module descriptions are cached in the database, so every
+# process sees the same cache and the descriptions dropped from it. The
+# table is created by the forms migrations.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'mscms_cache',
+    }
+}
+
+# Directory where the background report jobs write their files
+REPORT_JOBS_ROOT = os.path.join(BASE_DIR, 'report_jobs')
+
+# Seconds a report job can run for before it is taken to belong to a
+# worker which stopped, and is failed so the export can be queued again
+REPORT_JOB_TIMEOUT = 60 * 60
+
 # Define custom user model for application
 AUTH_USER_MODEL = 'core.User'
 
@@ -42,4 +42,14 @@ urlpatterns = [
     url(r'^dataGeneration/', include('dataGeneration.urls.labSheetUrl')),
     # moduleSheet URLs
     url(r'^dataGeneration/', include('dataGeneration.urls.moduleSheetUrl')),
+    # background report job URLs
+    url(r'^dataGeneration/', include('dataGeneration.urls.reportJobUrl')),
+    # report delta URLs
+    url(r'^dataGeneration/', include('dataGeneration.urls.reportDeltaUrl')),
+    # report bundle URLs
+    url(r'^dataGeneration/', include('dataGeneration.urls.reportBundleUrl')),
+    # tracking form summary URLs
+    url(r'^dataGeneration/', include('dataGeneration.urls.trackingSummaryUrl')),
+    # module description search URLs
+    url(r'^dataGeneration/', include('dataGeneration.urls.descriptionSearchUrl')),
 ]
@@ -0,0 +1,58 @@
+from forms.tests.common import ModuleDescriptionTestCase
+from forms.utils.module_description import publish_module_description
+from timeline.models import TimelineEntry
+from timeline.utils.timeline.entries import ModuleDescriptionEntry
+
+
+class TestModuleDescriptionEntry(ModuleDescriptionTestCase):
+    """
+    Test case for the ModuleDescriptionEntry object
+    """
+    def publish(self, syllabus=None):
+        answers = self.form_answers()
+        if syllabus is not None:
+            answers["field_entity_{}".format(self.fields[1].pk)] = syllabus
+        return publish_module_description(
+            self.module, self.version, answers, self.user
+        )
+
+    def test_first_description(self):
+        """
+        Test that every field is listed for the first description
+        """
+        md = self.publish()
+        entry = TimelineEntry.objects.get(object_id=md.pk)
+        self.assertEquals(
+            entry.changes,
+            "* Aims: (none) -> Learn things\n"
+            "* Syllabus: (none) -> Docker, Python\n"
+            "* Exam: (none) -> True\n"
+        )
+
+    def test_only_changed_fields(self):
+        """
+        Test that only the changed fields are stored on the entry
+        """
+        self.publish()
+        md = self.publish(syllabus="Docker,\nKubernetes")
+        entry = TimelineEntry.objects.get(object_id=md.pk)
+        self.assertEquals(
+            entry.changes,
+            "* Syllabus: Docker, Python -> Docker, Kubernetes\n"
+        )
+        self.assertEquals(
+            ModuleDescriptionEntry(md).sum_changes(),
+            "There are 1 change to Module Description"
+        )
+
+    def test_no_changes(self):
+        """
+        Test that publishing the same answers says nothing changed
+        """
+        self.publish()
+        md = self.publish()
+        self.assertEquals(ModuleDescriptionEntry(md).get_differences(), [])
+        self.assertEquals(
+            TimelineEntry.objects.get(object_id=md.pk).changes,
+            "The module description has been updated with no changes."
+        )
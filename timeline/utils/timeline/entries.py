@@ -89,6 +89,21 @@ class BaseEntry(ABC):
         Returns:
             TimelineEntry object    The entry that was created.
         """
+        entry = self.build_entry(**kwargs)
+        if entry is not None:
+            entry.save()
+        return entry
+
+    def build_entry(self, **kwargs):
+        """
+        Builds the timeline entry model without saving it, so that
+        many entries can be created at once. Takes the same kwargs
+        as create_entry.
+
+        Returns:
+            TimelineEntry object    The unsaved entry, or None if
+                                    there are no changes.
+        """
         parent = kwargs.get('parent', None)
         entry_type = kwargs.get('entry_type', 'Generic')
         status = kwargs.get('status', 'Draft')
@@ -108,7 +123,7 @@ class BaseEntry(ABC):
         content_object = self.model
 
         # create the object
-        return TimelineEntry.objects.create(
+        return TimelineEntry(
             title=title,
             changes=changes,
             module_code=module_code,
@@ -323,19 +338,48 @@ class UpdateEntry(BaseEntry):
 
 class ModuleDescriptionEntry(BaseEntry):
     """
-    Custom timeline entry for the Module Descriptions
+    Custom timeline entry for the Module Descriptions. The content
+    lists the fields which changed from the previous description.
     """
     def __init__(self, model):
         super(ModuleDescriptionEntry, self).__init__(model, MODULE_DESCRIPTION)
 
+    def get_differences(self):
+        if self.changes is None:
+            self.changes = self.model.diff_answers(self.model.get_previous())
+        return self.changes
+
     def content(self):
         """
         Content for the timeline entry
         """
-        return "The module description has been updated."
+        diff = self.get_differences()
+        if not diff:
+            return "The module description has been updated with no changes."
+
+        md = ""
+        for label, original, updated in diff:
+            md += "* {}: {} -> {}\n".format(
+                label,
+                self._display(original),
+                self._display(updated)
+            )
+        return md
 
     def have_changes(self):
         return True
 
     def sum_changes(self):
-        return None
+        n_changes = len(self.get_differences())
+        change_str = "changes" if n_changes != 1 else 'change'
+        return "There are {} {} to {}".format(
+            n_changes, change_str, self.model.title()
+        )
+
+    def _display(self, value):
+        """
+        Formats an answer to fit on a single line of the list
+        """
+        if value is None:
+            return "(none)"
+        return " ".join(str(value).split())
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from timeline.models import TimelineEntry
 from timeline.utils.timeline.factory import EntryFactory
 from timeline.utils.timeline.entries import UPDATE
@@ -122,9 +123,15 @@ class ParentEntry(object):
 
     def __generate_child_entries(self, parent):
         """
-        Private class to generate the timeline child entries.
+        Private class to generate the timeline child entries. The
+        archived copies and the child entries are each created in bulk,
+        and the copy numbers are set with one update per model class.
         """
         current_version = self.args[0].model.copy_number
+
+        # create an archived copy of the original data of every
+        # updated model, grouped by their class
+        copies = OrderedDict()
         for entry in self.args:
             if entry.type_of_entry() == UPDATE:
                 base = entry.get_original_data()
@@ -138,20 +145,46 @@ class ParentEntry(object):
                 base['version_number'] = current_version
                 base['module_id'] = entry.get_module_code()
 
-                # create a copy of the model
-                copy = cls.objects.create(**base)
+                copies.setdefault(cls, []).append((entry, cls(**base)))
+        reverts = {}
+        for cls, class_copies in copies.items():
+            created = [copy for _, copy in class_copies]
+            self.__bulk_create_copies(cls, created, current_version)
+            for entry, copy in class_copies:
+                reverts[id(entry)] = copy.pk
 
-                # create the child timeline entry
-                entry.create_entry(
-                    parent=parent,
-                    entry_type='Tracking-Form',
-                    revert=copy.pk
-                )
-            else:
-                # create a child timeline entry
-                entry.create_entry(
-                    parent=parent,
-                    entry_type='Tracking-Form'
-                )
+        # create the child timeline entries
+        children = []
+        for entry in self.args:
+            kwargs = {'parent': parent, 'entry_type': 'Tracking-Form'}
+            if id(entry) in reverts:
+                kwargs['revert'] = reverts[id(entry)]
+            child = entry.build_entry(**kwargs)
+            if child is not None:
+                children.append(child)
+        TimelineEntry.objects.bulk_create(children)
+
+        # every model becomes part of the current version
+        models = OrderedDict()
+        for entry in self.args:
             entry.model.copy_number = current_version
-            entry.model.save()
+            models.setdefault(entry.model_class_object(), []).append(entry.model.pk)
+        for cls, pks in models.items():
+            cls.objects.filter(pk__in=pks).update(copy_number=current_version)
+
+    def __bulk_create_copies(self, cls, copies, version_number):
+        """
+        Private method to create the archived copies of a model class.
+        Not every database sets the ids of rows made with bulk_create, so
+        they are read back as the newest copies of that version.
+        """
+        cls.objects.bulk_create(copies)
+        if copies[0].pk is not None:
+            return
+        pks = cls.objects.filter(
+            module_id=copies[0].module_id,
+            archive_flag=True,
+            version_number=version_number
+        ).order_by('-pk').values_list('pk', flat=True)[:len(copies)]
+        for copy, pk in zip(copies, reversed(list(pks))):
+            copy.pk = pk
@@ -11,6 +11,7 @@ from timeline.utils.timeline.changes import revert_changes
 from timeline.utils.timeline.tracking_form import get_form_version_number
 
 from forms.utils.tracking_form import StagedTrackingFormWrapper
+from dataGeneration.utils.snapshots import refresh_snapshots
 
 
 class TrackingFormChanges(View):
@@ -118,6 +119,7 @@ class TimelineUpdateStatus(TimelinePostViews):
             module = Module.objects.get(module_code=entry.module_code)
             form = StagedTrackingFormWrapper(module)
             form.change_to_current()
+            refresh_snapshots(module)
         else:
             pass
         entry.approved_by = request.user
@@ -143,6 +145,9 @@ class TimelineRevertStage(TimelinePostViews):
         if entry.status == 'Draft':
             # remove the changes as it is no longer needed
             revert_changes(entry)
+            refresh_snapshots(
+                Module.objects.get(module_code=entry.module_code)
+            )
             push_notification("cancelled", entry=entry, user=request.user)
         elif entry.status == 'Staged':
             # move the status back to 'Draft'